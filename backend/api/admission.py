@@ -0,0 +1,166 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# 채점 경로(/api/predict) 앞단의 동시 처리 제한(admission control) ASGI 미들웨어입니다.
+# - 요청마다 비용(cost)을 업로드 크기(Content-Length)로 추정: cost_unit_bytes당 1, 최소 1 / 최대 max_cost
+# - 처리 중 비용 합이 max_cost를 넘지 않을 때만 입장, 나머지는 FIFO 대기열에서 대기
+# - 대기열이 가득 찼거나 queue_timeout 안에 입장하지 못하면 503 + Retry-After
+# 제한은 워커 프로세스마다 따로 적용됩니다. (WEB_CONCURRENCY개 워커 → 전체 한도는 워커 수만큼)
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CostLimiter:
+    # 비용 가중 세마포어. 앞선 대기 요청이 있으면 작은 요청도 새치기하지 않습니다(큰 요청 기아 방지).
+    def __init__(self, max_cost: int, max_queue: int, queue_timeout: float, window: int = 1000):
+        self.max_cost = max_cost
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_use = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._wait_times: Deque[float] = deque(maxlen=window)
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+
+    def _fits(self, cost: int) -> bool:
+        return self.in_use + cost <= self.max_cost
+
+    async def acquire(self, cost: int) -> float:
+        # 입장까지 기다린 시간(초)을 반환합니다.
+        start = time.perf_counter()
+        if not self._waiters and self._fits(cost):
+            self.in_use += cost
+            self._record(0.0)
+            return 0.0
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise Overloaded("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (cost, future)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # 입장 직후 취소/타임아웃: 받은 비용을 돌려줍니다.
+                self.release(cost)
+            else:
+                future.cancel()
+                self._waiters.remove(entry)
+                self._wake()
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected["timeout"] += 1
+                raise Overloaded("timeout") from exc
+            raise
+
+        waited = time.perf_counter() - start
+        self._record(waited)
+        return waited
+
+    def release(self, cost: int) -> None:
+        self.in_use -= cost
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._fits(self._waiters[0][0]):
+            cost, future = self._waiters.popleft()
+            self.in_use += cost
+            future.set_result(None)
+
+    def _record(self, waited: float) -> None:
+        self.admitted += 1
+        self._wait_times.append(waited)
+
+    def metrics(self) -> dict:
+        waits_ms = sorted(w * 1000 for w in self._wait_times)
+
+        def pct(q: float) -> Optional[float]:
+            if not waits_ms:
+                return None
+            return round(waits_ms[min(len(waits_ms) - 1, int(q * len(waits_ms)))], 2)
+
+        return {
+            "max_cost": self.max_cost,
+            "in_flight_cost": self.in_use,
+            "queue_depth": len(self._waiters),
+            "queued_cost": sum(cost for cost, _ in self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "wait_ms": {
+                "window": len(waits_ms),
+                "mean": round(sum(waits_ms) / len(waits_ms), 2) if waits_ms else None,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": round(waits_ms[-1], 2) if waits_ms else None,
+            },
+        }
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app,
+        limiter: CostLimiter,
+        cost_unit_bytes: int = 1024 * 1024,
+        retry_after: int = 5,
+        paths: tuple = ("/api/predict",),
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.cost_unit_bytes = cost_unit_bytes
+        self.retry_after = retry_after
+        self.paths = tuple(paths)
+
+    def estimate_cost(self, scope) -> int:
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        size = int(content_length) if content_length.isdigit() else 0
+        cost = max(1, math.ceil(size / self.cost_unit_bytes))
+        # 한도보다 큰 요청도 단독으로는 처리될 수 있도록 max_cost로 자릅니다.
+        return min(cost, self.limiter.max_cost)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.estimate_cost(scope)
+        try:
+            await self.limiter.acquire(cost)
+        except Overloaded as exc:
+            await self._reject(send, exc.reason)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(cost)
+
+    async def _reject(self, send, reason: str):
+        body = json.dumps({
+            "detail": "Server is busy scoring other uploads. Please retry later.",
+            "reason": reason,
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(self.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
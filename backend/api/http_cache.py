@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+# HTTP 캐시/압축 협상 공통 유틸입니다. (정적 파일 서빙, 리포트 다운로드에서 사용)
+
+# 같은 q값이면 앞쪽 인코딩을 우선합니다.
+ENCODING_PREFERENCE = ("br", "gzip")
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def file_etag(path: Path, chunk_size: int = 1 << 20) -> str:
+    # 파일 내용 해시 기반 강한(strong) ETag
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return f'"{h.hexdigest()[:32]}"'
+
+
+@lru_cache(maxsize=1024)
+def _cached_etag(path: str, mtime_ns: int, size: int) -> str:
+    return file_etag(Path(path))
+
+
+def stat_etag(path: Path) -> str:
+    # 내용 해시 ETag를 (경로, 수정시각, 크기) 기준으로 캐시해 요청마다 파일 전체를 읽지 않습니다.
+    st = path.stat()
+    return _cached_etag(str(path), st.st_mtime_ns, st.st_size)
+
+
+def ensure_gzip_sibling(path: Path, compresslevel: int = 6) -> Path:
+    """
+    path 옆의 .gz 압축본을 반환(없거나 원본보다 오래되었으면 생성).
+    임시 파일에 쓴 뒤 교체하므로 동시 요청에도 반쯤 쓰인 파일이 노출되지 않습니다.
+    """
+    gz_path = path.with_name(path.name + ENCODING_SUFFIXES["gzip"])
+    if gz_path.exists() and gz_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+        return gz_path
+
+    tmp_path = path.with_name(f".{gz_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(path, "rb") as src, gzip.GzipFile(tmp_path, "wb", compresslevel=compresslevel, mtime=0) as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, gz_path)
+    return gz_path
+
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    # 인코딩별 표현(representation)은 바이트가 다르므로 ETag도 구분합니다.
+    if not encoding:
+        return etag
+    return f'"{etag.strip(chr(34))}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match는 약한 비교(W/ 접두어 무시)를 사용합니다. (RFC 9110 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Accept-Encoding과 사용 가능한 인코딩 중 가장 적합한 것을 반환(없으면 None = identity).
+    q=0은 거부로 처리합니다.
+    """
+    available = [e for e in ENCODING_PREFERENCE if e in set(available)]
+    if not accept_encoding or not available:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            weights[token] = q
+
+    best = None
+    best_q = 0.0
+    for enc in available:
+        q = weights.get(enc, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
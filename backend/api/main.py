@@ -1,23 +1,62 @@
-﻿import os
+﻿import asyncio
+import json
+import logging
+import os
+import re
+import shutil
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import joblib
 import pandas as pd
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from threadpoolctl import threadpool_limits
 
-from backend.src.config import FEATURE_COLS
-from backend.src.preprocessing import preprocess_pipeline
+from backend.api.admission import AdmissionControlMiddleware, CostLimiter
+from backend.api.http_cache import (
+    ensure_gzip_sibling,
+    etag_matches,
+    negotiate_encoding,
+    stat_etag,
+    variant_etag,
+)
+from backend.api.static_assets import asset_response, build_manifest
+from backend.api.upload_limits import UploadLimitMiddleware, UploadRoute
+from backend.src.cost_estimate import ROUTES, choose_route, estimate_upload
+from backend.src.data_quality import get_quality
+from backend.src.drift import DriftStore, drift_scores, load_reference, psi_status, reference_path, sketch
+from backend.src.history import history_columns, uses_history
+from backend.src.jobs import JobManager, JobStore
+from backend.src.model_registry import ModelRegistry, ShadowLog
+from backend.src.preprocessing import (
+    FORMAT_EXTENSIONS,
+    FORMAT_MEDIA_TYPES,
+    TABLE_FORMATS,
+    detect_format,
+    iter_table_chunks,
+    load_table,
+    save_table,
+    table_columns,
+)
+from backend.src.report_store import ReportStore
 from backend.src.report_logic import (
-    assign_action,
-    assign_risk_level,
-    enrich_report,
+    EvaluationPolicy,
+    add_guidance_text,
+    aggregate_report,
+    apply_policy,
+    guidance_templates,
     parse_policy_json,
+    policy_delta,
     safe_json_df,
 )
+from backend.src.scoring import model_feature_cols, report_columns, score_report, score_report_chunked
+
+logger = logging.getLogger(__name__)
 
 # 서버가 어떤 위치에서 실행되더라도, 환경변수의 상대경로를
 # 프로젝트 루트 기준으로 일관되게 해석하기 위해 사용합니다.
@@ -48,11 +87,216 @@ DUMMY_DATA_PATH = _resolve_path("DUMMY_DATA_PATH", "data/dummy/dummy_midterm_lik
 FRONTEND_DIST = _resolve_path("FRONTEND_DIST", "client/dist")
 REPORT_DIR.mkdir(parents=True, exist_ok=True)
 REPORT_DIR_RESOLVED = REPORT_DIR.resolve()
-FRONTEND_DIST_RESOLVED = FRONTEND_DIST.resolve()
-FRONTEND_INDEX_PATH = FRONTEND_DIST / "index.html"
+# 프론트 빌드 산출물 목록은 서버 시작 시 한 번만 만들고, 요청마다 파일 시스템을 조회하지 않습니다.
+FRONTEND_MANIFEST = build_manifest(FRONTEND_DIST)
+FRONTEND_INDEX = FRONTEND_MANIFEST.get("index.html")
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "16"))
+
+# 업로드 제한: 요청 본문 바이트 / CSV 행 수 (초과 시 413)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+MAX_UPLOAD_ROWS = int(os.getenv("MAX_UPLOAD_ROWS", "100000"))
+# multipart 업로드는 UPLOAD_SPOOL_MAX_BYTES까지만 메모리에 두고, 넘으면 UPLOAD_TMP_DIR(없으면 시스템 임시 폴더) 파일로 내려씁니다.
+# 업로드 경로에만 UploadLimitMiddleware/UploadRoute로 적용합니다(전역 tempfile/Starlette 설정은 그대로).
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", str(1024 * 1024)))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", "").strip() or None
+if UPLOAD_TMP_DIR:
+    Path(UPLOAD_TMP_DIR).mkdir(parents=True, exist_ok=True)
+
+# 비동기 채점 작업: 상태는 SQLite(JOB_DIR/jobs.sqlite3), 입력 파일은 JOB_DIR/inputs에 보관합니다.
+JOB_DIR = _resolve_path("JOB_DIR", "reports/jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_EVENT_INTERVAL = float(os.getenv("JOB_EVENT_INTERVAL", "0.5"))
+JOB_INPUT_DIR = JOB_DIR / "inputs"
+JOB_INPUT_DIR.mkdir(parents=True, exist_ok=True)
+# 실행 중 작업의 heartbeat 주기(초)와, 이 시간 이상 heartbeat가 끊기면 소유 프로세스가 죽은 것으로 보고 다시 큐에 넣는 기준(초)
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "60"))
+
+# /api/predict 채점 경로: 업로드 앞부분(CSV 첫 KB, Parquet/Arrow 메타데이터)으로 행 수/메모리를 추정해
+# - 한 번에 채점할 때의 최대 메모리 추정치 ≤ ROUTE_MEMORY_MAX_BYTES → memory
+# - ROUTE_CHUNK_ROWS행씩 나눠 채점할 때의 추정치 ≤ ROUTE_CHUNKED_MAX_BYTES → chunked
+# - 그 외 → job(비동기 작업으로 넘기고 202 반환)
+ROUTE_MEMORY_MAX_BYTES = int(os.getenv("ROUTE_MEMORY_MAX_BYTES", str(256 * 1024 * 1024)))
+ROUTE_CHUNKED_MAX_BYTES = int(os.getenv("ROUTE_CHUNKED_MAX_BYTES", str(1024 * 1024 * 1024)))
+ROUTE_CHUNK_ROWS = int(os.getenv("ROUTE_CHUNK_ROWS", "20000"))
+# 큰 업로드의 위험 등급/행 단위 리포트 단계를 ENRICH_N_JOBS개 프로세스로 나눠 실행합니다(1: 직렬, -1: 전체 코어).
+# 파티션당 최소 행 수(PARTITION_MIN_ROWS)의 2배 미만인 업로드는 직렬로 처리합니다.
+ENRICH_N_JOBS = int(os.getenv("ENRICH_N_JOBS", "1"))
+
+# /api/predict 동시 처리 제한: 업로드 크기(ADMISSION_COST_UNIT_BYTES당 1) 기준 비용 합을 ADMISSION_MAX_COST로 제한하고,
+# 초과 요청은 최대 ADMISSION_QUEUE_SIZE개까지 ADMISSION_QUEUE_TIMEOUT초 대기, 그 이상은 503 + Retry-After
+ADMISSION_MAX_COST = int(os.getenv("ADMISSION_MAX_COST", "8"))
+ADMISSION_COST_UNIT_BYTES = int(os.getenv("ADMISSION_COST_UNIT_BYTES", str(1024 * 1024)))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+predict_limiter = CostLimiter(ADMISSION_MAX_COST, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT)
+
+# 멀티 워커 배포(uvicorn --workers WEB_CONCURRENCY):
+# - 모델은 워커당 한 번만 읽고, numpy 배열은 읽기 전용 메모리 맵(mmap)으로 열어 OS 페이지 캐시를 워커 간 공유
+# - 워커마다 BLAS/OpenMP 스레드 수를 제한해 (워커 수 × 스레드 수)가 코어 수를 넘지 않도록 함
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE", "r").strip() or None
+THREADS_PER_WORKER = int(os.getenv("THREADS_PER_WORKER", "0")) or max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+threadpool_limits(limits=THREADS_PER_WORKER)
+
+# 모델 레지스트리: MODEL_DIR의 *.joblib 파일을 버전(파일명 stem)으로 선택할 수 있습니다. (기본: MODEL_PATH)
+# SHADOW_MODEL_VERSION을 지정하면 같은 전처리 결과를 그 버전으로도 채점해 SHADOW_LOG_DIR에 비교용으로 기록합니다.
+MODEL_DIR = _resolve_path("MODEL_DIR", str(MODEL_PATH.parent))
+SHADOW_MODEL_VERSION = os.getenv("SHADOW_MODEL_VERSION", "").strip() or None
+SHADOW_LOG_DIR = _resolve_path("SHADOW_LOG_DIR", "reports/shadow")
+model_registry = ModelRegistry(MODEL_DIR, MODEL_PATH, mmap_mode=MODEL_MMAP_MODE)
+shadow_log = ShadowLog(SHADOW_LOG_DIR)
+
+# 피처 드리프트: 채점마다 모델 피처 + risk_proba를 학습 기준 구간(<모델명>.drift.json)으로 집계해
+# SQLite(DRIFT_STORE_PATH)에 일별로 누적하고, GET /api/drift에서 기준 분포와 PSI/KS로 비교합니다.
+DRIFT_STORE_PATH = _resolve_path("DRIFT_STORE_PATH", "reports/drift.sqlite3")
+drift_store = DriftStore(DRIFT_STORE_PATH)
+
+# 채점 결과는 인덱스가 있는 SQLite 리포트 저장소에 누적됩니다.
+# 리포트 파일(CSV/Parquet/Arrow)은 다운로드 요청 시 저장소에서 내보내 REPORT_DIR에 만듭니다.
+REPORT_STORE_PATH = _resolve_path("REPORT_STORE_PATH", "reports/report_store.sqlite3")
+report_store = ReportStore(REPORT_STORE_PATH)
+
+# 추이 피처: 채점 전에 업로드 학생들의 직전 스냅샷을 저장소에서 조회(학생별 인덱스 탐색)해 as-of 조인으로
+# prev_*/delta_*/has_history/days_since_prev 컬럼을 붙입니다. 기본은 꺼져 있고(조회 비용 절약),
+# 추이 피처로 학습한 모델이거나 요청 fields에 추이 컬럼이 있으면 설정과 무관하게 조회합니다.
+HISTORY_FEATURES = os.getenv("HISTORY_FEATURES", "0").strip().lower() in {"1", "true", "yes"}
+
+# 최근 채점 결과(DataFrame)를 report_id 기준으로 보관하는 LRU 캐시입니다.
+# 정책 what-if 재계산 시 CSV 재업로드/재추론 없이 이 프레임을 재사용합니다.
+REPORT_ID_PATTERN = re.compile(r"^\d{8}_\d{6}_[0-9a-f]{8}$")
+REPORT_FILENAME_PATTERN = re.compile(r"^prediction_report_(\d{8}_\d{6}_[0-9a-f]{8})(\.[a-z]+)$")
+_report_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+def _report_filename(report_id: str, fmt: str = "csv") -> str:
+    return f"prediction_report_{report_id}{FORMAT_EXTENSIONS[fmt]}"
+
+def _report_media_type(filename: str) -> str:
+    try:
+        return FORMAT_MEDIA_TYPES[detect_format(filename=filename)]
+    except ValueError:
+        return "application/octet-stream"
+
+def _cache_report(report_id: str, df: pd.DataFrame) -> None:
+    _report_cache[report_id] = df
+    _report_cache.move_to_end(report_id)
+    while len(_report_cache) > REPORT_CACHE_SIZE:
+        _report_cache.popitem(last=False)
+
+def _load_report_frame(report_id: str) -> pd.DataFrame:
+    # 캐시 → 리포트 저장소 → (저장소 도입 이전) 리포트 파일 순으로 복원합니다.
+    if not REPORT_ID_PATTERN.match(report_id):
+        raise HTTPException(status_code=404, detail="Report not found.")
+    if report_id in _report_cache:
+        _report_cache.move_to_end(report_id)
+        return _report_cache[report_id]
+    df = report_store.load_report(report_id)
+    if df is not None:
+        _cache_report(report_id, df)
+        return df
+    for fmt in TABLE_FORMATS:
+        path = REPORT_DIR / _report_filename(report_id, fmt)
+        if path.exists():
+            break
+    else:
+        raise HTTPException(status_code=404, detail="Report not found.")
+    df = load_table(path, fmt)
+    _cache_report(report_id, df)
+    return df
+
+def _report_policy(report_id: str) -> EvaluationPolicy | None:
+    # 채점 시 적용된 정책 (안내 문구 지연 생성용)
+    policy = report_store.report_policy(report_id)
+    return EvaluationPolicy(**policy) if policy else None
+
+def _run_scoring_job(job: dict, report_stage) -> dict:
+    # 작업 워커 스레드에서 실행: parse → preprocess → score → enrich → write
+    # 성공/실패와 관계없이 입력 파일은 삭제합니다(프로세스가 죽은 경우에만 남아 재실행에 쓰임).
+    params = job["params"]
+    try:
+        report_stage("parse")
+        input_path, input_format = params["input_path"], params["input_format"]
+        with open(input_path, "rb") as f:
+            chunked = estimate_upload(f, input_format).rows > ROUTE_CHUNK_ROWS
+        # 큰 입력은 파일을 청크로 두 번 읽어 채점(전체를 메모리에 올리지 않음)
+        if chunked:
+            columns = table_columns(input_path, input_format)
+            source = _upload_chunks(input_path, input_format)
+        else:
+            source = _read_upload_frame(input_path, input_format)
+            columns = source.columns
+        if params.get("fields"):
+            _check_fields(params["fields"], report_columns(columns))
+        policy_obj = parse_policy_json(params["policy"])
+        df_result, model_version, shadow = _score_upload(
+            source,
+            policy_obj,
+            params.get("model_version"),
+            chunk_rows=ROUTE_CHUNK_ROWS if chunked else None,
+            requested_fields=params.get("fields"),
+            on_stage=report_stage,
+            cohort_col=params.get("cohort"),
+        )
+        report_stage("write")
+        # 작업은 요청 경로 밖이므로 저장소 커밋까지 기다림: 다른 워커의 결과/다운로드 요청도 바로 찾고, 쓰기 실패는 작업 실패
+        report_id, report_filename = _save_report(df_result, params["report_format"], policy_obj, wait=True)
+        _log_shadow(report_id, df_result, model_version, shadow)
+        _record_drift(model_version, df_result)
+    finally:
+        Path(params["input_path"]).unlink(missing_ok=True)
+    return {
+        "rows": len(df_result),
+        "model_version": model_version,
+        "quality": get_quality(df_result),
+        "report_id": report_id,
+        "report_filename": report_filename,
+        "report_url": f"/api/download/{report_filename}",
+    }
+
+job_store = JobStore(JOB_DIR / "jobs.sqlite3")
+job_manager = JobManager(
+    job_store,
+    _run_scoring_job,
+    max_workers=JOB_WORKERS,
+    stale_after=timedelta(seconds=JOB_STALE_SECONDS),
+    heartbeat_interval=JOB_HEARTBEAT_SECONDS,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 기본/섀도 모델을 미리 읽어 두고, 재시작 전 끝나지 않은 작업을 다시 실행하며, 종료 시 워커 풀을 정리합니다.
+    for version in {model_registry.default_version, SHADOW_MODEL_VERSION} - {None}:
+        try:
+            model_registry.get(version)
+        except (KeyError, FileNotFoundError):
+            pass
+    job_manager.recover()
+    yield
+    job_manager.shutdown()
+    shadow_log.shutdown()
+    report_store.shutdown()
 
 # --- 앱 초기화: FastAPI 생성 및 CORS 미들웨어 등록 ---
-app = FastAPI(title=APP_TITLE)
+app = FastAPI(title=APP_TITLE, lifespan=lifespan)
+# 업로드 폼은 UploadLimitMiddleware가 전달한 spool 설정으로 파싱합니다.
+app.router.route_class = UploadRoute
+# CORS 미들웨어보다 먼저 등록해야(안쪽에 위치) 413/503 응답에도 CORS 헤더가 붙습니다.
+# 등록 역순으로 감싸지므로 크기 초과(413)는 대기열에 들어가기 전에 걸러집니다.
+app.add_middleware(
+    AdmissionControlMiddleware,
+    limiter=predict_limiter,
+    cost_unit_bytes=ADMISSION_COST_UNIT_BYTES,
+    retry_after=ADMISSION_RETRY_AFTER,
+    paths=("/api/predict",),
+)
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES,
+    paths=("/api/predict", "/api/jobs"),
+    spool_max_bytes=UPLOAD_SPOOL_MAX_BYTES,
+    spool_dir=UPLOAD_TMP_DIR,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_load_allowed_origins(),
@@ -61,11 +305,260 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _upload_format(file: UploadFile) -> str:
+    # content type 우선, 모호하면 확장자로 CSV / Parquet / Arrow IPC를 판별합니다.
+    try:
+        return detect_format(file.filename, file.content_type)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Only CSV, Parquet or Arrow files are supported.") from exc
+
+def _read_upload_frame(source, fmt: str = "csv") -> pd.DataFrame:
+    # 행 수 제한 + 1행까지만 읽어, 초과 업로드도 한도만큼만 메모리에 올립니다.
+    df = load_table(source, fmt, nrows=MAX_UPLOAD_ROWS + 1)
+    if len(df) > MAX_UPLOAD_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the maximum of {MAX_UPLOAD_ROWS} rows.",
+        )
+    return df
+
+def _upload_chunks(source, fmt: str = "csv"):
+    # 청크 경로 입력: 호출할 때마다 업로드를 ROUTE_CHUNK_ROWS행씩 처음부터 다시 읽는 함수
+    # (행 수 제한은 첫 순회(전처리 계획) 중에 검사하므로 채점 전에 413으로 끝남)
+    def chunks():
+        rows = 0
+        for chunk in iter_table_chunks(source, fmt, chunksize=ROUTE_CHUNK_ROWS):
+            rows += len(chunk)
+            if rows > MAX_UPLOAD_ROWS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload exceeds the maximum of {MAX_UPLOAD_ROWS} rows.",
+                )
+            yield chunk
+
+    return chunks
+
+def _check_report_format(report_format: str) -> None:
+    if report_format not in TABLE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"report_format must be one of {list(TABLE_FORMATS)}.")
+
+def _check_cohort(cohort: str | None, columns: list[str] | pd.Index) -> None:
+    if cohort and cohort not in columns:
+        raise HTTPException(status_code=400, detail=f"Unknown cohort column: {cohort}")
+
+def _load_model(version: str | None = None) -> tuple:
+    # (버전, 모델). 버전별로 한 번만 읽고, 파일 (수정시각, 크기)가 바뀔 때만 다시 읽습니다. (재학습 후 교체 반영)
+    try:
+        return model_registry.get(version)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown model version: {version}") from None
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=500, detail=f"Model file not found: {exc.args[0]}") from None
+
+def _needs_history(model, requested_fields: list[str] | None = None) -> bool:
+    # 이전 스냅샷 조회 여부: HISTORY_FEATURES 설정, 추이 피처 모델, 또는 응답에 추이 컬럼 요청
+    if HISTORY_FEATURES or uses_history(model_feature_cols(model)):
+        return True
+    return bool(set(requested_fields or []) & set(history_columns()))
+
+def _score_upload(
+    source,
+    policy_obj: EvaluationPolicy,
+    model_version: str | None = None,
+    chunk_rows: int | None = None,
+    requested_fields: list[str] | None = None,
+    **kwargs,
+) -> tuple[pd.DataFrame, str, dict | None]:
+    # 선택한 버전으로 채점하고, 섀도 모델이 설정돼 있으면 같은 전처리 결과로 확률만 함께 계산합니다.
+    # source는 DataFrame, 또는 chunk_rows가 있을 때 _upload_chunks의 청크 읽기 함수입니다.
+    # chunk_rows가 있으면 그 행 수씩 나눠 채점합니다(결과는 한 번에 채점한 것과 같음).
+    version, model = _load_model(model_version)
+    shadow = None
+    shadow_model = None
+    if SHADOW_MODEL_VERSION and SHADOW_MODEL_VERSION != version:
+        shadow = {"proba": None, "error": None}
+        try:
+            _, shadow_model = model_registry.get(SHADOW_MODEL_VERSION)
+        except (KeyError, FileNotFoundError):
+            shadow["error"] = f"Shadow model not found: {SHADOW_MODEL_VERSION}"
+
+    def on_shadow(proba, error):
+        shadow.update(proba=proba, error=error)
+
+    kwargs["as_of"] = datetime.now()
+    kwargs["n_jobs"] = ENRICH_N_JOBS
+    as_of = kwargs["as_of"]
+    if _needs_history(model, requested_fields):
+        if chunk_rows:
+            # 청크마다 해당 학생의 이전 스냅샷만 조회
+            kwargs["history"] = lambda ids: report_store.snapshots_asof(ids, as_of)
+        elif "student_id" in source.columns:
+            kwargs["history"] = report_store.snapshots_asof(source["student_id"], as_of)
+
+    if chunk_rows:
+        df_result = score_report_chunked(
+            source, model, policy_obj, chunk_rows, shadow_model=shadow_model, on_shadow=on_shadow, **kwargs
+        )
+    else:
+        df_result = score_report(source, model, policy_obj, shadow_model=shadow_model, on_shadow=on_shadow, **kwargs)
+    return df_result, version, shadow
+
+def _log_shadow(report_id: str, df_result: pd.DataFrame, model_version: str, shadow: dict | None) -> None:
+    # 섀도 확률은 응답/리포트에 넣지 않고 비교 로그로만 남깁니다(쓰기는 백그라운드 스레드).
+    if shadow is None:
+        return
+    shadow_log.submit(
+        report_id,
+        df_result["student_id"],
+        model_version,
+        df_result["risk_proba"].to_numpy(),
+        SHADOW_MODEL_VERSION,
+        shadow["proba"],
+        shadow["error"],
+    )
+
+_drift_reference_cache: dict = {}
+
+def _drift_reference(version: str) -> dict | None:
+    # 모델 옆 기준 분포 파일(train_model.py가 저장). 파일이 바뀔 때만 다시 읽습니다.
+    path = reference_path(model_registry.path(version))
+    if not path.exists():
+        return None
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    cached = _drift_reference_cache.get(version)
+    if cached is None or cached[0] != key:
+        cached = (key, load_reference(path))
+        _drift_reference_cache[version] = cached
+    return cached[1]
+
+def _record_drift(model_version: str, df_result: pd.DataFrame) -> None:
+    # 기준 분포가 없는 모델(기준 저장 이전 학습)은 집계하지 않습니다.
+    reference = _drift_reference(model_version)
+    if reference is not None:
+        drift_store.add(reference["reference_id"], model_version, sketch(df_result, reference))
+
+def _log_write_failure(report_id: str, future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Report %s was not saved to the report store: %s", report_id, exc, exc_info=exc)
+
+def _save_report(
+    df_result: pd.DataFrame,
+    report_format: str = "csv",
+    policy_obj: EvaluationPolicy | None = None,
+    wait: bool = False,
+) -> tuple[str, str]:
+    # 리포트를 저장소 쓰기 스레드에 넘기고 what-if 재계산용 캐시에 등록합니다.
+    # - wait=False(예측 응답): 쓰기를 기다리지 않고, 실패하면 로그로 남김
+    # - wait=True(비동기 작업): 저장소에 커밋될 때까지 기다리고, 실패하면 예외
+    # 파일은 여기서 쓰지 않고, report_filename 다운로드 요청 시 report_format으로 내보냅니다.
+    created_at = datetime.now()
+    report_id = f"{created_at:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+    future = report_store.submit(
+        report_id,
+        df_result,
+        created_at=created_at,
+        policy=asdict(policy_obj) if policy_obj is not None else None,
+    )
+    if wait:
+        future.result()
+    else:
+        future.add_done_callback(lambda f: _log_write_failure(report_id, f))
+    _cache_report(report_id, df_result)
+    return report_id, _report_filename(report_id, report_format)
+
+def _export_report_file(filename: str) -> Path | None:
+    # 저장소에 있는 리포트를 요청된 파일명(형식)으로 REPORT_DIR에 내보냅니다.
+    # 임시 파일에 쓴 뒤 교체(os.replace)하므로 동시 요청에도 반쯤 쓰인 파일이 노출되지 않습니다.
+    match = REPORT_FILENAME_PATTERN.match(filename)
+    if match is None or not report_store.has_report(match.group(1)):
+        return None
+    try:
+        fmt = detect_format(filename=filename)
+    except ValueError:
+        return None
+    path = REPORT_DIR / filename
+    tmp_path = REPORT_DIR / f".{filename}.{uuid.uuid4().hex[:8]}.tmp"
+    report_id = match.group(1)
+    df_export = add_guidance_text(_load_report_frame(report_id), _report_policy(report_id))
+    save_table(df_export, tmp_path, fmt)
+    os.replace(tmp_path, path)
+    return path
+
+# mode=compact: UI에서 바로 활용할 핵심 컬럼 (fields 미지정 시 사용하는 기본 필드 묶음)
+COMPACT_FIELDS = [
+    "student_id",
+    "risk_level",
+    "risk_proba",
+    "top_reasons",
+    "model_reasons",
+    "guidance_code",
+    "required_final_score",
+    "required_performance_score",
+    "action",
+    "remaining_absence_allowance",
+]
+
+def _requested_fields(fields: str | None, mode: str) -> list[str] | None:
+    # fields(쉼표 구분)가 있으면 우선, 없으면 mode=compact 기본 묶음, full이면 None(전체)
+    if fields:
+        return [f.strip() for f in fields.split(",") if f.strip()]
+    if mode == "compact":
+        return COMPACT_FIELDS
+    return None
+
+def _check_fields(fields: list[str], columns: list[str] | pd.Index) -> None:
+    # columns: 채점 전에는 report_columns(업로드 컬럼), 저장된 리포트는 그 컬럼
+    known = set(columns)
+    if "guidance_code" in known:
+        known.add("score_guidance")
+    unknown = [f for f in fields if f not in known]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+def _report_response(
+    df_result: pd.DataFrame,
+    report_id: str,
+    report_filename: str,
+    fields: list[str] | None = None,
+    policy_obj: EvaluationPolicy | None = None,
+) -> dict:
+    # fields가 있으면 요청 컬럼만(student_id는 항상 포함) 반환합니다.
+    # 점수 안내는 구조화 컬럼(guidance_code, required_*)과 템플릿 표(guidance_templates)로 보내고,
+    # 문구(score_guidance)는 요청된 경우(또는 전체 응답)에만 서버에서 만듭니다.
+    extra = {}
+    if fields is None:
+        df_response = add_guidance_text(df_result, policy_obj)
+    else:
+        if "score_guidance" in fields:
+            df_result = add_guidance_text(df_result, policy_obj)
+        cols = ["student_id"] + [f for f in fields if f != "student_id"]
+        if "guidance_code" in fields and "guidance_code" not in df_result.columns:
+            # 구조화 컬럼 도입 이전 리포트는 저장된 문구를 그대로 보냅니다.
+            cols.append("score_guidance")
+        cols = [col for col in dict.fromkeys(cols) if col in df_result.columns]
+        df_response = df_result[cols]
+        if policy_obj is not None and "guidance_code" in cols:
+            extra["guidance_templates"] = guidance_templates(policy_obj)
+
+    return {
+        "rows": len(df_result),
+        "report_id": report_id,
+        "report_filename": report_filename,
+        # 프론트 대시보드(DashboardHeader/MobileFloatingNav)에서 이 경로를 받아
+        # buildApiUrl()로 절대/상대 URL을 완성한 뒤 다운로드 버튼에 사용합니다.
+        "report_url": f"/api/download/{report_filename}",
+        # 프론트 DashboardPage는 이 data 배열을 라우터 state로 전달받아 표를 렌더링합니다.
+        "data": safe_json_df(df_response).to_dict(orient="records"),
+        **extra,
+    }
+
 @app.get("/")
-def root():
+def root(request: Request):
     # React 빌드 산출물이 있으면 앱을 서빙하고, 없으면 간단한 API 메시지를 반환합니다.
-    if FRONTEND_INDEX_PATH.exists():
-        return FileResponse(FRONTEND_INDEX_PATH)
+    if FRONTEND_INDEX is not None:
+        return asset_response(FRONTEND_INDEX, request.headers)
     return {"message": APP_TITLE}
 
 @app.get("/api/health")
@@ -73,6 +566,52 @@ def health():
     # 서버 상태 확인용 경량 헬스체크 엔드포인트입니다.
     return {"status": "ok"}
 
+@app.get("/api/metrics")
+def metrics():
+    # 현재 워커의 /api/predict 동시 처리/대기열 지표입니다. (워커 프로세스별 값)
+    return {"pid": os.getpid(), "predict_admission": predict_limiter.metrics()}
+
+@app.get("/api/models")
+def list_models():
+    # 선택 가능한 모델 버전(MODEL_DIR의 *.joblib)과 기본/섀도 버전입니다.
+    model_registry.refresh()
+    return {
+        "default": model_registry.default_version,
+        "shadow": SHADOW_MODEL_VERSION,
+        "versions": model_registry.describe(),
+    }
+
+@app.get("/api/drift")
+def get_drift(model_version: str | None = None, days: int | None = None):
+    # 업로드 분포(누적 sketch)와 학습 기준 분포의 피처별 PSI/KS. days를 주면 최근 days일만 비교합니다.
+    if days is not None and days < 1:
+        raise HTTPException(status_code=400, detail="days must be >= 1.")
+    version = model_version or model_registry.default_version
+    try:
+        reference = _drift_reference(version)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown model version: {version}") from None
+    if reference is None:
+        raise HTTPException(status_code=404, detail=f"Drift reference not found for model version: {version}")
+
+    since = date.today() - timedelta(days=days - 1) if days else None
+    features = drift_scores(reference, drift_store.totals(reference["reference_id"], since))
+    psis = [f["psi"] for f in features if f["psi"] is not None]
+    scored = next((f["rows"] for f in features if f["feature"] == "risk_proba"), 0)
+    max_psi = max(psis) if psis else None
+    return {
+        "model_version": version,
+        "reference": {
+            "reference_id": reference["reference_id"],
+            "created_at": reference["created_at"],
+            "rows": reference["rows"],
+        },
+        "window": {"days": days, "since": since.isoformat() if since else None, "rows": scored},
+        "max_psi": max_psi,
+        "status": psi_status(max_psi),
+        "features": features,
+    }
+
 @app.get("/api/sample/dummy-midterm-like-labeled")
 def download_dummy_csv():
     # 프론트 LandingPage의 "더미 파일 다운로드" 버튼이 호출하는 엔드포인트입니다.
@@ -85,105 +624,316 @@ def download_dummy_csv():
         filename=DUMMY_DATA_PATH.name,
     )
 
+# 업로드 파싱/채점/저장은 모두 동기(CPU/파일) 작업이므로 def로 선언해 스레드 풀에서 실행합니다(이벤트 루프 비차단).
 @app.post("/api/predict")
-async def predict(
+def predict(
     file: UploadFile = File(...),
     policy: str = Form(...),
     mode: str = "full",
+    report_format: str = "csv",
+    fields: str | None = None,
+    cohort: str | None = None,
+    model_version: str | None = None,
+    route: str = "auto",
 ):
     # 예측 처리 메인 흐름:
     # - 프론트 UploadModal(shared/api.ts -> predictCsv)에서 multipart/form-data로 호출
+    # 0) 업로드 앞부분으로 크기를 추정해 채점 경로 선택(route=auto, 직접 지정 가능)
+    #    - job이면 비동기 작업으로 넘기고 202 + 작업 정보 반환(결과는 /api/jobs/{job_id}/result)
     # 1) CSV 검증 및 로드
     # 2) 입력 전처리
-    # 3) 학습된 모델 로드 후 확률 예측
-    # 4) 가이드/리포트 컬럼 확장
-    # 5) 리포트 CSV 저장 후 JSON 응답 반환
+    # 3) 학습된 모델(model_version, 기본은 MODEL_PATH) 로드 후 확률 예측 (+ 섀도 모델 비교 기록)
+    # 4) 가이드/리포트 컬럼 확장 (cohort가 있으면 코호트별 참여도 기준; fields/mode는 응답 컬럼만 고르며 채점 전에 검증)
+    # 5) 리포트 CSV 저장 후 JSON 응답 반환 (전처리 중 한 번에 검사한 데이터 품질 요약 포함)
     try:
-        if file.content_type != "text/csv":
-            raise HTTPException(status_code=400, detail="Only CSV files are supported.")
-
-        df_raw = pd.read_csv(file.file)
-        df_processed = preprocess_pipeline(df_raw)
+        _check_report_format(report_format)
+        requested = _requested_fields(fields, mode)
+        if route not in ("auto", *ROUTES):
+            raise HTTPException(status_code=400, detail=f"route must be one of {['auto', *ROUTES]}.")
 
-        if not MODEL_PATH.exists():
-            raise HTTPException(status_code=500, detail=f"Model file not found: {MODEL_PATH}")
-        model = joblib.load(MODEL_PATH)
+        input_format = _upload_format(file)
+        estimate = estimate_upload(file.file, input_format)
+        chosen = choose_route(
+            estimate,
+            ROUTE_MEMORY_MAX_BYTES,
+            ROUTE_CHUNKED_MAX_BYTES,
+            ROUTE_CHUNK_ROWS,
+            forced=None if route == "auto" else route,
+        )
+        route_info = {"route": chosen, "estimate": estimate.to_dict(ROUTE_CHUNK_ROWS)}
+        if chosen == "job":
+            job_fields = _requested_fields(fields, "full")
+            _check_job_upload(file, input_format, cohort, job_fields)
+            parse_policy_json(policy)
+            if model_version:
+                _load_model(model_version)
+            job_id = _submit_job(file, input_format, policy, report_format, job_fields, cohort, model_version)
+            return JSONResponse(status_code=202, content={**route_info, **_job_payload(_get_job(job_id))})
 
-        X = df_processed[FEATURE_COLS]
-        risk_proba = model.predict_proba(X)[:, 1]
-        policy_obj = parse_policy_json(policy)
-
-        df_result = df_processed.copy()
-        df_result["risk_proba"] = risk_proba
-        df_result["risk_level"] = df_result["risk_proba"].apply(assign_risk_level)
-        df_result["action"] = df_result["risk_level"].apply(assign_action)
-        df_result = enrich_report(df_result, policy_obj)
-
-        # "compact" 모드는 UI에서 바로 활용할 핵심 컬럼만 반환합니다.
-        if mode == "compact":
-            compact_cols = [
-                "student_id",
-                "risk_level",
-                "risk_proba",
-                "top_reasons",
-                "score_guidance",
-                "action",
-                "remaining_absence_allowance",
-            ]
-            compact_cols = [col for col in compact_cols if col in df_result.columns]
-            df_response = df_result[compact_cols]
+        # chunked는 업로드를 청크로 스트리밍(컬럼 검증은 헤더/스키마만 읽음), memory는 한 번에 로드
+        if chosen == "chunked":
+            columns = table_columns(file.file, input_format)
+            source = _upload_chunks(file.file, input_format)
         else:
-            df_response = df_result
-
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        token = uuid.uuid4().hex[:8]
-        report_filename = f"prediction_report_{ts}_{token}.csv"
-        output_path = REPORT_DIR / report_filename
-        df_result.to_csv(output_path, index=False, encoding="utf-8-sig")
+            source = _read_upload_frame(file.file, input_format)
+            columns = source.columns
+        _check_cohort(cohort, columns)
+        if fields:
+            _check_fields(requested, report_columns(columns))
+        policy_obj = parse_policy_json(policy)
+        # fields/mode는 응답 컬럼만 고릅니다. 저장되는 리포트(다운로드/what-if)는 항상 전체 컬럼입니다.
+        df_result, version, shadow = _score_upload(
+            source,
+            policy_obj,
+            model_version,
+            chunk_rows=ROUTE_CHUNK_ROWS if chosen == "chunked" else None,
+            requested_fields=requested,
+            cohort_col=cohort or None,
+        )
 
-        # 프론트 대시보드(DashboardHeader/MobileFloatingNav)에서 이 경로를 받아
-        # buildApiUrl()로 절대/상대 URL을 완성한 뒤 다운로드 버튼에 사용합니다.
-        report_url = f"/api/download/{report_filename}"
-        df_result = safe_json_df(df_result)
-
-        return {
-            "rows": len(df_result),
-            "report_filename": report_filename,
-            "report_url": report_url,
-            # 프론트 DashboardPage는 이 data 배열을 라우터 state로 전달받아 표를 렌더링합니다.
-            "data": safe_json_df(df_response).to_dict(orient="records"),
-        }
+        report_id, report_filename = _save_report(df_result, report_format, policy_obj)
+        _log_shadow(report_id, df_result, version, shadow)
+        _record_drift(version, df_result)
+        response = _report_response(df_result, report_id, report_filename, requested, policy_obj)
+        response["model_version"] = version
+        response["quality"] = get_quality(df_result)
+        response.update(route_info)
+        return response
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+def _job_payload(job: dict) -> dict:
+    job_id = job["job_id"]
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "error": job["error"],
+        "status_url": f"/api/jobs/{job_id}",
+        "events_url": f"/api/jobs/{job_id}/events",
+        "result_url": f"/api/jobs/{job_id}/result",
+    }
+
+def _get_job(job_id: str) -> dict:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+def _check_job_upload(file: UploadFile, input_format: str, cohort: str | None, fields: list[str] | None) -> None:
+    # 작업 등록(202) 전에 헤더/스키마만 읽어 cohort/fields를 검증합니다(동기 경로와 같은 400).
+    columns = table_columns(file.file, input_format)
+    _check_cohort(cohort, columns)
+    if fields:
+        _check_fields(fields, report_columns(columns))
+
+def _submit_job(
+    file: UploadFile,
+    input_format: str,
+    policy: str,
+    report_format: str,
+    fields: list[str],
+    cohort: str | None,
+    model_version: str | None,
+) -> str:
+    # 업로드를 작업 입력 폴더로 복사한 뒤 워커 풀에 채점 작업을 등록합니다.
+    input_path = JOB_INPUT_DIR / f"{uuid.uuid4().hex}{FORMAT_EXTENSIONS[input_format]}"
+    with open(input_path, "wb") as out:
+        shutil.copyfileobj(file.file, out)
+
+    return job_manager.submit({
+        "input_path": str(input_path),
+        "input_format": input_format,
+        "policy": policy,
+        "report_format": report_format,
+        "fields": fields,
+        "cohort": cohort or None,
+        "model_version": model_version or None,
+    })
+
+# 업로드 복사(shutil.copyfileobj)가 이벤트 루프를 막지 않도록 def(스레드 풀)로 실행합니다.
+@app.post("/api/jobs", status_code=202)
+def create_job(
+    file: UploadFile = File(...),
+    policy: str = Form(...),
+    report_format: str = "csv",
+    fields: str | None = None,
+    cohort: str | None = None,
+    model_version: str | None = None,
+):
+    # /api/predict와 같은 multipart 입력을 받아 즉시 job_id를 반환하고,
+    # 실제 채점은 로컬 워커 풀에서 비동기로 수행합니다(프록시 타임아웃 회피).
+    _check_report_format(report_format)
+    input_format = _upload_format(file)
+    requested = _requested_fields(fields, "full")
+    _check_job_upload(file, input_format, cohort, requested)
+    try:
+        parse_policy_json(policy)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if model_version:
+        _load_model(model_version)
+
+    job_id = _submit_job(file, input_format, policy, report_format, requested, cohort, model_version)
+    return _job_payload(_get_job(job_id))
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    # 폴링용 작업 상태 조회 (stage: parse/preprocess/score/enrich/write)
+    return _job_payload(_get_job(job_id))
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    # Server-Sent Events: 상태/단계가 바뀔 때마다 progress 이벤트를 보내고, 완료/실패 시 종료합니다.
+    _get_job(job_id)
+
+    async def stream():
+        last = None
+        while True:
+            payload = _job_payload(_get_job(job_id))
+            key = (payload["status"], payload["stage"], payload["progress"])
+            if key != last:
+                last = key
+                yield f"event: progress\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            if payload["status"] in ("done", "failed"):
+                return
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/jobs/{job_id}/result")
+def get_job_result(job_id: str, mode: str = "full", fields: str | None = None):
+    # 완료된 작업의 결과를 /api/predict와 같은 형식으로 반환합니다.
+    job = _get_job(job_id)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job['error']}")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is not finished yet (status: {job['status']}).")
+
+    result = job["result"]
+    df_result = _load_report_frame(result["report_id"])
+    # 조회 시 fields/mode가 없으면 작업 생성 시 요청한 fields로 응답합니다.
+    requested = _requested_fields(fields, mode) if fields or mode != "full" else job["params"].get("fields")
+    if fields:
+        _check_fields(requested, df_result.columns)
+    response = _report_response(
+        df_result, result["report_id"], result["report_filename"], requested, _report_policy(result["report_id"])
+    )
+    for key in ("model_version", "quality"):
+        if key in result:
+            response[key] = result[key]
+    return response
+
+@app.post("/api/reports/{report_id}/policy")
+def recompute_policy(report_id: str, policy: str = Form(...)):
+    # 정책 what-if: 기존 리포트(report_id)에 새 정책을 적용해
+    # 정책 의존 컬럼(absence_limit/remaining_absence_allowance/guidance_code/required_*)만 다시 계산하고,
+    # 값이 바뀐 학생 행만(delta) 반환합니다. 저장된 리포트는 변경하지 않습니다.
+    df_report = _load_report_frame(report_id)
+    try:
+        policy_obj = parse_policy_json(policy)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    df_new = apply_policy(df_report, policy_obj)
+    df_delta = policy_delta(df_report, df_new)
+    return {
+        "report_id": report_id,
+        "rows": len(df_new),
+        "changed_rows": len(df_delta),
+        "data": safe_json_df(df_delta).to_dict(orient="records"),
+        "guidance_templates": guidance_templates(policy_obj),
+    }
+
+@app.get("/api/reports")
+def list_reports(limit: int = 50, offset: int = 0):
+    # 저장소의 리포트 목록(최신순)
+    limit = max(1, min(limit, 500))
+    return {"reports": report_store.list_reports(limit=limit, offset=max(0, offset))}
+
+@app.get("/api/reports/{report_id}/summary")
+def report_summary(report_id: str):
+    # 리포트 단위 요약(행 수, 위험도별 인원, 평균 위험 확률/성취율, 적용 정책)
+    summary = report_store.report_summary(report_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Report not found.")
+    return summary
+
+@app.get("/api/reports/{report_id}/aggregates")
+def report_aggregates(report_id: str, bins: int = 10):
+    # 대시보드 요약용 집계(위험도별 인원, 확률/성취율 히스토그램, 사유 빈도, 남은 결석 구간)
+    # 행 데이터 없이 작은 JSON 하나로 요약 화면을 그릴 수 있습니다.
+    if not 1 <= bins <= 100:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 100.")
+    df_report = _load_report_frame(report_id)
+    return {"report_id": report_id, **aggregate_report(df_report, bins=bins)}
+
+@app.get("/api/students/{student_id}/history")
+def student_history(student_id: str):
+    # 학생별 리포트 이력(시간순 위험 확률/등급) — student_id 인덱스 조회
+    return {"student_id": student_id, "history": report_store.student_history(student_id)}
+
+# 이미 압축된 형식(Parquet)은 gzip 전송 대상에서 제외합니다.
+GZIP_REPORT_FORMATS = {"csv", "arrow"}
+
 @app.get("/api/download/{filename}")
-def download_report(filename: str):
+def download_report(filename: str, request: Request):
     # REPORT_DIR 내부 파일만 다운로드하도록 제한합니다(경로 이탈 방지).
+    # 파일이 없으면 리포트 저장소에서 해당 형식으로 내보낸 뒤 제공합니다.
+    # - 강한 ETag + If-None-Match → 304
+    # - Accept-Encoding: gzip이면 .gz 압축본(최초 요청 시 생성)을 Content-Encoding: gzip으로 전송
+    # - Range/If-Range(이어받기)는 FileResponse가 선택된 표현(원본/압축본) 기준으로 처리
     path = (REPORT_DIR / filename).resolve()
-    if not path.exists() or path.parent != REPORT_DIR_RESOLVED:
+    if path.parent != REPORT_DIR_RESOLVED:
         raise HTTPException(status_code=404, detail="Report file not found.")
+    if not path.exists():
+        path = _export_report_file(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Report file not found.")
+
+    media_type = _report_media_type(filename)
+    gzip_ok = media_type != "application/octet-stream" and detect_format(filename=filename) in GZIP_REPORT_FORMATS
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), ["gzip"] if gzip_ok else [])
+    body_path = ensure_gzip_sibling(path) if encoding == "gzip" else path
+
+    headers = {
+        "ETag": variant_etag(stat_etag(path), encoding),
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
     return FileResponse(
-        path,
-        media_type="text/csv",
+        body_path,
+        media_type=media_type,
         filename=filename,
+        headers=headers,
     )
 
 @app.get("/{full_path:path}", include_in_schema=False)
-def serve_frontend(full_path: str):
+def serve_frontend(full_path: str, request: Request):
     # SPA/정적 파일 서빙 규칙:
-    # - 요청 경로에 해당하는 정적 파일이 있으면 그 파일 반환
+    # - 요청 경로가 빌드 산출물 목록(manifest)에 있으면 그 파일 반환(압축본/ETag/Cache-Control 포함)
     # - 정적 파일이 아니면 index.html 반환(클라이언트 라우팅)
     # - /api 경로는 절대 프론트 fallback으로 삼키지 않음
-    if not FRONTEND_INDEX_PATH.exists():
+    # - 목록의 키는 dist 내부 상대 경로뿐이므로 경로 이탈 요청은 자연히 index.html로 처리됨
+    if FRONTEND_INDEX is None:
         raise HTTPException(status_code=404, detail="Frontend build not found.")
 
     if full_path == "api" or full_path.startswith("api/"):
         raise HTTPException(status_code=404, detail="API endpoint not found.")
 
-    candidate = (FRONTEND_DIST / full_path).resolve()
-    if full_path and candidate.is_file() and candidate.is_relative_to(FRONTEND_DIST_RESOLVED):
-        return FileResponse(candidate)
-
-    return FileResponse(FRONTEND_INDEX_PATH)
+    asset = FRONTEND_MANIFEST.get(full_path, FRONTEND_INDEX)
+    return asset_response(asset, request.headers)
@@ -0,0 +1,79 @@
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping
+
+from fastapi import Response
+from fastapi.responses import FileResponse
+
+from backend.api.http_cache import (
+    ENCODING_SUFFIXES,
+    etag_matches,
+    file_etag,
+    negotiate_encoding,
+    variant_etag,
+)
+
+# 프론트 빌드 산출물(client/dist) 서빙용 자산 목록(manifest)입니다.
+# - 서버 시작 시 한 번만 디렉터리를 훑어 경로별 ETag/Cache-Control/압축본을 계산
+# - 요청마다 Path.resolve()/is_file() 호출 없이 dict 조회만 수행(목록에 없는 경로는 서빙 불가)
+# - 압축본(.br/.gz)은 빌드 시 backend/scripts/precompress_frontend.py로 미리 생성
+
+# Vite 해시 파일명 (예: assets/index-BxYz12ab.js)
+HASHED_ASSET_PATTERN = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    path: Path
+    media_type: str
+    etag: str
+    cache_control: str
+    variants: Dict[str, Path] = field(default_factory=dict)  # encoding -> 압축본 경로
+
+
+def build_manifest(dist_dir: Path) -> Dict[str, StaticAsset]:
+    manifest: Dict[str, StaticAsset] = {}
+    if not dist_dir.is_dir():
+        return manifest
+
+    suffixes = set(ENCODING_SUFFIXES.values())
+    for path in sorted(dist_dir.rglob("*")):
+        if not path.is_file() or path.suffix in suffixes:
+            continue
+        rel = path.relative_to(dist_dir).as_posix()
+        variants = {
+            enc: path.with_name(path.name + suffix)
+            for enc, suffix in ENCODING_SUFFIXES.items()
+            if path.with_name(path.name + suffix).is_file()
+        }
+        manifest[rel] = StaticAsset(
+            path=path,
+            media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            etag=file_etag(path),
+            cache_control=IMMUTABLE_CACHE_CONTROL if HASHED_ASSET_PATTERN.match(rel) else REVALIDATE_CACHE_CONTROL,
+            variants=variants,
+        )
+    return manifest
+
+
+def asset_response(asset: StaticAsset, request_headers: Mapping[str, str]) -> Response:
+    # Accept-Encoding으로 압축본을 고르고, If-None-Match가 맞으면 304를 반환합니다.
+    encoding = negotiate_encoding(request_headers.get("accept-encoding"), asset.variants)
+    etag = variant_etag(asset.etag, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": asset.cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request_headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is None:
+        return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+
+    headers["Content-Encoding"] = encoding
+    return FileResponse(asset.variants[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1,153 @@
+import json
+from tempfile import SpooledTemporaryFile
+
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartException, MultiPartParser, parse_options_header
+
+# 업로드 요청 본문 크기 제한 ASGI 미들웨어입니다.
+# - Content-Length 헤더가 한도를 넘으면 본문을 읽기 전에 즉시 413 반환
+# - 헤더가 없거나(chunked) 거짓이어도, receive()를 감싸 실제 수신 바이트를 세다가
+#   한도를 넘는 순간 수신을 중단하고 413 반환
+# 따라서 한도를 넘는 본문은 메모리/임시파일로 끝까지 읽히지 않습니다.
+#
+# 대상 경로의 multipart 임시 파일 설정(메모리 보관 한도, 임시 폴더)도 이 미들웨어가 scope에 실어 전달합니다.
+# UploadRoute(라우트 클래스)가 그 설정으로 폼을 파싱하므로 Starlette/tempfile 전역 설정은 바꾸지 않습니다.
+SPOOL_SCOPE_KEY = "upload_spool"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def too_large_detail(max_bytes: int) -> str:
+    return f"Upload exceeds the maximum size of {max_bytes / (1024 * 1024):.1f} MB."
+
+
+class SpoolingMultiPartParser(MultiPartParser):
+    # 업로드 파일을 spool_max_size까지 메모리에 두고, 넘으면 spool_dir(없으면 시스템 임시 폴더) 파일로 내려씀
+    def __init__(self, *args, spool_max_size: int, spool_dir: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spool_max_size = spool_max_size
+        self.spool_dir = spool_dir
+
+    def on_headers_finished(self) -> None:
+        super().on_headers_finished()
+        upload = self._current_part.file
+        if upload is not None and self.spool_dir:
+            # 부모가 만든 spool은 아직 비어 있고 디스크 파일도 없으므로 폴더를 지정한 spool로 교체
+            spool = SpooledTemporaryFile(max_size=self.spool_max_size, dir=self.spool_dir)
+            upload.file = spool
+            self._files_to_close_on_error[-1] = spool
+
+
+class UploadRequest(Request):
+    async def _get_form(
+        self,
+        *,
+        max_files: int | float = 1000,
+        max_fields: int | float = 1000,
+        max_part_size: int = 1024 * 1024,
+    ) -> FormData:
+        spool = self.scope.get(SPOOL_SCOPE_KEY)
+        content_type, _ = parse_options_header(self.headers.get("Content-Type"))
+        if self._form is not None or spool is None or content_type != b"multipart/form-data":
+            return await super()._get_form(max_files=max_files, max_fields=max_fields, max_part_size=max_part_size)
+        parser = SpoolingMultiPartParser(
+            self.headers,
+            self.stream(),
+            max_files=max_files,
+            max_fields=max_fields,
+            max_part_size=max_part_size,
+            spool_max_size=spool["max_size"],
+            spool_dir=spool["dir"],
+        )
+        try:
+            self._form = await parser.parse()
+        except MultiPartException as exc:
+            raise HTTPException(status_code=400, detail=exc.message)
+        return self._form
+
+
+class UploadRoute(APIRoute):
+    # 폼 파싱에 UploadRequest를 사용하는 라우트 (미들웨어가 scope에 spool 설정을 넣은 요청만 영향)
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            return await handler(UploadRequest(request.scope, request.receive))
+
+        return route_handler
+
+
+class UploadLimitMiddleware:
+    def __init__(
+        self,
+        app,
+        max_bytes: int,
+        paths: tuple = ("/api/predict",),
+        spool_max_bytes: int = 1024 * 1024,
+        spool_dir: str | None = None,
+    ):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+        self.spool = {"max_size": spool_max_bytes, "dir": spool_dir or None}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not scope["path"].startswith(self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        scope = {**scope, SPOOL_SCOPE_KEY: self.spool}
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def counting_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # 한도 초과 후 앱이 만든 응답(파싱 오류 등)은 버리고 413으로 대체합니다.
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, counting_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+
+        if exceeded:
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": too_large_detail(self.max_bytes)}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,110 @@
+﻿"""
+Evaluate a saved model artifact on a labeled dataset.
+
+노트북(02/03)에서 수동으로 만들던 평가 테이블을 모델 아티팩트 + 데이터셋으로 재현합니다.
+- model_metrics_<name>.csv: accuracy/precision/recall/f1
+- feature_importance_<name>.csv: 모델 계수(선형) 또는 feature_importances_(트리)
+- permutation_importance.csv: 순열 중요도(기본 roc_auc, 20회 반복)
+- 순열 중요도는 피처/반복을 프로세스 풀에 나눠 계산하고, 전처리된 피처 행렬은 한 번만 만들어 메모리 맵으로 공유
+  (backend/src/evaluation.py). --seed가 같으면 --n-jobs와 무관하게 같은 결과
+
+Usage:
+python backend/scripts/evaluate_model.py
+python backend/scripts/evaluate_model.py --model models/logistic_v2.joblib --data data/history/2025.parquet --n-jobs -1
+python backend/scripts/evaluate_model.py --n-repeats 50 --seed 7 --scoring average_precision
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+
+from backend.src.config import FEATURE_COLS
+from backend.src.evaluation import (
+    RANDOM_STATE,
+    feature_importance,
+    model_metrics,
+    permutation_importance_parallel,
+)
+from backend.src.history import add_snapshot_history, uses_history
+from backend.src.preprocessing import load_table, preprocess_pipeline
+
+DATA_PATH = PROJECT_ROOT / "data/dummy/dummy_midterm_like_labeled.csv"
+MODEL_PATH = PROJECT_ROOT / "models/logistic_model.joblib"
+OUT_DIR = PROJECT_ROOT / "reports/tables"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--model", type=str, default=str(MODEL_PATH), help="평가할 모델 아티팩트(.joblib)")
+    p.add_argument("--data", type=str, default=str(DATA_PATH), help="평가 데이터 경로(.csv/.parquet/.arrow)")
+    p.add_argument("--out-dir", type=str, default=str(OUT_DIR), help="결과 테이블 저장 폴더")
+    p.add_argument("--name", type=str, default="logistic", help="지표/계수 테이블 파일명 접미사")
+    p.add_argument("--scoring", type=str, default="roc_auc", help="순열 중요도 점수(sklearn scorer 이름)")
+    p.add_argument("--n-repeats", type=int, default=20, help="피처별 순열 반복 횟수")
+    p.add_argument("--seed", type=int, default=RANDOM_STATE, help="순열 난수 시드")
+    p.add_argument("--n-jobs", type=int, default=-1, help="병렬 프로세스 수(-1: 전체 코어)")
+    return p.parse_args()
+
+
+def _resolve(raw: str) -> Path:
+    path = Path(raw)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def load_eval_matrix(data_path: Path, feature_cols: list) -> tuple:
+    # 원본 데이터 → 전처리 → (X: float64 ndarray, y: int ndarray)
+    df = load_table(data_path)
+    dfp = preprocess_pipeline(df, add_labels="at_risk" not in df.columns)
+    if "at_risk" not in dfp.columns:
+        raise ValueError("Missing target column 'at_risk' after preprocessing.")
+    if uses_history(feature_cols):
+        # 추이 피처로 학습한 모델: 학습과 같이 snapshot_at 기준 직전 시점 값을 조인
+        dfp = add_snapshot_history(dfp)
+    X = dfp.reindex(columns=feature_cols).to_numpy(dtype=np.float64)
+    y = dfp["at_risk"].astype(int).to_numpy()
+    return X, y
+
+
+def main():
+    args = _parse_args()
+    model_path = _resolve(args.model)
+    out_dir = _resolve(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    model = joblib.load(model_path, mmap_mode="r")
+    # 학습 시 피처 순서를 우선 사용(없으면 설정의 FEATURE_COLS)
+    feature_cols = list(getattr(model, "feature_names_in_", FEATURE_COLS))
+    X, y = load_eval_matrix(_resolve(args.data), feature_cols)
+    X_df = pd.DataFrame(X, columns=feature_cols)
+    print(f"Evaluating {model_path.name} on {len(y)} rows")
+
+    metrics = model_metrics(model, X_df, y)
+    metrics_path = out_dir / f"model_metrics_{args.name}.csv"
+    metrics.to_csv(metrics_path, index=False, encoding="utf-8-sig")
+    print("saved:", metrics_path, metrics.iloc[0].to_dict())
+
+    coef_path = out_dir / f"feature_importance_{args.name}.csv"
+    feature_importance(model, feature_cols).to_csv(coef_path, index=False, encoding="utf-8-sig")
+    print("saved:", coef_path)
+
+    start = time.perf_counter()
+    imp = permutation_importance_parallel(
+        model_path, X, y, feature_cols,
+        scoring=args.scoring, n_repeats=args.n_repeats, seed=args.seed, n_jobs=args.n_jobs,
+    )
+    perm_path = out_dir / "permutation_importance.csv"
+    imp.to_csv(perm_path, index=False, encoding="utf-8-sig")
+    print(f"saved: {perm_path} ({time.perf_counter() - start:.1f}s, n_jobs={effective_n_jobs(args.n_jobs)})")
+
+
+if __name__ == "__main__":
+    main()
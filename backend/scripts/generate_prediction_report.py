@@ -2,13 +2,14 @@
 Generate Risk Prediction Report (Refactored)
 
 - 공통 리포트 로직(backend/src/report_logic.py) 호출 기반
-- CSV → 전처리 → 모델 추론 → 리포트 컬럼 생성 → CSV 저장
+- CSV/Parquet/Arrow → 전처리 → 모델 추론 → 리포트 컬럼 생성(모델 계수 기반 위험 요인 포함) → CSV/Parquet/Arrow 저장
 
 실행 예시:
     python -m backend.scripts.generate_prediction_report
 
 정책 주입 예시:
     python -m backend.scripts.generate_prediction_report --data data/dummy/dummy_midterm_like_labeled.csv
+    python -m backend.scripts.generate_prediction_report --data students.parquet --format parquet
     python -m backend.scripts.generate_prediction_report --policy-json '{\"threshold\":0.4,\"midterm_max\":100,\"midterm_weight\":40,\"final_max\":100,\"final_weight\":40,\"performance_max\":100,\"performance_weight\":20,\"total_classes\":160}'
 """
 
@@ -26,14 +27,15 @@ import pandas as pd
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.src.config import FEATURE_COLS, EVALUATION_POLICY
-from backend.src.preprocessing import load_csv, preprocess_pipeline
-from backend.src.report_logic import (
-    parse_policy_json,
-    enrich_report,
-    assign_risk_level,
-    assign_action,
+from backend.src.config import EVALUATION_POLICY
+from backend.src.preprocessing import (
+    FORMAT_EXTENSIONS,
+    TABLE_FORMATS,
+    load_table,
+    save_table,
 )
+from backend.src.report_logic import add_guidance_text, parse_policy_json
+from backend.src.scoring import score_report
 
 
 DEFAULT_DATA_PATH = PROJECT_ROOT / "data/dummy/dummy_midterm_like_labeled.csv"
@@ -43,9 +45,10 @@ DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "reports/tables"
 
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
-    p.add_argument("--data", type=str, default=str(DEFAULT_DATA_PATH), help="입력 CSV 경로")
+    p.add_argument("--data", type=str, default=str(DEFAULT_DATA_PATH), help="입력 파일 경로(.csv/.parquet/.arrow)")
     p.add_argument("--model", type=str, default=str(DEFAULT_MODEL_PATH), help="joblib 모델 경로")
     p.add_argument("--outdir", type=str, default=str(DEFAULT_OUTPUT_DIR), help="출력 폴더")
+    p.add_argument("--format", type=str, default="csv", choices=TABLE_FORMATS, help="리포트 저장 형식")
     p.add_argument(
         "--policy-json",
         type=str,
@@ -64,28 +67,15 @@ def main() -> pd.DataFrame:
     outdir.mkdir(parents=True, exist_ok=True)
 
     # 1) Load raw
-    df_raw = load_csv(str(data_path))
+    df_raw = load_table(data_path)
 
-    # 2) Preprocess (결측 플래그 포함)
-    df_processed = preprocess_pipeline(df_raw)
-    df_result = df_processed.copy()
-
-    # 3) Model predict
+    # 2) Model load
     if not model_path.exists():
         raise FileNotFoundError(f"모델 파일이 없습니다: {model_path}")
 
     model = joblib.load(model_path)
 
-    # 모델이 학습 당시 feature_names_in_이 있으면 그것을 우선 사용(정렬/누락 방어)
-    feature_cols = list(getattr(model, "feature_names_in_", FEATURE_COLS))
-    X = df_result.reindex(columns=feature_cols)
-
-    risk_proba = model.predict_proba(X)[:, 1]
-    df_result["risk_proba"] = risk_proba
-    df_result["risk_level"] = df_result["risk_proba"].apply(assign_risk_level)
-    df_result["action"] = df_result["risk_level"].apply(assign_action)
-
-    # 4) Policy 적용(우선순위: --policy-json > backend.src.config.EVALUATION_POLICY)
+    # 3) Policy 적용(우선순위: --policy-json > backend.src.config.EVALUATION_POLICY)
     if args.policy_json.strip():
         policy_json = args.policy_json
     else:
@@ -93,16 +83,23 @@ def main() -> pd.DataFrame:
 
     policy_obj = parse_policy_json(policy_json)
 
-    # 5) Report enrichment (participation / reasons / guidance / absence ...)
-    df_result = enrich_report(df_result, policy_obj)
+    # 4) Preprocess → model predict → report enrichment
+    #    (결측 플래그 / risk_proba·risk_level·action / participation·reasons·guidance·absence ...)
+    df_result = score_report(df_raw, model, policy_obj)
+    # 점수 안내 문구는 구조화 컬럼(guidance_code, required_*)에서 저장 직전에 생성
+    df_result = add_guidance_text(df_result, policy_obj)
 
-    # 6) Column order
+    # 5) Column order
     preferred_cols = [
         "student_id",
         "risk_proba",
         "risk_level",
         "top_reasons",
+        "model_reasons",
         "score_guidance",
+        "guidance_code",
+        "required_final_score",
+        "required_performance_score",
         "action",
         "absence_limit",
         "remaining_absence_allowance",
@@ -115,10 +112,10 @@ def main() -> pd.DataFrame:
     )
     df_result = df_result[save_cols]
 
-    # 7) Save
+    # 6) Save
     today = datetime.now().strftime("%Y%m%d")
-    output_path = outdir / f"prediction_report_{today}.csv"
-    df_result.to_csv(output_path, index=False, encoding="utf-8-sig")
+    output_path = outdir / f"prediction_report_{today}{FORMAT_EXTENSIONS[args.format]}"
+    save_table(df_result, output_path, args.format)
 
     print(f"Saved: {output_path}")
     return df_result
@@ -0,0 +1,217 @@
+﻿"""
+HTTP Load Test — API capacity check
+
+- 로컬(또는 지정한) 서버에 동시 요청을 보내 처리량/지연/오류율을 JSON으로 출력
+- 대상: POST /api/predict, GET /api/download/{filename}, 정적 경로(/ 등)
+- 업로드 데이터: 더미 CSV(data/dummy)를 행 단위로 복제해 원하는 크기(--rows)로 생성
+- 표준 라이브러리(urllib)만 사용하므로 서버 외 추가 설치가 필요 없음
+
+실행 예시 (서버를 먼저 띄운 뒤):
+python backend/scripts/load_test.py
+python backend/scripts/load_test.py --concurrency 16 --requests 200 --rows 300 3000
+python backend/scripts/load_test.py --targets predict --rows 10000 --out reports/tables/load_test.json
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import io
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.src.config import EVALUATION_POLICY
+
+TARGETS = ("predict", "download", "static")
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--base-url", type=str, default="http://127.0.0.1:8000", help="대상 서버 주소")
+    p.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS), help="부하를 줄 대상")
+    p.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    p.add_argument("--requests", type=int, default=100, help="대상(및 업로드 크기)별 요청 수")
+    p.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 요청 수")
+    p.add_argument(
+        "--data",
+        type=str,
+        default="data/dummy/dummy_midterm_like_labeled.csv",
+        help="업로드 원본 더미 CSV",
+    )
+    p.add_argument("--rows", type=int, nargs="+", default=[300], help="업로드 CSV 행 수(여러 개 지정 시 크기별 측정)")
+    p.add_argument("--static-paths", nargs="+", default=["/"], help="정적 대상 경로")
+    p.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    p.add_argument("--seed", type=int, default=42, help="업로드 데이터 복제 시드")
+    p.add_argument("--out", type=str, default="", help="결과 JSON 저장 경로(미지정 시 stdout만)")
+    return p.parse_args()
+
+
+def _resolve(path: str) -> Path:
+    p = Path(path)
+    return p if p.is_absolute() else PROJECT_ROOT / p
+
+
+# ----------------------------
+# Payload
+# ----------------------------
+def build_csv_payload(df_base: pd.DataFrame, rows: int, seed: int = 42) -> bytes:
+    # 더미 행을 복원 추출해 rows 행으로 만들고, student_id는 겹치지 않게 다시 매깁니다.
+    rng = np.random.default_rng(seed)
+    df = df_base.iloc[rng.integers(0, len(df_base), size=rows)].reset_index(drop=True)
+    if "student_id" in df.columns:
+        df["student_id"] = [f"S{i:06d}" for i in range(1, rows + 1)]
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def encode_multipart(fields: dict, files: dict) -> tuple[bytes, str]:
+    # files: name -> (filename, content_type, bytes)
+    boundary = uuid.uuid4().hex
+    buf = io.BytesIO()
+    for name, value in fields.items():
+        buf.write(f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n".encode())
+        buf.write(str(value).encode("utf-8") + b"\r\n")
+    for name, (filename, content_type, data) in files.items():
+        buf.write(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n".encode()
+        )
+        buf.write(data + b"\r\n")
+    buf.write(f"--{boundary}--\r\n".encode())
+    return buf.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+def send(request: urllib.request.Request, timeout: float) -> tuple[int, float, bytes]:
+    # (HTTP 상태, 지연(초), 본문). 연결 실패는 상태 0으로 기록합니다.
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            body = resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as exc:
+        body = exc.read()
+        status = exc.code
+    except (urllib.error.URLError, OSError):
+        body = b""
+        status = 0
+    return status, time.perf_counter() - start, body
+
+
+def run_load(make_request, total: int, concurrency: int, timeout: float) -> dict:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(lambda _: send(make_request(), timeout), range(total)))
+        elapsed = time.perf_counter() - start
+
+    statuses = [status for status, _, _ in results]
+    latencies_ms = np.array([latency for _, latency, _ in results]) * 1000
+    errors = sum(1 for s in statuses if not 200 <= s < 400)
+    status_counts = {str(s): statuses.count(s) for s in sorted(set(statuses))}
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "elapsed_sec": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "mean": round(float(latencies_ms.mean()), 2),
+            "p50": round(float(np.percentile(latencies_ms, 50)), 2),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 2),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 2),
+            "max": round(float(latencies_ms.max()), 2),
+        },
+        "status_counts": status_counts,
+    }
+
+
+def main():
+    args = _parse_args()
+    base_url = args.base_url.rstrip("/")
+    df_base = pd.read_csv(_resolve(args.data), encoding="utf-8-sig")
+    policy_json = json.dumps(EVALUATION_POLICY, ensure_ascii=False)
+
+    def predict_request(payload: bytes):
+        body, content_type = encode_multipart(
+            {"policy": policy_json},
+            {"file": ("load_test.csv", "text/csv", payload)},
+        )
+        return lambda: urllib.request.Request(
+            f"{base_url}/api/predict?mode=compact",
+            data=body,
+            headers={"Content-Type": content_type},
+            method="POST",
+        )
+
+    def get_request(path: str, headers: dict | None = None):
+        return lambda: urllib.request.Request(f"{base_url}{path}", headers=headers or {})
+
+    def measure(target: str, make_request, **meta) -> dict:
+        for _ in range(args.warmup):
+            send(make_request(), args.timeout)
+        result = {"target": target, **meta}
+        result.update(run_load(make_request, args.requests, args.concurrency, args.timeout))
+        print(
+            f"[{target}] {meta} rps={result['throughput_rps']} "
+            f"p95={result['latency_ms']['p95']}ms errors={result['errors']}",
+            file=sys.stderr,
+        )
+        return result
+
+    results = []
+    if "predict" in args.targets:
+        for rows in args.rows:
+            payload = build_csv_payload(df_base, rows, args.seed)
+            results.append(measure("predict", predict_request(payload), rows=rows, payload_bytes=len(payload)))
+
+    if "download" in args.targets:
+        # 다운로드 대상 리포트는 predict 한 번으로 만듭니다.
+        payload = build_csv_payload(df_base, args.rows[0], args.seed)
+        status, _, body = send(predict_request(payload)(), args.timeout)
+        if status != 200:
+            print(f"[download] skipped: report creation failed (HTTP {status})", file=sys.stderr)
+        else:
+            filename = json.loads(body)["report_filename"]
+            path = f"/api/download/{filename}"
+            for accept_encoding in ("identity", "gzip"):
+                results.append(
+                    measure(
+                        "download",
+                        get_request(path, {"Accept-Encoding": accept_encoding}),
+                        path=path,
+                        accept_encoding=accept_encoding,
+                    )
+                )
+
+    if "static" in args.targets:
+        for path in args.static_paths:
+            results.append(measure("static", get_request(path, {"Accept-Encoding": "gzip, br"}), path=path))
+
+    report = {
+        "base_url": base_url,
+        "concurrency": args.concurrency,
+        "requests_per_target": args.requests,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        out = _resolve(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+﻿"""
+Precompress frontend build (client/dist) for static serving.
+
+- 텍스트 계열 정적 파일마다 gzip(.gz) / brotli(.br) 압축본을 옆에 생성
+- FastAPI(backend/api/static_assets.py)가 Accept-Encoding에 맞춰 압축본을 그대로 전송
+- brotli 모듈이 없으면 gzip만 생성
+
+Usage:
+python backend/scripts/precompress_frontend.py
+python backend/scripts/precompress_frontend.py --dist client/dist --min-size 512
+"""
+
+from pathlib import Path
+import argparse
+import gzip
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+COMPRESSIBLE_SUFFIXES = {
+    ".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".ico", ".webmanifest",
+}
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--dist", type=str, default="client/dist", help="프론트 빌드 폴더")
+    p.add_argument("--min-size", type=int, default=1024, help="이 크기(byte) 미만 파일은 압축하지 않음")
+    return p.parse_args()
+
+
+def _write_if_smaller(path: Path, data: bytes, original_size: int) -> bool:
+    # 압축 효과가 없으면 압축본을 만들지 않습니다(서버는 원본을 전송).
+    if len(data) >= original_size:
+        path.unlink(missing_ok=True)
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def main():
+    args = _parse_args()
+    dist = Path(args.dist)
+    if not dist.is_absolute():
+        dist = PROJECT_ROOT / dist
+    if not dist.is_dir():
+        print(f"Frontend build not found: {dist}")
+        sys.exit(1)
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("brotli not installed: generating gzip only")
+
+    count = 0
+    for path in sorted(dist.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+            continue
+        raw = path.read_bytes()
+        if len(raw) < args.min_size:
+            continue
+
+        # mtime=0: 같은 입력이면 같은 .gz 바이트(재현 가능한 빌드)
+        _write_if_smaller(path.with_name(path.name + ".gz"), gzip.compress(raw, compresslevel=9, mtime=0), len(raw))
+        if brotli is not None:
+            _write_if_smaller(path.with_name(path.name + ".br"), brotli.compress(raw, quality=11), len(raw))
+        count += 1
+
+    print(f"Precompressed {count} files in {dist}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,373 @@
 ﻿"""
 Train and save risk prediction model.
 
+- 설정된 후보 모델/하이퍼파라미터(MODEL_SEARCH_SPACE)를 교차검증으로 탐색
+- 교차검증은 n_jobs로 CPU 코어에 병렬 분산
+- 전처리된 피처 행렬은 joblib.Memory로 디스크 캐시(원본 데이터 해시 + 전처리 코드 해시 기준)
+- 후보별 CV 지표 테이블과 최고 성능 모델 아티팩트를 저장
+- 스케일러 없는 선형 모델은 model_reasons 기준점(학습 피처 평균)을 모델 객체에 함께 저장
+- 드리프트 모니터링 기준 분포(학습 피처 + risk_proba 히스토그램)를 모델 옆 <모델명>.drift.json에 저장
+- --stream: 샤드(CSV/Parquet/Arrow)를 청크 단위로 읽어 SGDClassifier(log loss)를 partial_fit으로 학습
+  (메모리보다 큰 데이터용. 결측 채움 값은 표본으로 미리 계산해 모든 청크에 고정 적용)
+- --history: 학생별 여러 시점(snapshot_at 컬럼)이 있는 데이터에서 직전 시점 대비 추이 피처(HISTORY_FEATURE_COLS)를
+  as-of 조인으로 만들어 FEATURE_COLS 뒤에 추가 (API는 리포트 저장소의 이전 채점 스냅샷으로 같은 피처를 계산)
+
 Usage:
 python backend/scripts/train_model.py
+python backend/scripts/train_model.py --models logistic random_forest --cv 5 --n-jobs -1
+python backend/scripts/train_model.py --data data/history/snapshots.parquet --history
+python backend/scripts/train_model.py --stream --shards "data/history/*.parquet" --chunksize 50000 --epochs 5
 """
 
 from pathlib import Path
+import argparse
+import glob
+import hashlib
+import os
 import sys
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 
-from backend.src.config import FEATURE_COLS
-from backend.src.preprocessing import load_csv, preprocess_pipeline
+from backend.src.config import DEFAULT_SEARCH_MODELS, FEATURE_COLS, HISTORY_FEATURE_COLS, MODEL_SEARCH_SPACE
+from backend.src.drift import build_reference, reference_path, save_reference
+from backend.src.history import add_snapshot_history, uses_history
+from backend.src.report_logic import fit_explanation_baseline
+from backend.src.preprocessing import (
+    fit_preprocess_stats,
+    iter_table_chunks,
+    load_table,
+    preprocess_pipeline,
+)
 
 DATA_PATH = PROJECT_ROOT / "data/dummy/dummy_midterm_like_labeled.csv"
 MODEL_DIR = PROJECT_ROOT / "models"
-MODEL_DIR.mkdir(parents=True, exist_ok=True)
 MODEL_PATH = MODEL_DIR / "logistic_model.joblib"
+METRICS_DIR = PROJECT_ROOT / "reports/tables"
+CACHE_DIR = PROJECT_ROOT / ".cache/train_features"
+# 피처 행렬 생성에 관여하는 소스: 내용이 바뀌면 캐시 키가 달라져 다시 전처리합니다.
+PREPROCESS_SOURCES = [
+    PROJECT_ROOT / "backend/src/preprocessing.py",
+    PROJECT_ROOT / "backend/src/batch_stats.py",
+    PROJECT_ROOT / "backend/src/data_quality.py",
+    PROJECT_ROOT / "backend/src/history.py",
+    PROJECT_ROOT / "backend/src/config.py",
+]
 
-def main():
-    df = load_csv(DATA_PATH)
+SCORING = ["accuracy", "precision", "recall", "f1"]
+RANDOM_STATE = 42
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--data", type=str, default=str(DATA_PATH), help="학습 데이터 경로(.csv/.parquet/.arrow)")
+    p.add_argument("--model-out", type=str, default=str(MODEL_PATH), help="최고 성능 모델 저장 경로")
+    p.add_argument("--metrics-dir", type=str, default=str(METRICS_DIR), help="지표 테이블 저장 폴더")
+    p.add_argument("--cache-dir", type=str, default=str(CACHE_DIR), help="전처리 피처 캐시 폴더")
+    p.add_argument(
+        "--models",
+        nargs="+",
+        default=DEFAULT_SEARCH_MODELS,
+        choices=sorted(MODEL_SEARCH_SPACE),
+        help="탐색할 후보 모델",
+    )
+    p.add_argument("--cv", type=int, default=5, help="교차검증 fold 수")
+    p.add_argument("--n-jobs", type=int, default=-1, help="병렬 작업 수(-1: 전체 코어)")
+    p.add_argument("--refit", type=str, default="f1", choices=SCORING, help="최고 모델 선택 기준 지표")
+    p.add_argument("--history", action="store_true", help="snapshot_at 기준 직전 시점 대비 추이 피처 추가")
+
+    stream = p.add_argument_group("streaming (out-of-core)")
+    stream.add_argument("--stream", action="store_true", help="샤드를 청크 단위로 읽어 증분 학습(SGDClassifier)")
+    stream.add_argument("--shards", nargs="+", default=None, help="샤드 경로/glob 패턴(기본: --data)")
+    stream.add_argument("--chunksize", type=int, default=50_000, help="청크 행 수")
+    stream.add_argument("--epochs", type=int, default=5, help="전체 샤드 반복 횟수")
+    stream.add_argument("--alpha", type=float, default=1e-4, help="SGDClassifier 정규화 강도")
+    stream.add_argument("--stats-sample-rows", type=int, default=100_000, help="결측 채움 통계용 균등 표본 행 수")
+    stream.add_argument("--holdout", type=float, default=0.2, help="평가용 홀드아웃 비율")
+    return p.parse_args()
+
+
+def _resolve(raw: str) -> Path:
+    path = Path(raw)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def preprocess_code_hash(paths: list = PREPROCESS_SOURCES) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(Path(path).name.encode("utf-8"))
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def build_feature_matrix(data_hash: str, data_path: str, feature_cols: tuple, preprocess_version: str) -> tuple:
+    """
+    원본 데이터(CSV/Parquet/Arrow) → 전처리 → (X, y).
+    joblib.Memory 캐시 키는 data_hash/feature_cols/preprocess_version(전처리 코드 해시)이며,
+    data_path는 키에서 제외합니다.
+    """
+    df = load_table(data_path)
     dfp = preprocess_pipeline(df)
     if "at_risk" not in dfp.columns:
         dfp = preprocess_pipeline(df, add_labels=True)
     if "at_risk" not in dfp.columns:
         raise ValueError("Missing target column 'at_risk' after preprocessing.")
+    if uses_history(feature_cols):
+        dfp = add_snapshot_history(dfp)
+
+    X = dfp.reindex(columns=list(feature_cols))
+    y = dfp["at_risk"].astype(int)
+    return X, y
+
+
+def build_estimator(name: str) -> Pipeline:
+    if name == "logistic":
+        clf = LogisticRegression(max_iter=1000, class_weight="balanced", random_state=RANDOM_STATE)
+        return Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="constant", fill_value=0)),
+            ("scaler", StandardScaler()),
+            ("clf", clf),
+        ])
+    if name == "random_forest":
+        clf = RandomForestClassifier(class_weight="balanced", random_state=RANDOM_STATE)
+        return Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="constant", fill_value=0)),
+            ("clf", clf),
+        ])
+    raise ValueError(f"Unknown model: {name}")
+
+
+# ----------------------------
+# Streaming (out-of-core)
+# ----------------------------
+def resolve_shards(patterns: list) -> list:
+    paths = []
+    for pattern in patterns:
+        pattern = str(_resolve(pattern))
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(Path(m) for m in matches)
+    if not paths:
+        raise FileNotFoundError(f"No shards matched: {patterns}")
+    return paths
+
+
+def iter_shard_chunks(paths: list, chunksize: int):
+    # (샤드 번호, 청크 번호, DataFrame)
+    for shard_i, path in enumerate(paths):
+        for chunk_i, chunk in enumerate(iter_table_chunks(path, chunksize=chunksize)):
+            yield shard_i, chunk_i, chunk
+
+
+def sample_rows(paths: list, chunksize: int, n: int) -> pd.DataFrame:
+    """
+    전체 샤드에서 n행 균등 표본(bottom-k: 행마다 난수 키를 주고 가장 작은 n개 유지).
+    표본 크기만큼만 메모리에 유지합니다.
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    sample = None
+    for _, _, chunk in iter_shard_chunks(paths, chunksize):
+        chunk = chunk.assign(_key=rng.random(len(chunk)))
+        sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+        if len(sample) > n:
+            sample = sample.nsmallest(n, "_key")
+    return sample.drop(columns="_key").reset_index(drop=True)
+
+
+def preprocess_chunk(chunk: pd.DataFrame, fill_values: dict, feature_cols: list) -> tuple:
+    dfp = preprocess_pipeline(chunk, fill_values=fill_values, add_labels="at_risk" not in chunk.columns)
+    return dfp.reindex(columns=feature_cols), dfp["at_risk"].astype(int).to_numpy()
+
 
-    X = dfp.reindex(columns=FEATURE_COLS)
-    y = dfp["at_risk"]
+def _holdout_mask(n: int, holdout: float, shard_i: int, chunk_i: int) -> np.ndarray:
+    # 청크 위치로 시드를 고정해 모든 pass에서 같은 행이 홀드아웃이 되도록 함
+    return np.random.default_rng([RANDOM_STATE, shard_i, chunk_i]).random(n) < holdout
 
-    model = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="constant", fill_value=0)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
 
-    model.fit(X, y)
+def train_streaming(args: argparse.Namespace, metrics_dir: Path) -> tuple:
+    """
+    1) 균등 표본으로 결측 채움 값 계산 (preprocess_pipeline 고정 통계)
+    2) pass 1: StandardScaler.partial_fit + 클래스 빈도(→ class_weight)
+    3) pass 2..: SGDClassifier(log_loss).partial_fit을 epochs만큼 반복(청크 내 셔플)
+    4) 홀드아웃 혼동행렬을 청크 단위로 누적해 지표 계산
+    결과는 일반 학습과 같은 Pipeline(imputer → scaler → clf) 형식이며,
+    (모델, 표본 피처 행렬)을 반환합니다. (표본은 드리프트 기준 분포에 사용)
+    """
+    paths = resolve_shards(args.shards or [args.data])
+    feature_cols = list(FEATURE_COLS)
+    print(f"[stream] {len(paths)} shard(s), chunksize={args.chunksize}")
+
+    sample = sample_rows(paths, args.chunksize, args.stats_sample_rows)
+    fill_values = fit_preprocess_stats(sample)
+
+    imputer = SimpleImputer(strategy="constant", fill_value=0)
+    scaler = StandardScaler()
+    class_counts = np.zeros(2, dtype=np.int64)
+    for shard_i, chunk_i, chunk in iter_shard_chunks(paths, args.chunksize):
+        X, y = preprocess_chunk(chunk, fill_values, feature_cols)
+        train = ~_holdout_mask(len(X), args.holdout, shard_i, chunk_i)
+        if not hasattr(imputer, "statistics_"):
+            imputer.fit(X)
+        if train.any():
+            scaler.partial_fit(imputer.transform(X[train]))
+            class_counts += np.bincount(y[train], minlength=2)[:2]
+
+    if (class_counts == 0).any():
+        raise ValueError(f"Training data must contain both classes (counts={class_counts.tolist()}).")
+    # class_weight="balanced"와 같은 가중치(partial_fit은 "balanced" 미지원)
+    class_weight = {c: class_counts.sum() / (2 * class_counts[c]) for c in (0, 1)}
+    clf = SGDClassifier(loss="log_loss", alpha=args.alpha, class_weight=class_weight, random_state=RANDOM_STATE)
+
+    for epoch in range(args.epochs):
+        for shard_i, chunk_i, chunk in iter_shard_chunks(paths, args.chunksize):
+            X, y = preprocess_chunk(chunk, fill_values, feature_cols)
+            train = ~_holdout_mask(len(X), args.holdout, shard_i, chunk_i)
+            if not train.any():
+                continue
+            order = np.random.default_rng([RANDOM_STATE, epoch, shard_i, chunk_i]).permutation(int(train.sum()))
+            Xt = scaler.transform(imputer.transform(X[train]))[order]
+            clf.partial_fit(Xt, y[train][order], classes=np.array([0, 1]))
+        print(f"[stream] epoch {epoch + 1}/{args.epochs} done")
+
+    model = Pipeline(steps=[("imputer", imputer), ("scaler", scaler), ("clf", clf)])
+
+    tp = fp = fn = tn = 0
+    for shard_i, chunk_i, chunk in iter_shard_chunks(paths, args.chunksize):
+        X, y = preprocess_chunk(chunk, fill_values, feature_cols)
+        hold = _holdout_mask(len(X), args.holdout, shard_i, chunk_i)
+        if not hold.any():
+            continue
+        pred = model.predict(X[hold])
+        tp += int(((pred == 1) & (y[hold] == 1)).sum())
+        fp += int(((pred == 1) & (y[hold] == 0)).sum())
+        fn += int(((pred == 0) & (y[hold] == 1)).sum())
+        tn += int(((pred == 0) & (y[hold] == 0)).sum())
+
+    n_hold = tp + fp + fn + tn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    metrics = pd.DataFrame([{
+        "accuracy": (tp + tn) / n_hold if n_hold else float("nan"),
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "train_rows": int(class_counts.sum()),
+        "holdout_rows": n_hold,
+        "epochs": args.epochs,
+    }])
+    metrics.to_csv(metrics_dir / "stream_metrics_sgd.csv", index=False, encoding="utf-8-sig")
+    print("[stream] holdout metrics:", metrics.iloc[0].round(4).to_dict())
+    return model, preprocess_chunk(sample, fill_values, feature_cols)[0]
+
+
+def _save_model(model: Pipeline, model_out: Path) -> None:
+    # 압축 없이 저장해야 API가 mmap_mode로 읽을 수 있습니다.
+    # 임시 파일에 쓴 뒤 교체하므로 실행 중인 워커가 쓰는 중인 파일을 읽지 않습니다.
+    tmp_out = model_out.with_name(f".{model_out.name}.{os.getpid()}.tmp")
+    joblib.dump(model, tmp_out)
+    os.replace(tmp_out, model_out)
+
+
+def _save_drift_reference(model: Pipeline, X: pd.DataFrame, model_out: Path) -> None:
+    # 학습 피처 + 예측 확률의 분위수 구간 히스토그램 (API /api/drift 비교 기준)
+    reference = build_reference(X.assign(risk_proba=model.predict_proba(X)[:, 1]))
+    path = reference_path(model_out)
+    save_reference(reference, path)
+    print("Saved drift reference:", path)
+
+
+def _fold_metrics(search: GridSearchCV, n_splits: int) -> pd.DataFrame:
+    # best_index_ 후보의 fold별 점수 → 기존 cv_metrics_*.csv 형식(accuracy,precision,recall,f1)
+    res = search.cv_results_
+    i = search.best_index_
+    return pd.DataFrame({
+        m: [res[f"split{k}_test_{m}"][i] for k in range(n_splits)]
+        for m in SCORING
+    })
+
+
+def main():
+    args = _parse_args()
+    data_path = _resolve(args.data)
+    model_out = _resolve(args.model_out)
+    metrics_dir = _resolve(args.metrics_dir)
+    model_out.parent.mkdir(parents=True, exist_ok=True)
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.stream:
+        if args.history:
+            raise SystemExit("--history is not supported with --stream (as-of join needs all snapshots).")
+        model, X_sample = train_streaming(args, metrics_dir)
+        fit_explanation_baseline(model, X_sample)
+        _save_model(model, model_out)
+        print("Saved model:", model_out)
+        _save_drift_reference(model, X_sample, model_out)
+        return
+
+    memory = joblib.Memory(location=str(_resolve(args.cache_dir)), verbose=0)
+    cached_build = memory.cache(build_feature_matrix, ignore=["data_path"])
+    feature_cols = [*FEATURE_COLS, *HISTORY_FEATURE_COLS] if args.history else list(FEATURE_COLS)
+    X, y = cached_build(file_sha256(data_path), str(data_path), tuple(feature_cols), preprocess_code_hash())
+
+    cv = StratifiedKFold(n_splits=args.cv, shuffle=True, random_state=RANDOM_STATE)
+
+    summary_rows = []
+    best = None  # (score, name, estimator)
+    for name in args.models:
+        search = GridSearchCV(
+            build_estimator(name),
+            param_grid=MODEL_SEARCH_SPACE[name],
+            scoring=SCORING,
+            refit=args.refit,
+            cv=cv,
+            n_jobs=args.n_jobs,
+        )
+        search.fit(X, y)
+
+        _fold_metrics(search, args.cv).to_csv(
+            metrics_dir / f"cv_metrics_{name}.csv", index=False, encoding="utf-8-sig"
+        )
+
+        res = search.cv_results_
+        for i, params in enumerate(res["params"]):
+            row = {"model": name, "params": repr(params), "rank": int(res[f"rank_test_{args.refit}"][i])}
+            for m in SCORING:
+                row[f"mean_{m}"] = res[f"mean_test_{m}"][i]
+                row[f"std_{m}"] = res[f"std_test_{m}"][i]
+            summary_rows.append(row)
+
+        print(f"[{name}] best {args.refit}={search.best_score_:.4f} params={search.best_params_}")
+        if best is None or search.best_score_ > best[0]:
+            best = (search.best_score_, name, search.best_estimator_)
+
+    summary = pd.DataFrame(summary_rows).sort_values(["model", "rank"])
+    summary.to_csv(metrics_dir / "model_search_results.csv", index=False, encoding="utf-8-sig")
+
+    _, best_name, best_model = best
+    # 스케일러 없는 선형 모델이면 model_reasons 기준점(학습 평균)을 모델에 함께 저장
+    fit_explanation_baseline(best_model, X)
+    _save_model(best_model, model_out)
+    print(f"Best model: {best_name}")
+    print("Saved model:", model_out)
+    _save_drift_reference(best_model, X, model_out)
 
-    joblib.dump(model, MODEL_PATH)
-    print("Saved model:", MODEL_PATH)
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Batch statistics (one pass)
+# ----------------------------
+# 전처리/리포트 단계가 각자 컬럼별 median/quantile을 다시 계산하지 않도록,
+# 필요한 통계를 수치 컬럼 전체에 대해 한 번에(벡터화) 계산해 df.attrs에 캐시합니다.
+# - 전역 통계: median + STAT_QUANTILES
+# - cohort_col(반/학년 등)을 주면 groupby 한 번으로 코호트별 분위수도 계산
+# 전처리에서는 결측 채움 이후 값으로 계산합니다(참여도 분위수/IQR 기준이 채운 값 포함).
+# attrs는 copy/fillna 등에도 그대로 전파되므로, 컬럼별 값 지문(fingerprint)을 함께 저장해
+# 값이 바뀐 프레임에서는 캐시를 쓰지 않고 다시 계산합니다.
+# attrs 값은 JSON 직렬화 가능한 dict로 유지합니다.
+STATS_ATTR = "batch_stats"
+
+# 참여도 플래그(하위 15%), IQR 이상치 클리핑(25/75%)
+STAT_QUANTILES = (0.15, 0.25, 0.75)
+
+
+def _q_key(q: float) -> str:
+    return f"{q:g}"
+
+
+def _numeric_cols(df: pd.DataFrame, cols: Optional[Iterable[str]]) -> List[str]:
+    if cols is None:
+        return df.select_dtypes(include=[np.number]).columns.tolist()
+    return [c for c in cols if c in df.columns]
+
+
+def _fingerprint(s: pd.Series) -> int:
+    # 컬럼 값 지문: 행 해시의 합(행 순서와 무관, 통계도 순서와 무관)
+    return int(pd.util.hash_pandas_object(s, index=False).sum())
+
+
+def compute_batch_stats(
+    df: pd.DataFrame,
+    cols: Optional[Iterable[str]] = None,
+    quantiles: Iterable[float] = STAT_QUANTILES,
+    cohort_col: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    cols(기본: 수치 컬럼 전체)의 median/분위수를 한 번에 계산.
+    cohort_col이 있으면 코호트별 분위수를 함께 계산(코호트 값이 NaN인 행은 제외).
+    """
+    cols = _numeric_cols(df, cols)
+    qs = sorted(set(float(q) for q in quantiles))
+    if cohort_col is not None and cohort_col not in df.columns:
+        raise ValueError(f"코호트 컬럼이 없습니다: {cohort_col}")
+
+    num = df[cols]
+    table = num.quantile(qs) if cols else pd.DataFrame(index=qs)
+    stats: Dict[str, Any] = {
+        "n_rows": int(len(df)),
+        "columns": cols,
+        "median": {c: float(v) for c, v in num.median().items()},
+        "quantiles": {
+            _q_key(q): {c: float(v) for c, v in table.loc[q].items()} for q in qs
+        },
+        "cohort_col": cohort_col,
+        "cohort_quantiles": None,
+        "fingerprint": {c: _fingerprint(df[c]) for c in dict.fromkeys([*cols, *([cohort_col] if cohort_col else [])])},
+    }
+
+    # 코호트 키 컬럼 자체는 코호트별 통계 대상에서 제외
+    group_cols = [c for c in cols if c != cohort_col]
+    if cohort_col is not None and group_cols:
+        grouped = num[group_cols].groupby(df[cohort_col]).quantile(qs)  # index: (cohort, q)
+        stats["cohort_quantiles"] = {
+            _q_key(q): {
+                c: {str(k): float(v) for k, v in grouped[c].xs(q, level=-1).items()}
+                for c in group_cols
+            }
+            for q in qs
+        }
+    return stats
+
+
+def _covers(
+    stats: Any,
+    df: pd.DataFrame,
+    cols: List[str],
+    qs: Iterable[float],
+    cohort_col: Optional[str],
+) -> bool:
+    if not isinstance(stats, dict):
+        return False
+    if not set(cols) <= set(stats["columns"]):
+        return False
+    if not all(_q_key(q) in stats["quantiles"] for q in qs):
+        return False
+    if cohort_col is not None and stats["cohort_col"] != cohort_col:
+        return False
+    # 공유 통계(share_batch_stats)는 전체 배치 기준이므로 행 일부(청크/파티션)에서도 그대로 사용
+    if stats.get("shared"):
+        return True
+    if stats.get("n_rows") != len(df):
+        return False
+    # 같은 프레임(값)인지: 요청 컬럼(+ 코호트 컬럼)의 지문 비교
+    fingerprint = stats.get("fingerprint") or {}
+    keys = [*cols, *([stats["cohort_col"]] if stats["cohort_col"] else [])]
+    return all(c in fingerprint and c in df.columns and fingerprint[c] == _fingerprint(df[c]) for c in keys)
+
+
+def attach_batch_stats(
+    df: pd.DataFrame,
+    cols: Optional[Iterable[str]] = None,
+    quantiles: Iterable[float] = STAT_QUANTILES,
+    cohort_col: Optional[str] = None,
+) -> pd.DataFrame:
+    # 통계 단계: 계산 결과를 df.attrs에 저장해 반환(이후 copy/컬럼 추가에도 전파됨)
+    df.attrs[STATS_ATTR] = compute_batch_stats(df, cols, quantiles, cohort_col)
+    return df
+
+
+def share_batch_stats(df: pd.DataFrame, stats: Dict[str, Any]) -> pd.DataFrame:
+    # 전체 배치에서 계산한 통계를 행 일부(청크)에 붙임: 청크별로 다시 계산하지 않고 배치 기준을 유지
+    df.attrs[STATS_ATTR] = {**stats, "shared": True}
+    return df
+
+
+def get_batch_stats(
+    df: pd.DataFrame,
+    cols: Iterable[str],
+    quantiles: Iterable[float] = STAT_QUANTILES,
+    cohort_col: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    캐시된 통계가 요청(컬럼/분위수/코호트)을 포함하고 같은 값(행 수 + 컬럼 지문)에서 계산됐으면 그대로,
+    아니면 새로 계산해 캐시.
+    """
+    cols = _numeric_cols(df, cols)
+    quantiles = list(quantiles)
+    stats = df.attrs.get(STATS_ATTR)
+    if not _covers(stats, df, cols, quantiles, cohort_col):
+        stats = compute_batch_stats(df, cols, quantiles, cohort_col)
+        df.attrs[STATS_ATTR] = stats
+    return stats
+
+
+def batch_medians(df: pd.DataFrame, cols: Iterable[str]) -> Dict[str, float]:
+    # median만 필요할 때: 캐시가 있으면 재사용, 없으면 분위수 없이 median만 한 번에 계산
+    cols = _numeric_cols(df, cols)
+    stats = df.attrs.get(STATS_ATTR)
+    if _covers(stats, df, cols, [], None):
+        return {c: stats["median"][c] for c in cols}
+    return {c: float(v) for c, v in df[cols].median().items()}
+
+
+def row_quantile(
+    df: pd.DataFrame,
+    stats: Dict[str, Any],
+    col: str,
+    q: float,
+) -> pd.Series:
+    """
+    행별 분위수 기준값. 코호트 통계가 있으면 각 행의 코호트 값, 없으면(또는 코호트 미상) 전역 값.
+    """
+    global_value = stats["quantiles"][_q_key(q)][col]
+    cohort_col = stats.get("cohort_col")
+    if cohort_col is None or not stats.get("cohort_quantiles"):
+        return pd.Series(global_value, index=df.index, dtype=float)
+
+    mapping = stats["cohort_quantiles"][_q_key(q)].get(col)
+    if mapping is None:
+        return pd.Series(global_value, index=df.index, dtype=float)
+    keys = df[cohort_col].astype(str).where(df[cohort_col].notna())
+    return keys.map(mapping).astype(float).fillna(global_value)
@@ -24,4 +24,82 @@ EVALUATION_POLICY = {           # 성취율 계산용 기준값 (유저 입력)
     "performance_max": 100,     # 수행평가 만점
     "performance_weight": 20,   # %
     "total_classes": 160,       # 총 수업 횟수
-}
\ No newline at end of file
+}
+
+MODEL_SEARCH_SPACE = {          # train_model.py 교차검증 탐색 후보 (모델명 -> 파라미터 그리드)
+    "logistic": {
+        "clf__C": [0.1, 1.0, 10.0],
+        "clf__class_weight": ["balanced", None],
+    },
+    "random_forest": {
+        "clf__n_estimators": [200, 400],
+        "clf__max_depth": [None, 6],
+        "clf__min_samples_leaf": [1, 5],
+    },
+}
+
+DEFAULT_SEARCH_MODELS = ["logistic"]    # --models 미지정 시 탐색할 후보
+
+FEATURE_LABELS = {              # 모델 기반 위험 요인(model_reasons) 표시용 이름
+    "midterm_score": "중간고사 점수",
+    "final_score": "기말고사 점수",
+    "performance_score": "수행평가 점수",
+    "midterm_score_missing": "중간고사 미응시/결측",
+    "final_score_missing": "기말고사 미응시/결측",
+    "performance_score_missing": "수행평가 미응시/결측",
+    "assignment_count": "과제 제출 횟수",
+    "question_count": "질문 횟수",
+    "night_study": "야간 자율학습 참여",
+    "absence_count": "결석 횟수",
+    "behavior_score": "상벌점",
+    "participation_level_num": "수업 참여도",
+    "has_history": "이전 채점 이력",
+    "days_since_prev": "이전 채점 후 경과 일수",
+    "delta_absence_count": "결석 횟수 증가",
+    "delta_assignment_count": "과제 제출 변화",
+    "delta_behavior_score": "상벌점 변화",
+    "delta_achievement_rate": "성취율 변화",
+}
+
+PARTICIPATION_LEVELS = {        # 수업 참여도 인코딩 (그 외 값은 데이터 품질 리포트에 기록 후 결측 처리)
+    "상": 2,
+    "중": 1,
+    "하": 0,
+}
+
+VALUE_RANGES = {                # 입력값 허용 범위 (최소, 최대). None은 제한 없음
+    "midterm_score": (0, 100),      # 점수 상한은 채점 시 정책(*_max)으로 대체
+    "final_score": (0, 100),
+    "performance_score": (0, 100),
+    "assignment_count": (0, None),
+    "question_count": (0, None),
+    "night_study": (0, 1),
+    "absence_count": (0, None),     # 채점 시 정책(total_classes)을 상한으로 사용
+}
+
+QUALITY_MAX_ISSUES = 200        # 데이터 품질 리포트에 남길 최대 항목 수 (건수 집계는 전체 기준)
+
+RISK_BANDS = [                  # 위험 등급 구간: 확률이 min_proba 이상인 가장 높은 구간 (정책 risk_bands로 요청별 변경 가능)
+    {"level": "High", "min_proba": 0.70, "action": "즉시 상담 및 보충학습 개입 필요"},
+    {"level": "Medium", "min_proba": 0.40, "action": "과제 참여 모니터링 및 사전 지도"},
+    {"level": "Low", "min_proba": 0.0, "action": "일반 관찰 유지"},
+]
+
+SNAPSHOT_COL = "snapshot_at"    # 학습 데이터의 스냅샷 시각 컬럼 (학생별 여러 시점이 있을 때 이전 시점 피처 계산)
+
+HISTORY_COLS = [                # 학생별 이전 채점 스냅샷에서 가져오는 값 (prev_<컬럼>, delta_<컬럼> 생성)
+    "absence_count",
+    "assignment_count",
+    "behavior_score",
+    "achievement_rate",
+    "risk_proba",               # 학습 데이터에는 없으므로 리포트 표시용(delta_risk_proba)으로만 사용
+]
+
+HISTORY_FEATURE_COLS = [        # train_model.py --history 시 FEATURE_COLS 뒤에 추가되는 추이 피처
+    "has_history",                  # 이전 스냅샷 존재 여부
+    "days_since_prev",              # 이전 스냅샷 이후 경과 일수
+    "delta_absence_count",          # 결석 횟수 변화
+    "delta_assignment_count",       # 과제 제출 횟수 변화
+    "delta_behavior_score",         # 상벌점 변화
+    "delta_achievement_rate",       # 성취율 변화
+]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import io
+import math
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Dict, Optional
+
+import pandas as pd
+
+from backend.src.preprocessing import _require_pyarrow
+
+
+# ----------------------------
+# Upload cost estimate
+# ----------------------------
+# 업로드 전체를 읽기 전에 앞부분(CSV 첫 KB, Parquet/Arrow 메타데이터 + 앞 몇 행)만 보고 행 수/메모리를 추정해
+# 채점 경로(memory / chunked / job)를 고릅니다.
+# 배율은 score_report 실측값(최대 RSS 증가량 / 입력 DataFrame 메모리) 기준입니다.
+SCORING_MEMORY_FACTOR = 22      # 메모리 경로: 전처리/확장 단계의 중간 복사본 포함
+CHUNKED_MEMORY_FACTOR = 10      # 청크 경로: 결과 리포트 + model_reasons 복사본(입력은 청크로만 읽음, 청크 중간 복사본 제외)
+CSV_SAMPLE_BYTES = 1024
+CSV_SAMPLE_MAX_BYTES = 64 * 1024  # 첫 KB에 데이터 행이 없을 만큼 긴 행이면 여기까지 늘려 읽음
+SAMPLE_ROWS = 64                  # Parquet/Arrow: 1행당 메모리 측정용 앞부분 행 수
+
+ROUTES = ("memory", "chunked", "job")
+
+
+@dataclass(frozen=True)
+class UploadEstimate:
+    format: str
+    bytes: int
+    rows: int
+    rows_exact: bool      # Parquet 메타데이터처럼 정확한 행 수인지
+    columns: int
+    row_bytes: float      # 입력 DataFrame 1행당 메모리 추정
+    frame_bytes: int      # 입력 DataFrame 메모리 추정
+
+    def peak_bytes(self, route: str = "memory", chunk_rows: int = 0) -> int:
+        # 경로별 채점 최대 메모리 추정
+        if route == "chunked":
+            chunk = min(self.rows, chunk_rows) * self.row_bytes
+            return int(self.frame_bytes * CHUNKED_MEMORY_FACTOR + chunk * SCORING_MEMORY_FACTOR)
+        return int(self.frame_bytes * SCORING_MEMORY_FACTOR)
+
+    def to_dict(self, chunk_rows: int = 0) -> Dict[str, Any]:
+        out = asdict(self)
+        out["row_bytes"] = round(self.row_bytes, 1)
+        out["peak_bytes"] = {
+            "memory": self.peak_bytes("memory"),
+            "chunked": self.peak_bytes("chunked", chunk_rows),
+        }
+        return out
+
+
+def _source_size(source: IO[bytes]) -> int:
+    pos = source.tell()
+    source.seek(0, io.SEEK_END)
+    size = source.tell()
+    source.seek(pos)
+    return size
+
+
+def _estimate_csv(source: IO[bytes], size: int, encoding: str) -> UploadEstimate:
+    sample_size = CSV_SAMPLE_BYTES
+    while True:
+        source.seek(0)
+        sample = source.read(sample_size)
+        lines = sample.split(b"\n")
+        eof = len(sample) >= size
+        # 마지막 조각은 잘린 행일 수 있으므로 파일 끝이 아니면 제외
+        complete = lines if eof else lines[:-1]
+        complete = [line for line in complete if line.strip()]
+        if len(complete) >= 2 or eof or sample_size >= CSV_SAMPLE_MAX_BYTES:
+            break
+        sample_size *= 4
+
+    if not complete:
+        return UploadEstimate("csv", size, 0, True, 0, 0.0, 0)
+
+    header, data_lines = complete[0], complete[1:]
+    columns = len(pd.read_csv(io.BytesIO(header), encoding=encoding, nrows=0).columns)
+    if not data_lines:
+        return UploadEstimate("csv", size, 0, eof, columns, 0.0, 0)
+
+    df = pd.read_csv(io.BytesIO(b"\n".join(complete)), encoding=encoding)
+    row_bytes = df.memory_usage(deep=True, index=False).sum() / len(df)
+    if eof:
+        rows = len(df)
+    else:
+        line_bytes = sum(len(line) + 1 for line in data_lines) / len(data_lines)
+        rows = math.ceil((size - len(header) - 1) / line_bytes)
+    return UploadEstimate("csv", size, rows, eof, columns, float(row_bytes), int(rows * row_bytes))
+
+
+def _sample_row_bytes(batch: Any) -> float:
+    # 앞 일부 행만 pandas로 변환해 1행당 메모리(컬럼 폭 합) 측정
+    df = batch.slice(0, SAMPLE_ROWS).to_pandas()
+    return float(df.memory_usage(deep=True, index=False).sum() / len(df)) if len(df) else 0.0
+
+
+def _estimate_parquet(source: IO[bytes], size: int) -> UploadEstimate:
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(source)
+    rows = pf.metadata.num_rows  # 메타데이터의 정확한 행 수
+    batch = next(pf.iter_batches(batch_size=SAMPLE_ROWS), None) if rows else None
+    row_bytes = _sample_row_bytes(batch) if batch is not None else 0.0
+    return UploadEstimate("parquet", size, rows, True, pf.metadata.num_columns, row_bytes, int(rows * row_bytes))
+
+
+def _estimate_arrow(source: IO[bytes], size: int) -> UploadEstimate:
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    # file 형식: 첫 배치 행 수 × 배치 수, stream 형식: 파일 크기 / 첫 배치의 바이트당 행 수
+    src = pa.PythonFile(source, mode="r")
+    try:
+        reader = ipc.open_file(src)
+        n_batches = reader.num_record_batches
+        batch = reader.get_batch(0) if n_batches else None
+    except pa.ArrowInvalid:
+        source.seek(0)
+        reader = ipc.open_stream(src)
+        n_batches = None
+        batch = next(iter(reader), None)
+    columns = len(reader.schema)
+
+    if batch is None or not batch.num_rows:
+        return UploadEstimate("arrow", size, 0, True, columns, 0.0, 0)
+    if n_batches is not None:
+        rows = batch.num_rows * n_batches
+    else:
+        body = max(size - reader.schema.serialize().size, batch.nbytes)  # 스키마 메시지 제외
+        rows = max(batch.num_rows, math.ceil(body * batch.num_rows / batch.nbytes))
+    exact = n_batches == 1
+    row_bytes = _sample_row_bytes(batch)
+    return UploadEstimate("arrow", size, rows, exact, columns, row_bytes, int(rows * row_bytes))
+
+
+def estimate_upload(source: IO[bytes], fmt: str = "csv", encoding: str = "utf-8-sig") -> UploadEstimate:
+    """
+    파일 객체의 앞부분/메타데이터만 읽어 행 수와 입력 DataFrame 메모리를 추정.
+    끝나면 읽기 위치를 처음으로 되돌립니다.
+    """
+    size = _source_size(source)
+    try:
+        if fmt == "csv":
+            return _estimate_csv(source, size, encoding)
+        if fmt == "parquet":
+            return _estimate_parquet(source, size)
+        if fmt == "arrow":
+            return _estimate_arrow(source, size)
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt}")
+    finally:
+        source.seek(0)
+
+
+def choose_route(
+    estimate: UploadEstimate,
+    memory_max_bytes: int,
+    chunked_max_bytes: int,
+    chunk_rows: int,
+    forced: Optional[str] = None,
+) -> str:
+    """
+    메모리 경로 추정치가 memory_max_bytes 이하 → memory,
+    청크 경로 추정치가 chunked_max_bytes 이하 → chunked, 그 외 → job(비동기 작업).
+    forced(요청에서 지정한 경로)가 있으면 그대로 사용합니다.
+    """
+    if forced:
+        return forced
+    if estimate.peak_bytes("memory") <= memory_max_bytes:
+        return "memory"
+    if estimate.peak_bytes("chunked", chunk_rows) <= chunked_max_bytes:
+        return "chunked"
+    return "job"
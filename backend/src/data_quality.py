@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.src.config import PARTICIPATION_LEVELS, QUALITY_MAX_ISSUES, VALUE_RANGES
+
+
+# ----------------------------
+# Data quality (single pass)
+# ----------------------------
+# basic_cleaning에서 컬럼마다 한 번만 훑으며 수치 변환과 품질 검사를 함께 수행합니다.
+# - non_numeric: 수치 컬럼에 숫자로 읽을 수 없는 값(변환 후 NaN 처리)
+# - out_of_range: 허용 범위(VALUE_RANGES, 채점 시 정책 상한) 밖의 값(값은 그대로 유지)
+# - unknown_participation_level: 상/중/하 이외 값(인코딩 후 NaN → 결측 채움)
+# - duplicate_student_id: 같은 student_id가 여러 행(해시 기반 duplicated)
+# 결과 요약은 JSON 직렬화 가능한 dict로 df.attrs에 저장해 응답에 함께 반환합니다.
+QUALITY_ATTR = "data_quality"
+ISSUE_TYPES = ("non_numeric", "out_of_range", "unknown_participation_level", "duplicate_student_id")
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def _blank(s: pd.Series) -> pd.Series:
+    # 결측 또는 공백 문자열 → 결측으로 취급(비수치 오류 아님)
+    return s.isna() | s.astype(str).str.strip().eq("")
+
+
+def coerce_numeric(s: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """
+    (수치 변환 결과, 비수치 셀 마스크). 이미 수치형이면 변환/검사를 생략합니다.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s, np.zeros(len(s), dtype=bool)
+    values = pd.to_numeric(s, errors="coerce")
+    bad = values.isna() & ~_blank(s)
+    return values, bad.to_numpy()
+
+
+def _out_of_range(values: pd.Series, bounds: Range) -> np.ndarray:
+    lo, hi = bounds
+    mask = np.zeros(len(values), dtype=bool)
+    if lo is not None:
+        mask |= (values < lo).to_numpy(dtype=bool, na_value=False)
+    if hi is not None:
+        mask |= (values > hi).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+class QualityCollector:
+    # 검사별 (컬럼, 문제 유형, 행 위치 마스크, 원본 값)을 모아 요약(dict)으로 만듭니다.
+    # row_offset: 청크 단위 검사에서 앞선 청크의 행 수(행 번호를 업로드 전체 기준으로 맞춤)
+    def __init__(self, df: pd.DataFrame, id_col: str = "student_id", row_offset: int = 0):
+        self.n_rows = len(df)
+        self.ids = df[id_col] if id_col in df.columns else None
+        self.row_offset = row_offset
+        self._found: List[Tuple[str, str, np.ndarray, pd.Series]] = []
+
+    def add(self, column: str, issue: str, mask: np.ndarray, raw: pd.Series) -> None:
+        if mask.any():
+            self._found.append((column, issue, mask, raw))
+
+    def flagged(self) -> np.ndarray:
+        # 문제가 하나 이상 있는 행 마스크
+        flagged = np.zeros(self.n_rows, dtype=bool)
+        for _, _, mask, _ in self._found:
+            flagged |= mask
+        return flagged
+
+    def summary(self, max_issues: int = QUALITY_MAX_ISSUES) -> Dict[str, Any]:
+        counts = {issue: 0 for issue in ISSUE_TYPES}
+        flagged = np.zeros(self.n_rows, dtype=bool)
+        positions, columns, issues, values = [], [], [], []
+        for column, issue, mask, raw in self._found:
+            pos = np.flatnonzero(mask)
+            counts[issue] += len(pos)
+            flagged |= mask
+            positions.append(pos)
+            columns += [column] * len(pos)
+            issues += [issue] * len(pos)
+            values.append(raw.iloc[pos].astype(str).to_numpy())
+
+        items: List[Dict[str, Any]] = []
+        if positions:
+            pos = np.concatenate(positions)
+            # 행 순서대로 앞쪽 max_issues개만 상세 기록
+            order = np.argsort(pos, kind="stable")[:max_issues]
+            vals = np.concatenate(values)
+            ids = self.ids.iloc[pos[order]].astype(str).to_numpy() if self.ids is not None else [None] * len(order)
+            items = [
+                {
+                    "row": int(pos[i]) + 1 + self.row_offset,
+                    "student_id": sid,
+                    "column": columns[i],
+                    "issue": issues[i],
+                    "value": vals[i],
+                }
+                for i, sid in zip(order, ids)
+            ]
+
+        total = int(sum(counts.values()))
+        return {
+            "rows": self.n_rows,
+            "rows_with_issues": int(flagged.sum()),
+            "counts": counts,
+            "issues": items,
+            "truncated": total > len(items),
+        }
+
+
+def _check_values(
+    df: pd.DataFrame,
+    collector: QualityCollector,
+    numeric_cols: Iterable[str],
+    value_ranges: Optional[Dict[str, Range]] = None,
+    levels: Optional[Iterable[str]] = None,
+) -> Dict[str, pd.Series]:
+    # 행 단위 검사(비수치/범위/참여도) + 수치 변환. 중복 student_id는 배치 전체 기준이라 호출 측에서 검사
+    ranges = VALUE_RANGES if value_ranges is None else value_ranges
+    allowed = list(PARTICIPATION_LEVELS if levels is None else levels)
+
+    coerced: Dict[str, pd.Series] = {}
+    for c in numeric_cols:
+        if c not in df.columns:
+            continue
+        raw = df[c]
+        values, bad = coerce_numeric(raw)
+        coerced[c] = values
+        collector.add(c, "non_numeric", bad, raw)
+        if c in ranges:
+            collector.add(c, "out_of_range", _out_of_range(values, ranges[c]), raw)
+
+    if "participation_level" in df.columns:
+        raw = df["participation_level"]
+        unknown = raw.notna() & ~raw.astype(str).str.strip().isin(allowed)
+        collector.add("participation_level", "unknown_participation_level", unknown.to_numpy(), raw)
+    return coerced
+
+
+def _check_duplicate_ids(collector: QualityCollector, ids: pd.Series, id_col: str) -> None:
+    dup = ids.duplicated(keep=False) & ids.notna()
+    collector.add(id_col, "duplicate_student_id", dup.to_numpy(), ids)
+
+
+def check_quality(
+    df: pd.DataFrame,
+    numeric_cols: Iterable[str],
+    value_ranges: Optional[Dict[str, Range]] = None,
+    levels: Optional[Iterable[str]] = None,
+    id_col: str = "student_id",
+) -> Tuple[Dict[str, pd.Series], Dict[str, Any]]:
+    """
+    df(컬럼명 정리 후, 중복 제거 전)를 한 번 훑어 (수치 변환된 컬럼들, 품질 요약) 반환.
+    행 번호(row)는 df 기준 1부터입니다.
+    """
+    collector = QualityCollector(df, id_col=id_col)
+    coerced = _check_values(df, collector, numeric_cols, value_ranges, levels)
+    if id_col in df.columns:
+        _check_duplicate_ids(collector, df[id_col], id_col)
+    return coerced, collector.summary()
+
+
+class ChunkedQuality:
+    """
+    청크를 순서대로 add()하면 업로드 전체에 check_quality를 한 번 실행한 것과 같은 요약을 만듭니다.
+    청크마다 행 단위 검사 결과(앞쪽 max_issues개 항목 + 문제 행 마스크)와 student_id만 보관하고,
+    중복 student_id 검사는 summary()에서 전체 ID로 한 번 수행합니다.
+    """
+
+    def __init__(
+        self,
+        numeric_cols: Iterable[str],
+        value_ranges: Optional[Dict[str, Range]] = None,
+        levels: Optional[Iterable[str]] = None,
+        id_col: str = "student_id",
+        max_issues: int = QUALITY_MAX_ISSUES,
+    ):
+        self.numeric_cols = list(numeric_cols)
+        self.value_ranges = value_ranges
+        self.levels = levels
+        self.id_col = id_col
+        self.max_issues = max_issues
+        self.n_rows = 0
+        self._counts = {issue: 0 for issue in ISSUE_TYPES}
+        self._items: List[Dict[str, Any]] = []
+        self._flagged: List[np.ndarray] = []
+        self._ids: List[pd.Series] = []
+
+    def add(self, chunk: pd.DataFrame) -> Dict[str, pd.Series]:
+        # 청크 검사 후 수치 변환된 컬럼들 반환(check_quality와 같음)
+        collector = QualityCollector(chunk, id_col=self.id_col, row_offset=self.n_rows)
+        coerced = _check_values(chunk, collector, self.numeric_cols, self.value_ranges, self.levels)
+        part = collector.summary(self.max_issues)
+        for issue, n in part["counts"].items():
+            self._counts[issue] += n
+        self._items += part["issues"]
+        self._flagged.append(collector.flagged())
+        if self.id_col in chunk.columns:
+            self._ids.append(chunk[self.id_col].reset_index(drop=True))
+        self.n_rows += len(chunk)
+        return coerced
+
+    def summary(self) -> Dict[str, Any]:
+        flagged = np.concatenate(self._flagged) if self._flagged else np.zeros(0, dtype=bool)
+        counts = dict(self._counts)
+        items = list(self._items)
+        if self._ids:
+            ids = pd.concat(self._ids, ignore_index=True)
+            dup = QualityCollector(ids.to_frame(self.id_col), id_col=self.id_col)
+            _check_duplicate_ids(dup, ids, self.id_col)
+            part = dup.summary(self.max_issues)
+            counts["duplicate_student_id"] += part["counts"]["duplicate_student_id"]
+            flagged = flagged | dup.flagged()
+            # 같은 행이면 행 단위 검사 항목 뒤에 중복 ID 항목 (check_quality와 같은 순서)
+            items = sorted(items + part["issues"], key=lambda item: item["row"])
+        items = items[: self.max_issues]
+        return {
+            "rows": self.n_rows,
+            "rows_with_issues": int(flagged.sum()),
+            "counts": counts,
+            "issues": items,
+            "truncated": int(sum(counts.values())) > len(items),
+        }
+
+
+def get_quality(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    return df.attrs.get(QUALITY_ATTR)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.src.config import FEATURE_COLS
+
+
+# ----------------------------
+# Drift sketches
+# ----------------------------
+# 피처별 고정 구간 히스토그램(sketch)으로 업로드 분포가 학습 분포에서 벗어나는지 봅니다.
+# - 구간 경계: 학습 데이터 분위수(train_model.py가 모델 옆 <모델명>.drift.json에 저장)
+# - 같은 경계의 히스토그램은 구간별 개수를 더하기만 하면 합쳐짐(요청/일 단위 누적)
+# - 구간: (-inf, e0], (e0, e1], ..., (e_k, inf) + 결측(NaN) 개수
+DRIFT_FEATURES = [*FEATURE_COLS, "risk_proba"]
+DRIFT_BINS = 10
+REFERENCE_SUFFIX = ".drift.json"
+
+# PSI 해석 기준(관례): < 0.1 안정, < 0.25 주의, 그 이상 유의미한 변화
+PSI_LEVELS = ((0.1, "stable"), (0.25, "moderate"))
+PSI_EPS = 1e-4
+
+
+def reference_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + REFERENCE_SUFFIX)
+
+
+def _bin_edges(values: np.ndarray, bins: int) -> List[float]:
+    finite = values[~np.isnan(values)]
+    if not len(finite):
+        return []
+    qs = np.linspace(0, 1, bins + 1)[1:-1]
+    return np.unique(np.quantile(finite, qs)).tolist()
+
+
+def _counts(values: np.ndarray, edges: List[float]) -> tuple:
+    # (구간별 개수, 결측 개수). searchsorted(side="left") → 오른쪽 닫힌 구간
+    missing = np.isnan(values)
+    idx = np.searchsorted(np.asarray(edges, dtype=float), values[~missing], side="left")
+    return np.bincount(idx, minlength=len(edges) + 1), int(missing.sum())
+
+
+def _feature_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def build_reference(
+    df: pd.DataFrame,
+    features: Optional[List[str]] = None,
+    bins: int = DRIFT_BINS,
+) -> Dict[str, Any]:
+    """
+    학습 피처(+ risk_proba) DataFrame으로 기준 sketch(구간 경계 + 개수)를 만듦.
+    """
+    features = [f for f in (features or DRIFT_FEATURES) if f in df.columns]
+    out: Dict[str, Any] = {}
+    for col in features:
+        values = _feature_values(df, col)
+        edges = _bin_edges(values, bins)
+        counts, missing = _counts(values, edges)
+        out[col] = {"edges": edges, "counts": counts.tolist(), "missing": missing}
+
+    body = json.dumps(out, sort_keys=True)
+    return {
+        # 경계가 바뀌면(재학습) 누적 개수를 섞지 않도록 구분하는 ID
+        "reference_id": hashlib.sha256(body.encode("utf-8")).hexdigest()[:16],
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": int(len(df)),
+        "features": out,
+    }
+
+
+def save_reference(reference: Dict[str, Any], path: Path) -> None:
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(reference, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_reference(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def sketch(df: pd.DataFrame, reference: Dict[str, Any]) -> Dict[str, Dict[int, int]]:
+    """
+    업로드 결과(df)를 기준 경계로 집계: {피처: {구간 번호: 개수}} (결측은 -1).
+    개수가 0인 구간은 생략합니다.
+    """
+    out: Dict[str, Dict[int, int]] = {}
+    for col, ref in reference["features"].items():
+        if col not in df.columns:
+            continue
+        counts, missing = _counts(_feature_values(df, col), ref["edges"])
+        bins = {int(i): int(c) for i, c in enumerate(counts) if c}
+        if missing:
+            bins[-1] = missing
+        out[col] = bins
+    return out
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    e = np.clip(expected / expected.sum(), PSI_EPS, None)
+    a = np.clip(actual / actual.sum(), PSI_EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def _ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    # 구간 경계에서의 누적 비율 차이 최대값(구간화된 KS 통계량)
+    return float(np.max(np.abs(np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum())))
+
+
+def psi_status(psi: Optional[float]) -> Optional[str]:
+    if psi is None:
+        return None
+    for limit, label in PSI_LEVELS:
+        if psi < limit:
+            return label
+    return "significant"
+
+
+def drift_scores(reference: Dict[str, Any], current: Dict[str, Dict[int, int]]) -> List[Dict[str, Any]]:
+    """
+    기준 sketch와 누적 sketch(current)의 피처별 PSI/KS.
+    결측은 값 구간에서 제외하고 결측 비율로 따로 비교합니다.
+    """
+    rows = []
+    for col, ref in reference["features"].items():
+        n_bins = len(ref["edges"]) + 1
+        expected = np.asarray(ref["counts"], dtype=float)
+        bins = current.get(col, {})
+        actual = np.zeros(n_bins)
+        for i, c in bins.items():
+            if 0 <= i < n_bins:
+                actual[i] += c
+        missing = bins.get(-1, 0)
+        n = int(actual.sum()) + missing
+        ref_n = expected.sum() + ref["missing"]
+
+        ok = actual.sum() > 0 and expected.sum() > 0
+        psi = round(_psi(expected, actual), 6) if ok else None
+        rows.append({
+            "feature": col,
+            "rows": n,
+            "psi": psi,
+            "ks": round(_ks(expected, actual), 6) if ok else None,
+            "status": psi_status(psi),
+            "missing_rate": round(missing / n, 6) if n else None,
+            "reference_missing_rate": round(ref["missing"] / ref_n, 6) if ref_n else None,
+        })
+    return rows
+
+
+# ----------------------------
+# Drift store (SQLite)
+# ----------------------------
+# (기준 ID, 날짜, 피처, 구간)별 개수를 누적(upsert)합니다. 요청당 쓰기는 피처 × 구간 수 이하입니다.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drift_counts (
+    reference_id TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    day TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (reference_id, day, feature, bin)
+)
+"""
+
+
+class DriftStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(
+        self,
+        reference_id: str,
+        model_version: str,
+        counts: Dict[str, Dict[int, int]],
+        day: Optional[date] = None,
+    ) -> None:
+        day_key = (day or date.today()).isoformat()
+        rows = [
+            (reference_id, model_version, day_key, feature, b, c)
+            for feature, bins in counts.items()
+            for b, c in bins.items()
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO drift_counts (reference_id, model_version, day, feature, bin, count) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (reference_id, day, feature, bin) DO UPDATE SET count = count + excluded.count",
+                rows,
+            )
+
+    def totals(self, reference_id: str, since: Optional[date] = None) -> Dict[str, Dict[int, int]]:
+        sql = "SELECT feature, bin, SUM(count) AS n FROM drift_counts WHERE reference_id = ?"
+        params: list = [reference_id]
+        if since is not None:
+            sql += " AND day >= ?"
+            params.append(since.isoformat())
+        sql += " GROUP BY feature, bin"
+        out: Dict[str, Dict[int, int]] = {}
+        with self._connect() as conn:
+            for r in conn.execute(sql, params):
+                out.setdefault(r["feature"], {})[int(r["bin"])] = int(r["n"])
+        return out
+
+    def days(self, reference_id: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT day FROM drift_counts WHERE reference_id = ? ORDER BY day",
+                (reference_id,),
+            ).fetchall()
+        return [r["day"] for r in rows]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.metrics import accuracy_score, check_scoring, f1_score, precision_score, recall_score
+
+
+# ----------------------------
+# Model evaluation tables
+# ----------------------------
+# 노트북(02/03)에서 만들던 평가 테이블(지표/계수/순열 중요도)을 모델 아티팩트 기준으로 계산합니다.
+# 순열 중요도는 (피처, 반복 묶음) 단위 작업을 프로세스 풀(joblib/loky)에 나눠 실행합니다.
+# - 피처 행렬은 임시 파일에 한 번 저장하고, 워커는 읽기 전용 메모리 맵으로 공유(프로세스별 복사본 없음)
+# - 반복마다 (seed, 피처 번호, 반복 번호)로 난수 생성기를 만들어 n_jobs/작업 분할과 무관하게 같은 결과
+RANDOM_STATE = 42
+TASKS_PER_WORKER = 4  # 작업 수 ≈ 워커 수 × 4 (피처별 비용 차이를 흡수할 정도로만 나눔)
+
+
+def _snake_case(name: str) -> str:
+    # LogisticRegression -> logistic_regression
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _final_estimator(model: Any) -> Any:
+    return model.steps[-1][1] if hasattr(model, "steps") else model
+
+
+# ----------------------------
+# Metrics / coefficients
+# ----------------------------
+def model_metrics(model: Any, X: pd.DataFrame, y: np.ndarray) -> pd.DataFrame:
+    # 노트북 02의 model_metrics_logistic.csv 형식(model,accuracy,precision,recall,f1)
+    pred = model.predict(X)
+    return pd.DataFrame([{
+        "model": _snake_case(type(_final_estimator(model)).__name__),
+        "accuracy": accuracy_score(y, pred),
+        "precision": precision_score(y, pred, zero_division=0),
+        "recall": recall_score(y, pred, zero_division=0),
+        "f1": f1_score(y, pred, zero_division=0),
+    }]).round(4)
+
+
+def feature_importance(model: Any, feature_cols: List[str]) -> pd.DataFrame:
+    # 선형 모델은 계수(coefficient), 트리 모델은 feature_importances_(importance)
+    est = _final_estimator(model)
+    if hasattr(est, "coef_"):
+        values, column = np.ravel(est.coef_[0]), "coefficient"
+    elif hasattr(est, "feature_importances_"):
+        values, column = np.asarray(est.feature_importances_), "importance"
+    else:
+        raise ValueError(f"{type(est).__name__} has neither coef_ nor feature_importances_.")
+    return (
+        pd.DataFrame({"feature": feature_cols, column: values})
+        .sort_values(column, ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+# ----------------------------
+# Parallel permutation importance
+# ----------------------------
+@lru_cache(maxsize=2)
+def _worker_model(model_path: str) -> Any:
+    # 워커 프로세스마다 한 번만 읽음(loky 워커는 작업 간 재사용)
+    return joblib.load(model_path, mmap_mode="r")
+
+
+@lru_cache(maxsize=2)
+def _worker_matrix(x_path: str) -> np.ndarray:
+    # 읽기 전용 메모리 맵: 워커 간 같은 OS 페이지 캐시를 공유(프로세스별 복사본 없음)
+    return joblib.load(x_path, mmap_mode="r")
+
+
+def _permutation_scores(
+    model_path: str,
+    x_path: str,
+    y: np.ndarray,
+    feature_cols: List[str],
+    scoring: str,
+    seed: int,
+    feature: int,
+    repeats: range,
+) -> tuple:
+    """
+    피처 하나를 repeats 횟수만큼 섞어 점수 계산: (피처 번호, 반복 번호 목록, 점수 목록).
+    작업마다 X 복사본은 하나만 만들고, 섞는 열만 반복마다 덮어씁니다.
+    """
+    model = _worker_model(model_path)
+    X = _worker_matrix(x_path)
+    scorer = check_scoring(model, scoring=scoring)
+
+    column = np.array(X[:, feature])
+    frame = pd.DataFrame(np.array(X), columns=feature_cols)
+    scores = []
+    for r in repeats:
+        order = np.random.default_rng([seed, feature, r]).permutation(len(column))
+        frame.iloc[:, feature] = column[order]
+        scores.append(scorer(model, frame, y))
+    return feature, list(repeats), scores
+
+
+def _repeat_blocks(n_features: int, n_repeats: int, n_workers: int) -> List[range]:
+    # 피처 수가 워커 수보다 적으면 반복도 나눠 모든 워커가 일하도록 함
+    per_feature = max(1, min(n_repeats, math.ceil(n_workers * TASKS_PER_WORKER / n_features)))
+    size = math.ceil(n_repeats / per_feature)
+    return [range(start, min(start + size, n_repeats)) for start in range(0, n_repeats, size)]
+
+
+def permutation_importance_parallel(
+    model_path: Path,
+    X: np.ndarray,
+    y: np.ndarray,
+    feature_cols: List[str],
+    scoring: str = "roc_auc",
+    n_repeats: int = 20,
+    seed: int = RANDOM_STATE,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    sklearn.inspection.permutation_importance와 같은 정의(기준 점수 - 섞은 점수)의 순열 중요도.
+    결과는 seed로만 결정되며 n_jobs와 무관합니다.
+    """
+    model = joblib.load(model_path, mmap_mode="r")
+    baseline = check_scoring(model, scoring=scoring)(model, pd.DataFrame(X, columns=feature_cols), y)
+
+    n_workers = effective_n_jobs(n_jobs)
+    blocks = _repeat_blocks(len(feature_cols), n_repeats, n_workers)
+    importances = np.empty((len(feature_cols), n_repeats))
+
+    with tempfile.TemporaryDirectory(prefix="perm_") as tmp:
+        x_path = str(Path(tmp) / "X.joblib")
+        joblib.dump(np.ascontiguousarray(X), x_path)
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_permutation_scores)(
+                str(model_path), x_path, y, feature_cols, scoring, seed, j, repeats
+            )
+            for j in range(len(feature_cols))
+            for repeats in blocks
+        )
+    for feature, repeats, scores in results:
+        importances[feature, repeats] = baseline - np.asarray(scores)
+
+    return (
+        pd.DataFrame({
+            "feature": feature_cols,
+            "importance_mean": importances.mean(axis=1),
+            "importance_std": importances.std(axis=1),
+        })
+        .sort_values("importance_mean", ascending=False)
+        .reset_index(drop=True)
+    )
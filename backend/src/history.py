@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.src.config import HISTORY_COLS, HISTORY_FEATURE_COLS, SNAPSHOT_COL
+
+
+# ----------------------------
+# Longitudinal (as-of) features
+# ----------------------------
+# 학생별 이전 스냅샷(과거 채점 결과 또는 학습 데이터의 이전 시점)을 as-of 조인으로 붙여 추이 피처를 만듭니다.
+# - prev_<컬럼>: 현재 시각 이전(동시각 제외)의 가장 최근 스냅샷 값
+# - delta_<컬럼>: 현재 값 - 이전 값 (이력이 없으면 NaN → 모델 imputer가 0으로 채움)
+# - has_history(0/1), days_since_prev
+# 배치 전체를 pd.merge_asof 한 번으로 조인합니다(학생별 루프 없음).
+HISTORY_TIME_COL = "created_at"
+Timestamp = Union[datetime, pd.Timestamp, str]
+
+
+def prev_col(col: str) -> str:
+    return f"prev_{col}"
+
+
+def delta_col(col: str) -> str:
+    return f"delta_{col}"
+
+
+def history_columns() -> List[str]:
+    # 추이 조인으로 생기는 리포트 컬럼 전체 (has_history/days_since_prev/prev_*/delta_*)
+    return list(dict.fromkeys([
+        *HISTORY_FEATURE_COLS,
+        *(prev_col(c) for c in HISTORY_COLS),
+        *(delta_col(c) for c in HISTORY_COLS),
+    ]))
+
+
+def uses_history(feature_cols: Iterable[str]) -> bool:
+    # 모델 피처에 추이 피처가 포함되어 있는지(학습 시 --history)
+    return bool(set(feature_cols) & set(HISTORY_FEATURE_COLS))
+
+
+def _id_key(s: pd.Series) -> pd.Series:
+    # 조인 키: 문자열 student_id (저장소와 같은 형식), 결측은 그대로 두어 매칭되지 않게 함
+    return s.astype(str).where(s.notna())
+
+
+def _time_key(s: pd.Series) -> pd.Series:
+    return pd.to_datetime(s).astype("datetime64[ns]")
+
+
+def add_history_deltas(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
+    # prev_<컬럼>이 있는 컬럼만 delta_<컬럼> = 현재 - 이전 (채점 후 risk_proba처럼 나중에 생기는 값에도 사용)
+    for c in cols:
+        if c in df.columns and prev_col(c) in df.columns:
+            df[delta_col(c)] = pd.to_numeric(df[c], errors="coerce") - df[prev_col(c)]
+    return df
+
+
+def add_history_features(
+    df: pd.DataFrame,
+    history: pd.DataFrame,
+    at: Union[Timestamp, str],
+    cols: Optional[List[str]] = None,
+    id_col: str = "student_id",
+    time_col: str = HISTORY_TIME_COL,
+) -> pd.DataFrame:
+    """
+    df(현재 배치)에 history(student_id, time_col, cols...)의 as-of 이전 스냅샷을 붙여 반환.
+    at: 현재 시각(스칼라, 배치 전체 동일) 또는 df의 시각 컬럼명(행별 시점, 학습용)
+    행 순서/인덱스는 df 그대로 유지합니다.
+    """
+    cols = [c for c in (cols or HISTORY_COLS) if c in history.columns]
+    out = df.copy()
+
+    if isinstance(at, str) and at in df.columns:
+        now = _time_key(df[at])
+    else:
+        now = pd.Series(pd.Timestamp(at), index=df.index).astype("datetime64[ns]")
+
+    left = pd.DataFrame({"_key": _id_key(df[id_col]), "_at": now.to_numpy(), "_pos": np.arange(len(df))})
+    right = pd.DataFrame({"_key": _id_key(history[id_col]), "_at": _time_key(history[time_col])})
+    for c in cols:
+        right[prev_col(c)] = pd.to_numeric(history[c], errors="coerce").to_numpy()
+    right["_prev_at"] = right["_at"]
+    right = right.dropna(subset=["_key", "_at"])
+
+    merged = pd.merge_asof(
+        left.sort_values("_at", kind="stable"),
+        right.sort_values("_at", kind="stable"),
+        on="_at",
+        by="_key",
+        direction="backward",
+        allow_exact_matches=False,  # 같은 시각(자기 자신/같은 업로드)은 이전 스냅샷이 아님
+    ).sort_values("_pos")
+
+    for c in cols:
+        out[prev_col(c)] = merged[prev_col(c)].to_numpy()
+    prev_at = merged["_prev_at"]
+    out["has_history"] = prev_at.notna().astype(int).to_numpy()
+    out["days_since_prev"] = ((merged["_at"] - prev_at) / pd.Timedelta(days=1)).round(2).to_numpy()
+    return add_history_deltas(out, cols)
+
+
+def add_snapshot_history(
+    df: pd.DataFrame,
+    cols: Optional[List[str]] = None,
+    id_col: str = "student_id",
+    time_col: str = SNAPSHOT_COL,
+) -> pd.DataFrame:
+    """
+    학습 데이터(학생별 여러 시점, time_col)에서 각 행의 직전 시점 값을 같은 데이터로부터 붙임(self as-of).
+    """
+    if time_col not in df.columns:
+        raise ValueError(f"Missing snapshot time column '{time_col}' for history features.")
+    history = df.rename(columns={time_col: HISTORY_TIME_COL})
+    return add_history_features(df, history, time_col, cols=cols, id_col=id_col)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from backend.src.scoring import STAGES
+
+
+# ----------------------------
+# Job store (SQLite)
+# ----------------------------
+# 작업 상태를 SQLite 파일에 저장해 서버 재시작 후에도 유지합니다.
+# 연결은 호출마다 짧게 열고 닫으므로 여러 스레드/프로세스에서 안전하게 공유됩니다.
+# 여러 워커 프로세스가 같은 DB를 쓰므로, 작업 실행 전 claim()으로 소유권을 원자적으로 얻습니다.
+# 소유 프로세스는 PID 대신 프로세스마다 새로 만드는 boot id로 기록하고, 주기적으로 heartbeat_at을 갱신합니다.
+# (컨테이너 재시작 후 PID가 재사용되어도 이전 프로세스의 작업을 살아 있는 것으로 오인하지 않음)
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    owner_pid INTEGER,
+    owner_boot TEXT,
+    heartbeat_at TEXT
+)
+"""
+
+
+_MIGRATIONS = {
+    "owner_pid": "INTEGER",
+    "owner_boot": "TEXT",
+    "heartbeat_at": "TEXT",
+}
+
+_boot = {"pid": None, "id": None}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def boot_id() -> str:
+    # 현재 프로세스의 boot id (fork된 자식 프로세스는 pid가 달라 새로 만듦)
+    if _boot["pid"] != os.getpid():
+        _boot.update(pid=os.getpid(), id=uuid.uuid4().hex)
+    return _boot["id"]
+
+
+class JobStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            cols = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+            for name, sql_type in _MIGRATIONS.items():
+                if name not in cols:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {sql_type}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, params: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = _now()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, created_at, updated_at, params) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, now, now, json.dumps(params, ensure_ascii=False)),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        fields["updated_at"] = _now()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {cols} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id: str) -> bool:
+        # queued → running 전이는 한 프로세스만 성공합니다.
+        now = _now()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'running', owner_pid = ?, owner_boot = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = 'queued'",
+                (os.getpid(), boot_id(), now, now, job_id),
+            )
+        return cur.rowcount == 1
+
+    def heartbeat(self) -> int:
+        # 이 프로세스가 실행 중인 작업의 heartbeat_at 갱신
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND owner_boot = ?",
+                (_now(), boot_id()),
+            )
+        return cur.rowcount
+
+    def requeue_orphaned(self, stale_after: timedelta) -> List[str]:
+        # 다른 프로세스(이전 boot 포함)가 소유한 running 작업 중 heartbeat가 stale_after 이상 끊긴 작업을 queued로 되돌립니다.
+        # 이 프로세스가 소유한 작업은 살아 있으므로 건드리지 않습니다.
+        cutoff = (datetime.now() - stale_after).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'running' "
+                "AND COALESCE(owner_boot, '') != ? AND COALESCE(heartbeat_at, updated_at) < ?",
+                (boot_id(), cutoff),
+            ).fetchall()
+            orphaned = []
+            for r in rows:
+                cur = conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = NULL, progress = 0, "
+                    "owner_pid = NULL, owner_boot = NULL, heartbeat_at = NULL, updated_at = ? "
+                    "WHERE job_id = ? AND status = 'running' AND COALESCE(heartbeat_at, updated_at) < ?",
+                    (_now(), r["job_id"], cutoff),
+                )
+                if cur.rowcount:
+                    orphaned.append(r["job_id"])
+        return orphaned
+
+    def queued(self, before: Optional[datetime] = None) -> List[str]:
+        # before가 있으면 그 시각 이전부터 대기 중인 작업만
+        cutoff = before.isoformat(timespec="seconds") if before else "9999"
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' AND updated_at < ? ORDER BY created_at",
+                (cutoff,),
+            ).fetchall()
+        return [r["job_id"] for r in rows]
+
+
+# ----------------------------
+# Worker pool
+# ----------------------------
+# runner(job, report_stage) -> result dict
+# report_stage(stage)를 호출하면 STAGES 기준 진행률이 저장됩니다.
+JobRunner = Callable[[Dict[str, Any], Callable[[str], None]], Dict[str, Any]]
+
+
+class JobManager:
+    def __init__(
+        self,
+        store: JobStore,
+        runner: JobRunner,
+        max_workers: int = 2,
+        stale_after: timedelta = timedelta(seconds=60),
+        heartbeat_interval: float = 10.0,
+    ):
+        self.store = store
+        self.runner = runner
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            return self._executor
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._pool().submit(self._run, job_id)
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        job_id = self.store.create(params)
+        self._enqueue(job_id)
+        return job_id
+
+    def recover(self) -> List[str]:
+        # 재시작 전 대기/실행 중이던 작업을 다시 큐에 넣고(입력 파일은 디스크에 보존됨), heartbeat/정리 스레드를 시작합니다.
+        # 여러 워커가 동시에 호출해도 claim()에서 한 곳만 실행합니다.
+        self.store.requeue_orphaned(self.stale_after)
+        job_ids = self.store.queued()
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        self._start_sweeper()
+        return job_ids
+
+    def sweep(self) -> List[str]:
+        # 주기 작업: 내 작업 heartbeat 갱신 → 죽은 프로세스의 작업 재큐 → 오래 대기 중인(다른 프로세스가 못 가져간) 작업 실행
+        self.store.heartbeat()
+        requeued = self.store.requeue_orphaned(self.stale_after)
+        for job_id in [*requeued, *self.store.queued(before=datetime.now() - self.stale_after)]:
+            self._enqueue(job_id)
+        return requeued
+
+    def _start_sweeper(self) -> None:
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="job-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.sweep()
+            except sqlite3.Error:
+                # DB 잠금 등 일시 오류는 다음 주기에 다시 시도
+                pass
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._pending.clear()
+
+    def _run(self, job_id: str) -> None:
+        try:
+            if not self.store.claim(job_id):
+                return
+            job = self.store.get(job_id)
+
+            def report_stage(stage: str) -> None:
+                self.store.update(job_id, stage=stage, progress=STAGES.index(stage) / len(STAGES))
+
+            try:
+                result = self.runner(job, report_stage)
+            except Exception as exc:
+                self.store.update(job_id, status="failed", error=str(exc))
+                return
+            self.store.update(job_id, status="done", stage=None, progress=1.0, result=result)
+        finally:
+            with self._lock:
+                self._pending.discard(job_id)
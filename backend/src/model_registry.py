@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Model registry
+# ----------------------------
+# 모델 폴더(MODEL_DIR)의 *.joblib 파일을 버전(파일명 stem)으로 관리합니다.
+# - 기본 버전: default_path(MODEL_PATH)의 stem (폴더 밖 경로여도 등록)
+# - 버전별로 한 번만 읽고, 파일 (수정시각, 크기)가 바뀔 때만 다시 읽음(재학습 후 교체 반영)
+# - 폴더에 새로 추가된 버전은 처음 요청될 때 목록을 다시 읽어 찾음
+MODEL_SUFFIX = ".joblib"
+
+
+class ModelRegistry:
+    def __init__(self, model_dir: Path, default_path: Path, mmap_mode: Optional[str] = "r"):
+        self.model_dir = Path(model_dir)
+        self.default_path = Path(default_path)
+        self.mmap_mode = mmap_mode
+        self._paths: Dict[str, Path] = {}
+        self._cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @property
+    def default_version(self) -> str:
+        return self.default_path.stem
+
+    def refresh(self) -> List[str]:
+        paths = {}
+        if self.model_dir.is_dir():
+            paths = {p.stem: p for p in sorted(self.model_dir.glob(f"*{MODEL_SUFFIX}"))}
+        paths[self.default_version] = self.default_path
+        with self._lock:
+            self._paths = paths
+        return sorted(paths)
+
+    def versions(self) -> List[str]:
+        return sorted(self._paths)
+
+    def path(self, version: Optional[str] = None) -> Path:
+        version = version or self.default_version
+        if version not in self._paths:
+            self.refresh()
+        if version not in self._paths:
+            raise KeyError(version)
+        return self._paths[version]
+
+    def get(self, version: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        (버전, 모델) 반환. 없는 버전이면 KeyError, 파일이 없으면 FileNotFoundError.
+        """
+        version = version or self.default_version
+        path = self.path(version)
+        if not path.exists():
+            raise FileNotFoundError(path)
+        st = path.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._cache.get(version)
+            if cached is None or cached[0] != key:
+                cached = (key, joblib.load(path, mmap_mode=self.mmap_mode))
+                self._cache[version] = cached
+            return version, cached[1]
+
+    def describe(self) -> List[Dict[str, Any]]:
+        rows = []
+        for version in self.versions():
+            path = self._paths[version]
+            exists = path.exists()
+            rows.append({
+                "version": version,
+                "filename": path.name,
+                "default": version == self.default_version,
+                "loaded": version in self._cache,
+                "size_bytes": path.stat().st_size if exists else None,
+                "modified_at": (
+                    datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+                    if exists else None
+                ),
+            })
+        return rows
+
+
+# ----------------------------
+# Shadow scoring log
+# ----------------------------
+# 섀도 모델 확률을 응답에는 넣지 않고 비교용으로만 기록합니다.
+# - {log_dir}/{report_id}.csv: 학생별 기본/섀도 확률
+# - {log_dir}/summary.jsonl: 요청별 요약(평균/최대 차이 등) 한 줄씩
+# 파일 쓰기는 전용 스레드 하나에서 처리해 요청 지연에 더하지 않습니다.
+class ShadowLog:
+    def __init__(self, log_dir: Path):
+        self.log_dir = Path(log_dir)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+            return self._executor
+
+    def submit(
+        self,
+        report_id: str,
+        student_ids: pd.Series,
+        primary_version: str,
+        primary_proba: np.ndarray,
+        shadow_version: str,
+        shadow_proba: Optional[np.ndarray],
+        error: Optional[str] = None,
+    ) -> None:
+        self._pool().submit(
+            self._write,
+            report_id,
+            student_ids.to_numpy(),
+            primary_version,
+            np.asarray(primary_proba, dtype=float),
+            shadow_version,
+            None if shadow_proba is None else np.asarray(shadow_proba, dtype=float),
+            error,
+        )
+
+    def _write(
+        self,
+        report_id: str,
+        student_ids: np.ndarray,
+        primary_version: str,
+        p: np.ndarray,
+        shadow_version: str,
+        s: Optional[np.ndarray],
+        error: Optional[str],
+    ) -> None:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        summary: Dict[str, Any] = {
+            "report_id": report_id,
+            "logged_at": datetime.now().isoformat(timespec="seconds"),
+            "primary_version": primary_version,
+            "shadow_version": shadow_version,
+            "rows": int(len(p)),
+        }
+        if s is None:
+            summary["error"] = error
+        else:
+            pd.DataFrame({
+                "student_id": student_ids,
+                "primary_proba": p,
+                "shadow_proba": s,
+            }).to_csv(self.log_dir / f"{report_id}.csv", index=False, encoding="utf-8-sig")
+            diff = np.abs(s - p)
+            summary.update({
+                "primary_mean": round(float(p.mean()), 6) if len(p) else None,
+                "shadow_mean": round(float(s.mean()), 6) if len(s) else None,
+                "mean_abs_diff": round(float(diff.mean()), 6) if len(diff) else None,
+                "max_abs_diff": round(float(diff.max()), 6) if len(diff) else None,
+            })
+        with open(self.log_dir / "summary.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+    def shutdown(self) -> None:
+        # 남은 기록은 마치고 종료합니다.
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+
+from backend.src.batch_stats import get_batch_stats, share_batch_stats
+from backend.src.preprocessing import SCORE_COLS, _require_pyarrow
+from backend.src.report_logic import (
+    ENRICH_STAGES,
+    ROW_LOCAL_STAGES,
+    EvaluationPolicy,
+    add_risk_bands,
+    enrich_report,
+    resolve_enrich_stages,
+    run_enrich_stage,
+)
+
+
+# ----------------------------
+# Partitioned enrichment (process pool)
+# ----------------------------
+# 큰 업로드에서 행 단위 단계(위험 등급 매핑 + ROW_LOCAL_STAGES)를 행 구간(파티션)으로 나눠 프로세스 풀에서 실행합니다.
+# - 배치 기준 통계(참여도 하위 15% 분위수)는 부모에서 전체 행으로 한 번 계산해 모든 파티션에 공유
+# - 파티션은 필요한 입력 컬럼만 Arrow IPC 파일로 공유 메모리(/dev/shm)에 쓰고, 워커는 memory_map으로 읽음(DataFrame 피클 없음)
+# - 워커는 새로 만든 컬럼만 같은 방식으로 돌려주고, 부모가 직렬 경로와 같은 순서로 붙임 → 결과/컬럼 순서/dtype 동일
+# - 계수 기반 model_reasons는 배치 전체 행렬 연산이므로 부모에서 실행
+PARTITION_MIN_ROWS = 20_000
+SHM_DIR = "/dev/shm"
+
+RISK_COLUMNS = ["risk_level", "action"]
+# 행 단위 단계가 읽는 입력 컬럼 (+ 코호트 컬럼)
+INPUT_COLS = [
+    "risk_proba",
+    "assignment_count",
+    "question_count",
+    "participation_level",
+    "absence_count",
+    *SCORE_COLS,
+    *(f"{c}_missing" for c in SCORE_COLS),
+]
+PARTICIPATION_STAT_COLS = ["assignment_count", "question_count"]
+
+
+def _write_arrow(df: pd.DataFrame, path: str) -> None:
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _stage_columns(stages: Iterable[str]) -> List[str]:
+    return [c for s in stages for c in ENRICH_STAGES[s][0]]
+
+
+def _enrich_partition(
+    in_path: str,
+    out_path: str,
+    policy: EvaluationPolicy,
+    stages: List[str],
+    stats: Optional[Dict[str, Any]],
+    cohort_col: Optional[str],
+) -> None:
+    # 워커: 파티션(Arrow IPC, memory_map) → 위험 등급 + 행 단위 단계 → 새 컬럼만 Arrow IPC로 기록
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    with pa.memory_map(in_path) as src:
+        part = ipc.open_file(src).read_all().to_pandas()
+        if stats is not None:
+            share_batch_stats(part, stats)
+        part = add_risk_bands(part, policy)
+        for stage in stages:
+            part = run_enrich_stage(part, stage, policy, cohort_col=cohort_col)
+        new_cols = [c for c in [*RISK_COLUMNS, *_stage_columns(stages)] if c in part.columns]
+        _write_arrow(part[new_cols], out_path)
+
+
+def _read_arrow(path: str) -> pd.DataFrame:
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    with pa.memory_map(path) as src:
+        # 공유 메모리 파일을 지우기 전에 복사본으로 변환
+        return ipc.open_file(src).read_all().to_pandas().copy()
+
+
+def partition_count(n_rows: int, n_jobs: int, min_rows: int = PARTITION_MIN_ROWS) -> int:
+    # 파티션당 최소 min_rows행, 최대 워커 수만큼
+    return max(1, min(effective_n_jobs(n_jobs), n_rows // max(1, min_rows)))
+
+
+def enrich_partitioned(
+    df_scored: pd.DataFrame,
+    policy: EvaluationPolicy,
+    model: Any = None,
+    fields: Optional[Iterable[str]] = None,
+    cohort_col: Optional[str] = None,
+    n_jobs: int = -1,
+    min_rows: int = PARTITION_MIN_ROWS,
+) -> pd.DataFrame:
+    """
+    risk_proba가 있는 채점 결과 → risk_level/action + enrich_report 컬럼.
+    행 수가 min_rows × 2 이상이면 최대 n_jobs개 파티션을 프로세스 풀에서 처리하고,
+    그보다 작으면(또는 n_jobs=1) 같은 프로세스에서 직렬로 처리합니다. 두 경로의 결과는 같습니다.
+    """
+    stages = resolve_enrich_stages(fields)
+    n_parts = partition_count(len(df_scored), n_jobs, min_rows)
+    if n_parts <= 1:
+        return enrich_report(add_risk_bands(df_scored, policy), policy, model=model, fields=fields, cohort_col=cohort_col)
+
+    row_stages = [s for s in stages if s in ROW_LOCAL_STAGES]
+    stats = None
+    if "participation" in row_stages:
+        stats = get_batch_stats(df_scored, PARTICIPATION_STAT_COLS, cohort_col=cohort_col)
+    # 재사용한 통계가 코호트 기준이면(cohort_col 미지정) 그 코호트 컬럼도 파티션에 보냄(직렬 경로와 같은 기준)
+    cohort = cohort_col or (stats or {}).get("cohort_col")
+    inputs = [c for c in dict.fromkeys([*INPUT_COLS, cohort]) if c is not None and c in df_scored.columns]
+    bounds = np.linspace(0, len(df_scored), n_parts + 1).astype(int)
+
+    with tempfile.TemporaryDirectory(prefix="enrich_", dir=SHM_DIR if os.path.isdir(SHM_DIR) else None) as tmp:
+        paths = [
+            (os.path.join(tmp, f"in_{i}.arrow"), os.path.join(tmp, f"out_{i}.arrow")) for i in range(n_parts)
+        ]
+        for (in_path, _), start, stop in zip(paths, bounds[:-1], bounds[1:]):
+            _write_arrow(df_scored.iloc[start:stop][inputs], in_path)
+        Parallel(n_jobs=n_parts)(
+            delayed(_enrich_partition)(in_path, out_path, policy, row_stages, stats, cohort_col)
+            for in_path, out_path in paths
+        )
+        new = pd.concat([_read_arrow(out_path) for _, out_path in paths], ignore_index=True)
+
+    out = df_scored.copy()
+    new.index = out.index
+    for c in new.columns:
+        out[c] = new[c]
+    if "model_reasons" in stages:
+        out = run_enrich_stage(out, "model_reasons", policy, model=model)
+    return out
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from backend.src.batch_stats import (
+    attach_batch_stats,
+    batch_medians,
+    compute_batch_stats,
+    get_batch_stats,
+    share_batch_stats,
+)
+from backend.src.config import PARTICIPATION_LEVELS
+from backend.src.data_quality import QUALITY_ATTR, ChunkedQuality, Range, check_quality, coerce_numeric
 
 # ----------------------------
 # Schema (single fixed columns)
@@ -17,6 +27,18 @@ class Schema:
 
 SCORE_COLS = ["midterm_score", "final_score", "performance_score"]
 
+# 수치로 변환하는 입력 컬럼 (participation_level 제외)
+NUMERIC_COLS = [
+    "midterm_score",
+    "final_score",
+    "performance_score",
+    "assignment_count",
+    "question_count",
+    "night_study",
+    "absence_count",
+    "behavior_score",
+]
+
 SINGLE_SCHEMA = Schema(
     required_columns=[
         "student_id",
@@ -43,6 +65,221 @@ def save_csv(df: pd.DataFrame, path: str, encoding: str = "utf-8-sig") -> None:
     df.to_csv(path, index=False, encoding=encoding)
 
 
+# 컬럼형 입력(Parquet / Arrow IPC)은 텍스트 파싱 없이 바로 DataFrame으로 변환합니다.
+# pyarrow는 이 형식들에만 필요하므로 사용 시점에 import합니다.
+TABLE_FORMATS = ("csv", "parquet", "arrow")
+
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+_EXTENSION_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/vnd.apache.arrow.stream": "arrow",
+}
+
+FORMAT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+TableSource = Union[str, Path, IO[bytes]]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow 입출력에는 pyarrow가 필요합니다. (pip install pyarrow)") from e
+    return pyarrow
+
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None) -> str:
+    """
+    content type을 우선 사용하고, 모호하면(application/octet-stream 등) 확장자로 판단.
+    지원하지 않는 형식이면 ValueError.
+    """
+    ctype = (content_type or "").split(";")[0].strip().lower()
+    if ctype in _CONTENT_TYPE_FORMATS:
+        return _CONTENT_TYPE_FORMATS[ctype]
+
+    ext = Path(filename or "").suffix.lower()
+    if ext in _EXTENSION_FORMATS:
+        return _EXTENSION_FORMATS[ext]
+
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename or ctype} (csv/parquet/arrow)")
+
+
+def load_table(
+    source: TableSource,
+    fmt: Optional[str] = None,
+    encoding: str = "utf-8-sig",
+    nrows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    CSV / Parquet / Arrow IPC(file, stream) 로드.
+    fmt이 없으면 경로 확장자로 판단. nrows는 앞에서부터 최대 행 수.
+    """
+    if fmt is None:
+        fmt = detect_format(filename=str(source) if isinstance(source, (str, Path)) else None)
+
+    if fmt == "csv":
+        return pd.read_csv(source, encoding=encoding, nrows=nrows)
+
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(source)
+        if nrows is None:
+            table = pf.read()
+        else:
+            batches = []
+            remaining = nrows
+            for batch in pf.iter_batches():
+                batches.append(batch.slice(0, remaining))
+                remaining -= batches[-1].num_rows
+                if remaining <= 0:
+                    break
+            table = pa.Table.from_batches(batches, schema=pf.schema_arrow)
+    elif fmt == "arrow":
+        import pyarrow.ipc as ipc
+
+        # 경로면 memory map(zero-copy), 파일 객체면 버퍼로 감싸서 읽음
+        src = pa.memory_map(str(source), "r") if isinstance(source, (str, Path)) else pa.PythonFile(source, mode="r")
+        try:
+            table = ipc.open_file(src).read_all()
+        except pa.ArrowInvalid:
+            src.seek(0)
+            table = ipc.open_stream(src).read_all()
+        if nrows is not None:
+            table = table.slice(0, nrows)
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt}")
+
+    return table.to_pandas()
+
+
+def iter_table_chunks(
+    path: TableSource,
+    fmt: Optional[str] = None,
+    chunksize: int = 50_000,
+    encoding: str = "utf-8-sig",
+) -> Iterator[pd.DataFrame]:
+    """
+    CSV / Parquet / Arrow IPC 파일을 chunksize 행 단위 DataFrame으로 순회(전체를 메모리에 올리지 않음).
+    Arrow는 파일에 기록된 record batch 단위로 반환.
+    파일 객체(업로드 임시 파일 등)도 받으며, 매번 처음부터 읽습니다.
+    """
+    is_path = isinstance(path, (str, Path))
+    if fmt is None:
+        fmt = detect_format(filename=str(path) if is_path else None)
+    if not is_path:
+        path.seek(0)
+
+    if fmt == "csv":
+        with pd.read_csv(path, encoding=encoding, chunksize=chunksize) as reader:
+            yield from reader
+        return
+
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(str(path) if is_path else path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif fmt == "arrow":
+        import pyarrow.ipc as ipc
+
+        src = pa.memory_map(str(path), "r") if is_path else pa.PythonFile(path, mode="r")
+        try:
+            reader = ipc.open_file(src)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            src.seek(0)
+            batches = ipc.open_stream(src)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt}")
+
+
+def table_columns(source: TableSource, fmt: Optional[str] = None, encoding: str = "utf-8-sig") -> List[str]:
+    # 데이터 행을 읽지 않고 컬럼명만 (CSV 헤더 / Parquet·Arrow 스키마)
+    is_path = isinstance(source, (str, Path))
+    if fmt is None:
+        fmt = detect_format(filename=str(source) if is_path else None)
+    if not is_path:
+        source.seek(0)
+    try:
+        if fmt == "csv":
+            return [str(c) for c in pd.read_csv(source, encoding=encoding, nrows=0).columns]
+        pa = _require_pyarrow()
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            return list(pq.ParquetFile(str(source) if is_path else source).schema_arrow.names)
+        if fmt == "arrow":
+            import pyarrow.ipc as ipc
+
+            src = pa.memory_map(str(source), "r") if is_path else pa.PythonFile(source, mode="r")
+            try:
+                return list(ipc.open_file(src).schema.names)
+            except pa.ArrowInvalid:
+                src.seek(0)
+                return list(ipc.open_stream(src).schema.names)
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt}")
+    finally:
+        if not is_path:
+            source.seek(0)
+
+
+def save_table(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    encoding: str = "utf-8-sig",
+) -> None:
+    """
+    CSV / Parquet / Arrow IPC(file) 저장. fmt이 없으면 경로 확장자로 판단.
+    """
+    if fmt is None:
+        fmt = detect_format(filename=str(path))
+
+    if fmt == "csv":
+        save_csv(df, str(path), encoding=encoding)
+        return
+
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, str(path))
+    elif fmt == "arrow":
+        import pyarrow.ipc as ipc
+
+        with ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt}")
+
+
 # ----------------------------
 # Validation & Cleaning
 # ----------------------------
@@ -57,41 +294,67 @@ def validate_schema(
         raise ValueError(f"Missing required columns: {missing}")
 
 
-def basic_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+def _exact_duplicates(df: pd.DataFrame, id_col: str = "student_id") -> np.ndarray:
+    # 완전히 같은 행(첫 행 제외) 마스크. 같은 행이면 student_id도 같으므로 id가 겹치는 행끼리만 비교
+    if id_col not in df.columns:
+        return df.duplicated().to_numpy()
+    candidates = df[id_col].duplicated(keep=False).to_numpy()
+    dup = np.zeros(len(df), dtype=bool)
+    if candidates.any():
+        dup[candidates] = df[candidates].duplicated().to_numpy()
+    return dup
+
+
+def basic_cleaning(
+    df: pd.DataFrame,
+    value_ranges: Optional[Dict[str, Range]] = None,
+) -> pd.DataFrame:
     """
     - Strip column names
+    - Check data quality in one pass (df.attrs["data_quality"])
     - Drop duplicates
     - Coerce numeric columns to numeric (errors->NaN)
     - Keep participation_level as string/category
     """
+    out = _strip_columns(df)
+
+    # 품질 검사와 수치 변환을 한 번에 (행 번호는 중복 제거 전 업로드 기준)
+    coerced, quality = check_quality(out, NUMERIC_COLS, value_ranges)
+
+    out = _apply_cleaning(out, coerced, ~_exact_duplicates(out))
+    out.attrs[QUALITY_ATTR] = quality
+    return out
+
+
+def _strip_columns(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
     out.columns = [c.strip() for c in out.columns]
-    out = out.drop_duplicates()
+    return out
 
-    # numeric cols (participation_level 제외)
-    numeric_cols = [
-        "midterm_score",
-        "final_score",
-        "performance_score",
-        "assignment_count",
-        "question_count",
-        "night_study",
-        "absence_count",
-        "behavior_score",
-    ]
-    for c in numeric_cols:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
 
-    # participation_level normalize (strip)
+def _apply_cleaning(out: pd.DataFrame, coerced: Dict[str, pd.Series], keep: np.ndarray) -> pd.DataFrame:
+    # 중복 행 제거 + 수치 변환 값 반영 + participation_level 정리(strip)
+    out = out[keep]
+    for c, values in coerced.items():
+        out[c] = values[keep]
+
     if "participation_level" in out.columns:
         out["participation_level"] = (
             out["participation_level"].astype(str).str.strip()
         )
-
     return out
 
 
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    # 청크 간 완전 중복 행 판정용 행 해시. 청크마다 dtype 추론이 달라도(정수/결측 섞인 실수)
+    # 같은 값이면 같은 해시가 되도록 수치 컬럼은 float64로 맞춥니다.
+    norm = pd.DataFrame({
+        c: df[c].astype("float64") if pd.api.types.is_numeric_dtype(df[c]) else df[c].astype(str).where(df[c].notna())
+        for c in df.columns
+    })
+    return pd.util.hash_pandas_object(norm, index=False).to_numpy()
+
+
 def add_missing_flags(
     df: pd.DataFrame,
     cols: Optional[List[str]] = None,
@@ -125,7 +388,7 @@ def encode_participation_level(
     원본(col)은 유지.
     """
     if mapping is None:
-        mapping = {"상": 2, "중": 1, "하": 0}
+        mapping = PARTICIPATION_LEVELS
 
     out = df.copy()
     if col not in out.columns:
@@ -136,41 +399,62 @@ def encode_participation_level(
     return out
 
 
+def fit_fill_values(
+    df: pd.DataFrame,
+    numeric_strategy: str = "median",
+    numeric_cols: Optional[List[str]] = None,
+    all_nan_fill_value: float = 0.0,
+) -> Dict[str, float]:
+    """
+    fill_missing에 고정값으로 넘길 컬럼별 채움 값(median/mean, 전부 NaN이면 fallback)을 계산.
+    청크 단위 학습처럼 배치마다 통계가 달라지면 안 될 때 사용.
+    """
+    if numeric_cols is None:
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    cols = [c for c in numeric_cols if c in df.columns]
+
+    if numeric_strategy == "median":
+        values = df[cols].median()
+    elif numeric_strategy == "mean":
+        values = df[cols].mean()
+    else:
+        raise ValueError("numeric_strategy must be 'median' or 'mean'")
+    return {c: float(v) for c, v in values.fillna(all_nan_fill_value).items()}
+
+
 def fill_missing(
     df: pd.DataFrame,
     numeric_strategy: str = "median",
     numeric_cols: Optional[List[str]] = None,
     all_nan_fill_value: float = 0.0,
+    fill_values: Optional[Dict[str, float]] = None,
 ) -> pd.DataFrame:
     """
     Fill missing values for numeric columns using median/mean.
     If a column is ALL-NaN (e.g., final_score in midterm snapshot),
     fill it with a constant fallback (default=0.0).
+    fill_values가 있으면 해당 컬럼은 배치 통계 대신 고정값으로 채움(fit_fill_values 결과).
     """
     out = df.copy()
 
     if numeric_cols is None:
         numeric_cols = out.select_dtypes(include=[np.number]).columns.tolist()
+    cols = [c for c in numeric_cols if c in out.columns]
 
-    for col in numeric_cols:
-        if col not in out.columns:
-            continue
+    # 컬럼별 통계는 한 번에 계산(통계 단계 캐시가 있으면 재사용)
+    if numeric_strategy == "median":
+        values = batch_medians(out, cols)
+    elif numeric_strategy == "mean":
+        values = {c: float(v) for c, v in out[cols].mean().items()}
+    else:
+        raise ValueError("numeric_strategy must be 'median' or 'mean'")
 
-        # 전부 NaN이면 median/mean도 NaN이므로 fallback 사용
-        if out[col].isna().all():
-            out[col] = out[col].fillna(all_nan_fill_value)
-            continue
+    if fill_values is not None:
+        values.update({c: fill_values[c] for c in cols if c in fill_values})
 
-        if numeric_strategy == "median":
-            value = out[col].median()
-        elif numeric_strategy == "mean":
-            value = out[col].mean()
-        else:
-            raise ValueError("numeric_strategy must be 'median' or 'mean'")
-
-        out[col] = out[col].fillna(value)
-
-    return out
+    # 전부 NaN이면 median/mean도 NaN이므로 fallback 사용
+    values = {c: (all_nan_fill_value if pd.isna(v) else v) for c, v in values.items()}
+    return out.fillna(values)
 
 
 def clip_outliers_iqr(
@@ -182,11 +466,12 @@ def clip_outliers_iqr(
     if cols is None:
         cols = out.select_dtypes(include=[np.number]).columns.tolist()
 
+    cols = [c for c in cols if c in out.columns]
+    stats = get_batch_stats(out, cols, quantiles=(0.25, 0.75))
+
     for col in cols:
-        if col not in out.columns:
-            continue
-        q1 = out[col].quantile(0.25)
-        q3 = out[col].quantile(0.75)
+        q1 = stats["quantiles"]["0.25"][col]
+        q3 = stats["quantiles"]["0.75"][col]
         iqr = q3 - q1
         low = q1 - k * iqr
         high = q3 + k * iqr
@@ -290,37 +575,70 @@ def prepare_features(
 # ----------------------------
 # Pipeline
 # ----------------------------
-def preprocess_pipeline(
+def _clean_and_encode(
     df: pd.DataFrame,
     schema: Schema = SINGLE_SCHEMA,
-    numeric_strategy: str = "median",
-    clip_outliers: bool = False,
     encode_participation: bool = True,
-    add_labels: bool = False,
-    weights: Optional[Dict[str, float]] = None,
-    total_sessions: int = 30,
-    absence_fraction: float = 1 / 3,
+    value_ranges: Optional[Dict[str, Range]] = None,
 ) -> pd.DataFrame:
-    """
-    단일 스키마 대응 파이프라인.
-
-    - 결측 점수(final_score 등)는 계산 시 자동 제외 가능(achievement_rate)
-    - participation_level은 participation_level_num으로 인코딩(기본 on)
-    - 필요 시 at_risk 라벨 생성(add_labels=True)
-    """
+    # 결측 채우기 이전 단계(검증/정리/결측 플래그/인코딩)
     validate_schema(df, schema=schema, optional_columns=SCORE_COLS)
-    out = basic_cleaning(df)
+    out = basic_cleaning(df, value_ranges=value_ranges)
+    return _flag_and_encode(out, encode_participation)
 
+
+def _flag_and_encode(out: pd.DataFrame, encode_participation: bool = True) -> pd.DataFrame:
     out = add_missing_flags(out, cols=SCORE_COLS)
 
     if encode_participation:
         out = encode_participation_level(out)
+    return out
+
+
+def fit_preprocess_stats(
+    df: pd.DataFrame,
+    schema: Schema = SINGLE_SCHEMA,
+    numeric_strategy: str = "median",
+    encode_participation: bool = True,
+) -> Dict[str, float]:
+    """
+    표본(df)으로 preprocess_pipeline(fill_values=...)에 넘길 고정 결측 채움 값을 계산.
+    """
+    out = _clean_and_encode(df, schema=schema, encode_participation=encode_participation)
+    return fit_fill_values(out, numeric_strategy=numeric_strategy)
+
 
+def _impute_and_derive(
+    out: pd.DataFrame,
+    numeric_strategy: str = "median",
+    clip_outliers: bool = False,
+    add_labels: bool = False,
+    weights: Optional[Dict[str, float]] = None,
+    total_sessions: int = 30,
+    absence_fraction: float = 1 / 3,
+    fill_values: Optional[Dict[str, float]] = None,
+    cohort_col: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    clip_stats: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    # 결측 채움 이후 단계(통계/클리핑/성취율/라벨)
     # numeric 결측 채우기 (모델 입력/EDA 편의)
-    out = fill_missing(out, numeric_strategy=numeric_strategy)
+    out = fill_missing(out, numeric_strategy=numeric_strategy, fill_values=fill_values)
+
+    # 통계 단계: 채운 값 기준으로 한 번 계산해 이후 클리핑/참여도 플래그가 재사용
+    # (stats/clip_stats가 있으면 전체 배치에서 미리 계산한 통계를 공유 → 청크별로 다시 계산하지 않음)
+    if stats is not None:
+        out = share_batch_stats(out, clip_stats if clip_outliers and clip_stats is not None else stats)
+    else:
+        out = attach_batch_stats(out, cohort_col=cohort_col)
 
     if clip_outliers:
         out = clip_outliers_iqr(out)
+        # 참여도 분위수 등 이후 단계는 클리핑된 값 기준
+        if stats is not None:
+            out = share_batch_stats(out, stats)
+        else:
+            out = attach_batch_stats(out, cohort_col=cohort_col)
 
     # 성취율/라벨은 선택
     out = compute_achievement_rate(out, weights=weights)
@@ -332,3 +650,163 @@ def preprocess_pipeline(
         )
 
     return out
+
+
+def preprocess_pipeline(
+    df: pd.DataFrame,
+    schema: Schema = SINGLE_SCHEMA,
+    numeric_strategy: str = "median",
+    clip_outliers: bool = False,
+    encode_participation: bool = True,
+    add_labels: bool = False,
+    weights: Optional[Dict[str, float]] = None,
+    total_sessions: int = 30,
+    absence_fraction: float = 1 / 3,
+    fill_values: Optional[Dict[str, float]] = None,
+    cohort_col: Optional[str] = None,
+    value_ranges: Optional[Dict[str, Range]] = None,
+) -> pd.DataFrame:
+    """
+    단일 스키마 대응 파이프라인.
+
+    - 결측 점수(final_score 등)는 계산 시 자동 제외 가능(achievement_rate)
+    - participation_level은 participation_level_num으로 인코딩(기본 on)
+    - 필요 시 at_risk 라벨 생성(add_labels=True)
+    - fill_values(fit_preprocess_stats 결과)를 주면 결측 채움에 고정 통계 사용
+    - 배치 통계(median/분위수)는 결측 채움 후 한 번 계산해 df.attrs에 캐시
+      (cohort_col을 주면 코호트별 분위수 포함 → 참여도 플래그가 코호트 기준)
+    - 데이터 품질 요약(비수치/범위 밖/알 수 없는 참여도/중복 student_id)은 df.attrs["data_quality"]
+      (value_ranges: 허용 범위, 기본 config.VALUE_RANGES)
+    """
+    out = _clean_and_encode(
+        df, schema=schema, encode_participation=encode_participation, value_ranges=value_ranges
+    )
+    return _impute_and_derive(
+        out,
+        numeric_strategy=numeric_strategy,
+        clip_outliers=clip_outliers,
+        add_labels=add_labels,
+        weights=weights,
+        total_sessions=total_sessions,
+        absence_fraction=absence_fraction,
+        fill_values=fill_values,
+        cohort_col=cohort_col,
+    )
+
+
+@dataclass
+class ChunkPlan:
+    """
+    청크 전처리에 공유하는 전체 배치 기준 값(fit_chunk_plan 결과).
+    keep: 업로드 행마다 중복 제거 후 남는지, fill_values: 결측 채움 값,
+    stats: 채운(클리핑한) 값 기준 배치 통계, clip_stats: 클리핑 전 통계(IQR 경계), quality: 품질 요약
+    """
+    keep: np.ndarray
+    fill_values: Dict[str, float]
+    stats: Dict[str, Any]
+    clip_stats: Optional[Dict[str, Any]]
+    quality: Dict[str, Any]
+    columns: List[str]
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.keep)
+
+
+def fit_chunk_plan(
+    chunks: Iterable[pd.DataFrame],
+    schema: Schema = SINGLE_SCHEMA,
+    numeric_strategy: str = "median",
+    clip_outliers: bool = False,
+    encode_participation: bool = True,
+    fill_values: Optional[Dict[str, float]] = None,
+    cohort_col: Optional[str] = None,
+    value_ranges: Optional[Dict[str, Range]] = None,
+) -> ChunkPlan:
+    """
+    1차 순회: 원본 청크를 차례로 읽어 전체 배치 기준 값(중복 행, 품질 요약, 결측 채움 값, 배치 통계)을 계산.
+    메모리에는 행 해시/student_id와 수치 컬럼(+ 코호트 컬럼)만 남기고 원본 청크는 버립니다.
+    """
+    quality = ChunkedQuality(NUMERIC_COLS, value_ranges)
+    hashes: List[np.ndarray] = []
+    numeric_parts: List[pd.DataFrame] = []
+    columns: Optional[List[str]] = None
+    for raw in chunks:
+        chunk = _strip_columns(raw)
+        if columns is None:
+            validate_schema(chunk, schema=schema, optional_columns=SCORE_COLS)
+            if cohort_col is not None and cohort_col not in chunk.columns:
+                raise ValueError(f"코호트 컬럼이 없습니다: {cohort_col}")
+            columns = list(chunk.columns)
+        coerced = quality.add(chunk)
+        hashes.append(_row_hashes(chunk))
+        cleaned = _flag_and_encode(_apply_cleaning(chunk, coerced, np.ones(len(chunk), dtype=bool)), encode_participation)
+        num_cols = cleaned.select_dtypes(include=[np.number]).columns.tolist()
+        if cohort_col is not None and cohort_col not in num_cols:
+            num_cols.append(cohort_col)
+        numeric_parts.append(cleaned[num_cols].reset_index(drop=True))
+
+    if columns is None:
+        raise ValueError("업로드에 데이터가 없습니다.")
+    keep = ~pd.Series(np.concatenate(hashes)).duplicated().to_numpy()
+    numeric = pd.concat(numeric_parts, ignore_index=True)[keep]
+    del numeric_parts
+
+    fills = {**fit_fill_values(numeric, numeric_strategy=numeric_strategy), **(fill_values or {})}
+    numeric = fill_missing(numeric, fill_values=fills)
+    clip_stats = None
+    if clip_outliers:
+        # IQR 경계도 전체 배치(채운 값) 기준
+        clip_stats = compute_batch_stats(numeric, cohort_col=cohort_col)
+        numeric = clip_outliers_iqr(share_batch_stats(numeric, clip_stats))
+    stats = compute_batch_stats(numeric, cohort_col=cohort_col)
+    return ChunkPlan(keep, fills, stats, clip_stats, quality.summary(), columns)
+
+
+def preprocess_planned_chunk(
+    raw: pd.DataFrame,
+    plan: ChunkPlan,
+    row_offset: int,
+    encode_participation: bool = True,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    2차 순회: 원본 청크(업로드 row_offset행부터) → plan의 중복 제거/결측 채움/통계를 공유해 전처리.
+    kwargs는 preprocess_pipeline의 파생 단계 옵션(clip_outliers/add_labels/weights 등).
+    """
+    chunk = _strip_columns(raw)
+    coerced = {c: coerce_numeric(chunk[c])[0] for c in NUMERIC_COLS if c in chunk.columns}
+    keep = plan.keep[row_offset:row_offset + len(chunk)]
+    out = _flag_and_encode(_apply_cleaning(chunk, coerced, keep), encode_participation)
+    kwargs.pop("numeric_strategy", None)
+    kwargs.pop("fill_values", None)
+    out = _impute_and_derive(out, fill_values=plan.fill_values, stats=plan.stats, clip_stats=plan.clip_stats, **kwargs)
+    out.attrs[QUALITY_ATTR] = plan.quality
+    return out
+
+
+def preprocess_chunks(
+    df: pd.DataFrame,
+    chunk_rows: int,
+    schema: Schema = SINGLE_SCHEMA,
+    cohort_col: Optional[str] = None,
+    value_ranges: Optional[Dict[str, Range]] = None,
+    **kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    preprocess_pipeline과 같은 결과를 chunk_rows 행 단위로 나눠 반환(큰 업로드의 최대 메모리 절감).
+    정리/중복 제거, 결측 채움 값, 배치 통계(채운 값 기준)는 전체 행 기준으로 한 번만 계산하고, 각 청크에 공유합니다.
+    """
+    if df.empty:
+        return
+    step = max(1, chunk_rows)
+    plan_keys = ("numeric_strategy", "clip_outliers", "encode_participation", "fill_values")
+    plan = fit_chunk_plan(
+        (df.iloc[start:start + step] for start in range(0, len(df), step)),
+        schema=schema,
+        cohort_col=cohort_col,
+        value_ranges=value_ranges,
+        **{k: kwargs[k] for k in plan_keys if k in kwargs},
+    )
+    for start in range(0, len(df), step):
+        yield preprocess_planned_chunk(df.iloc[start:start + step], plan, start, **kwargs)
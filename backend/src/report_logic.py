@@ -3,15 +3,47 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from math import floor
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from backend.src.batch_stats import get_batch_stats, row_quantile
+from backend.src.config import FEATURE_COLS, FEATURE_LABELS, RISK_BANDS
 
 
 # -----------------------------
 # Policy
 # -----------------------------
+@dataclass(frozen=True)
+class RiskBand:
+    level: str
+    min_proba: float  # 위험 확률이 이 값 이상이면 해당 등급
+    action: str
+
+
+def _to_risk_bands(raw: Iterable[Any]) -> Tuple[RiskBand, ...]:
+    # RiskBand 또는 dict 목록 → min_proba 내림차순(높은 등급부터) RiskBand 튜플
+    bands = []
+    for item in raw:
+        if isinstance(item, RiskBand):
+            bands.append(item)
+            continue
+        if not isinstance(item, dict):
+            raise ValueError("risk_bands 항목은 {level, min_proba, action} 객체여야 합니다.")
+        missing = [k for k in ("level", "min_proba", "action") if k not in item]
+        if missing:
+            raise ValueError(f"risk_bands 항목 누락 키: {missing}")
+        try:
+            min_proba = float(item["min_proba"])
+        except (TypeError, ValueError):
+            raise ValueError(f"risk_bands min_proba는 숫자여야 합니다: {item['min_proba']!r}") from None
+        bands.append(RiskBand(level=str(item["level"]).strip(), min_proba=min_proba, action=str(item["action"])))
+    return tuple(sorted(bands, key=lambda b: b.min_proba, reverse=True))
+
+
 @dataclass(frozen=True)
 class EvaluationPolicy:
     threshold: float
@@ -22,6 +54,12 @@ class EvaluationPolicy:
     performance_max: float
     performance_weight: float  # percent (0~100)
     total_classes: int
+    risk_bands: Optional[Tuple[RiskBand, ...]] = None  # 위험 등급 구간(선택). 없으면 config.RISK_BANDS
+
+    def __post_init__(self):
+        # 저장된 정책(JSON의 dict 목록)으로 다시 만들 때도 RiskBand 튜플로 맞춤
+        if self.risk_bands is not None:
+            object.__setattr__(self, "risk_bands", _to_risk_bands(self.risk_bands))
 
 
 def parse_policy_json(policy_json: str) -> EvaluationPolicy:
@@ -53,11 +91,36 @@ def parse_policy_json(policy_json: str) -> EvaluationPolicy:
         performance_max=float(raw["performance_max"]),
         performance_weight=float(raw["performance_weight"]),
         total_classes=int(raw["total_classes"]),
+        risk_bands=_parse_risk_bands(raw.get("risk_bands")),
     )
     validate_policy(policy)
     return policy
 
 
+def _parse_risk_bands(raw: Any) -> Optional[Tuple[RiskBand, ...]]:
+    if raw is None:
+        return None
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("risk_bands는 비어 있지 않은 배열이어야 합니다.")
+    return _to_risk_bands(raw)
+
+
+def validate_risk_bands(bands: Tuple[RiskBand, ...]) -> None:
+    levels = [b.level for b in bands]
+    if any(not lvl for lvl in levels):
+        raise ValueError("risk_bands level은 빈 문자열일 수 없습니다.")
+    if len(set(levels)) != len(levels):
+        raise ValueError(f"risk_bands level이 중복됩니다: {levels}")
+    mins = [b.min_proba for b in bands]
+    if any(not (0.0 <= m <= 1.0) for m in mins):
+        raise ValueError("risk_bands min_proba는 0~1 사이여야 합니다.")
+    if len(set(mins)) != len(mins):
+        raise ValueError(f"risk_bands min_proba가 중복됩니다: {mins}")
+    # 가장 낮은 구간이 0부터 시작해야 모든 확률이 어느 등급에 속함
+    if min(mins) != 0.0:
+        raise ValueError("risk_bands 중 하나는 min_proba가 0이어야 합니다.")
+
+
 def validate_policy(p: EvaluationPolicy) -> None:
     # threshold
     if not (0.0 < p.threshold < 1.0):
@@ -90,50 +153,65 @@ def validate_policy(p: EvaluationPolicy) -> None:
     if p.total_classes <= 0:
         raise ValueError("total_classes는 1 이상의 정수여야 합니다.")
 
+    if p.risk_bands is not None:
+        validate_risk_bands(p.risk_bands)
+
 
 # -----------------------------
 # Utilities
 # -----------------------------
-def assign_risk_level(prob: float) -> str:
-    if prob >= 0.70:
-        return "High"
-    if prob >= 0.40:
-        return "Medium"
-    return "Low"
+def policy_risk_bands(policy: Optional[EvaluationPolicy]) -> Tuple[RiskBand, ...]:
+    if policy is not None and policy.risk_bands is not None:
+        return policy.risk_bands
+    return _to_risk_bands(RISK_BANDS)
 
 
-def assign_action(level: str) -> str:
-    if level == "High":
-        return "즉시 상담 및 보충학습 개입 필요"
-    if level == "Medium":
-        return "과제 참여 모니터링 및 사전 지도"
-    return "일반 관찰 유지"
+def assign_risk_bands(proba: Any, bands: Tuple[RiskBand, ...]) -> Tuple[pd.Categorical, pd.Categorical]:
+    """
+    위험 확률 → (risk_level, action) Categorical. searchsorted 한 번으로 전체 행의 구간을 찾음.
+    구간 하한 이상이면 해당 등급, NaN은 가장 낮은 등급.
+    카테고리 순서는 높은 등급부터(bands 순서)입니다.
+    """
+    mins = np.array([b.min_proba for b in reversed(bands)])  # 오름차순
+    p = np.asarray(proba, dtype=float)
+    idx = np.searchsorted(mins, p, side="right") - 1
+    idx = np.where(np.isnan(p) | (idx < 0), 0, idx)
+    codes = len(bands) - 1 - idx  # bands(내림차순) 기준 번호
+
+    actions = list(dict.fromkeys(b.action for b in bands))
+    action_codes = np.array([actions.index(b.action) for b in bands])[codes]
+    return (
+        pd.Categorical.from_codes(codes, categories=[b.level for b in bands]),
+        pd.Categorical.from_codes(action_codes, categories=actions),
+    )
 
 
-def _clamp_score(x: float, smax: float) -> float:
-    if x < 0:
-        return 0.0
-    if x > smax:
-        return float(smax)
-    return float(x)
+def add_risk_bands(df: pd.DataFrame, policy: Optional[EvaluationPolicy] = None) -> pd.DataFrame:
+    # risk_proba → risk_level / action (정책 risk_bands, 없으면 기본 구간)
+    out = df.copy()
+    out["risk_level"], out["action"] = assign_risk_bands(out["risk_proba"], policy_risk_bands(policy))
+    return out
 
 
-def add_participation_flags(df: pd.DataFrame) -> pd.DataFrame:
+def add_participation_flags(df: pd.DataFrame, cohort_col: Optional[str] = None) -> pd.DataFrame:
     """
     참여도 종합 점수:
     - 과제 제출 하위 15%: +1
     - 질문 횟수 하위 15%: +1
     - participation_level == '하': +2
     => 합 >= 2면 participation_flag=1
+    하위 15% 기준은 배치 통계(df.attrs) 재사용, cohort_col이 있으면 코호트(반/학년)별 기준
     """
     out = df.copy()
-    q_assign = out["assignment_count"].quantile(0.15)
-    q_question = out["question_count"].quantile(0.15)
-
-    out["participation_risk_score"] = 0
-    out.loc[out["assignment_count"] <= q_assign, "participation_risk_score"] += 1
-    out.loc[out["question_count"] <= q_question, "participation_risk_score"] += 1
-    out.loc[out["participation_level"] == "하", "participation_risk_score"] += 2
+    stats = get_batch_stats(out, ["assignment_count", "question_count"], cohort_col=cohort_col)
+    q_assign = row_quantile(out, stats, "assignment_count", 0.15)
+    q_question = row_quantile(out, stats, "question_count", 0.15)
+
+    out["participation_risk_score"] = (
+        (out["assignment_count"] <= q_assign).astype(int)
+        + (out["question_count"] <= q_question).astype(int)
+        + (out["participation_level"] == "하").astype(int) * 2
+    )
     out["participation_flag"] = (out["participation_risk_score"] >= 2).astype(int)
     return out
 
@@ -147,7 +225,63 @@ def add_absence_allowance(df: pd.DataFrame, policy: EvaluationPolicy) -> pd.Data
     return out
 
 
-def add_score_guidance(df: pd.DataFrame, policy: EvaluationPolicy) -> pd.DataFrame:
+# 점수 안내 문구 템플릿 (guidance_code -> 문구)
+# {final_max}/{performance_max}는 정책 값, {required_final_score}/{required_performance_score}는 행 값(소수 1자리)
+GUIDANCE_TEMPLATES: Dict[str, str] = {
+    "no_midterm": "중간고사 점수 정보가 없어 성취율 역산 안내를 제공할 수 없습니다.",
+    "met": "현재 입력된 점수 기준으로 성취율 40% 기준을 충족합니다.",
+    "need_final": "기말고사에서 최소 {required_final_score}점(/{final_max}) 이상 필요합니다.",
+    "need_performance": "수행평가에서 최소 {required_performance_score}점(/{performance_max}) 이상 필요합니다.",
+    "scenario": (
+        "[시나리오] 수행 만점 가정 시 기말 최소 {required_final_score}점(/{final_max}) 필요 / "
+        "기말 만점 가정 시 수행 최소 {required_performance_score}점(/{performance_max}) 필요"
+    ),
+    "below": "현재 입력된 점수 기준으로 성취율 40% 미달입니다.",
+}
+
+GUIDANCE_COLUMNS = ["guidance_code", "required_final_score", "required_performance_score"]
+
+
+def guidance_templates(policy: EvaluationPolicy) -> Dict[str, str]:
+    """
+    정책 값(만점)을 채운 템플릿 표. 행 값 자리표시자만 남기므로
+    클라이언트는 guidance_code + required_* 컬럼만으로 문구를 만들 수 있음.
+    """
+    consts = {"final_max": f"{policy.final_max:.0f}", "performance_max": f"{policy.performance_max:.0f}"}
+    return {
+        code: template.replace("{final_max}", consts["final_max"]).replace(
+            "{performance_max}", consts["performance_max"]
+        )
+        for code, template in GUIDANCE_TEMPLATES.items()
+    }
+
+
+def _flag(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int) == 1
+
+
+def _score(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce")
+
+
+def _required_score(needed: pd.Series, weight: float, smax: float) -> pd.Series:
+    # 부족한 성취율(needed)을 채우는 데 필요한 점수, 0~만점으로 제한
+    if weight <= 0:
+        return pd.Series(float(smax), index=needed.index)
+    return (needed / weight * smax).clip(lower=0.0, upper=float(smax))
+
+
+def add_score_guidance(df: pd.DataFrame, policy: EvaluationPolicy, with_text: bool = True) -> pd.DataFrame:
+    """
+    성취율 역산 안내를 구조화 컬럼으로 추가(행 단위 apply 없이 벡터 연산).
+    - guidance_code: GUIDANCE_TEMPLATES 키
+    - required_final_score / required_performance_score: 필요한 최소 점수(해당 없으면 NaN)
+    with_text=True면 문구(score_guidance)도 함께 생성. False면 문구는 format_score_guidance로 나중에 생성.
+    """
     out = df.copy()
 
     T = policy.threshold
@@ -155,62 +289,76 @@ def add_score_guidance(df: pd.DataFrame, policy: EvaluationPolicy) -> pd.DataFra
     wf = policy.final_weight / 100.0
     wp = policy.performance_weight / 100.0
 
-    mmax = policy.midterm_max
-    fmax = policy.final_max
-    pmax = policy.performance_max
-
-    def _guidance(row: pd.Series) -> str:
-        mid = pd.to_numeric(row.get("midterm_score"), errors="coerce")
-        fin = pd.to_numeric(row.get("final_score"), errors="coerce")
-        perf = pd.to_numeric(row.get("performance_score"), errors="coerce")
+    mid = _score(out, "midterm_score")
+    fin = _score(out, "final_score")
+    perf = _score(out, "performance_score")
 
-        mid_miss = int(row.get("midterm_score_missing", 0)) == 1
-        fin_miss = int(row.get("final_score_missing", 0)) == 1
-        perf_miss = int(row.get("performance_score_missing", 0)) == 1
+    mid_miss = _flag(out, "midterm_score_missing") | mid.isna()
+    fin_miss = _flag(out, "final_score_missing")
+    perf_miss = _flag(out, "performance_score_missing")
 
-        if mid_miss or pd.isna(mid):
-            return "중간고사 점수 정보가 없어 성취율 역산 안내를 제공할 수 없습니다."
+    base = (mid / policy.midterm_max) * wm
+    base = base + ((fin / policy.final_max) * wf).where(~fin_miss & fin.notna(), 0.0)
+    base = base + ((perf / policy.performance_max) * wp).where(~perf_miss & perf.notna(), 0.0)
 
-        base = (mid / mmax) * wm
-        if (not fin_miss) and pd.notna(fin):
-            base += (fin / fmax) * wf
-        if (not perf_miss) and pd.notna(perf):
-            base += (perf / pmax) * wp
-
-        if base >= T:
-            return "현재 입력된 점수 기준으로 성취율 40% 기준을 충족합니다."
-
-        needed = T - base
+    conditions = [
+        mid_miss,
+        base >= T,
+        fin_miss & ~perf_miss,
+        perf_miss & ~fin_miss,
+        fin_miss & perf_miss,
+    ]
+    codes = ["no_midterm", "met", "need_final", "need_performance", "scenario"]
+    code = pd.Series(np.select(conditions, codes, default="below"), index=out.index)
+
+    needed = T - base
+    # 시나리오: 다른 하나를 만점으로 가정했을 때 부족분
+    req_final = _required_score(needed, wf, policy.final_max).where(code == "need_final")
+    req_final = req_final.fillna(
+        _required_score((needed - wp).clip(lower=0.0), wf, policy.final_max).where(code == "scenario")
+    )
+    req_perf = _required_score(needed, wp, policy.performance_max).where(code == "need_performance")
+    req_perf = req_perf.fillna(
+        _required_score((needed - wf).clip(lower=0.0), wp, policy.performance_max).where(code == "scenario")
+    )
 
-        if fin_miss and (not perf_miss):
-            req_final = (needed / wf) * fmax if wf > 0 else float("inf")
-            req_final = _clamp_score(req_final, fmax)
-            return f"기말고사에서 최소 {req_final:.1f}점(/{fmax:.0f}) 이상 필요합니다."
+    out["guidance_code"] = code
+    out["required_final_score"] = req_final.round(1)
+    out["required_performance_score"] = req_perf.round(1)
+    if with_text:
+        out["score_guidance"] = format_score_guidance(out, policy)
+    return out
 
-        if perf_miss and (not fin_miss):
-            req_perf = (needed / wp) * pmax if wp > 0 else float("inf")
-            req_perf = _clamp_score(req_perf, pmax)
-            return f"수행평가에서 최소 {req_perf:.1f}점(/{pmax:.0f}) 이상 필요합니다."
 
-        if fin_miss and perf_miss:
-            base_perf_full = base + (1.0 * wp)
-            needed_final = max(0.0, T - base_perf_full)
-            req_final = (needed_final / wf) * fmax if wf > 0 else float("inf")
-            req_final = _clamp_score(req_final, fmax)
+def format_score_guidance(df: pd.DataFrame, policy: EvaluationPolicy) -> pd.Series:
+    """
+    구조화 컬럼(GUIDANCE_COLUMNS) → 안내 문구. 숫자 없는 코드는 템플릿을 그대로 매핑하고,
+    숫자가 있는 코드의 행만 문자열 포맷팅함.
+    """
+    templates = guidance_templates(policy)
+    text = df["guidance_code"].map(templates)
 
-            base_final_full = base + (1.0 * wf)
-            needed_perf = max(0.0, T - base_final_full)
-            req_perf = (needed_perf / wp) * pmax if wp > 0 else float("inf")
-            req_perf = _clamp_score(req_perf, pmax)
+    def _fmt(v: Any) -> str:
+        return "" if pd.isna(v) else f"{v:.1f}"
 
-            return (
-                f"[시나리오] 수행 만점 가정 시 기말 최소 {req_final:.1f}점(/{fmax:.0f}) 필요 / "
-                f"기말 만점 가정 시 수행 최소 {req_perf:.1f}점(/{pmax:.0f}) 필요"
-            )
+    numeric = df["guidance_code"].isin(["need_final", "need_performance", "scenario"])
+    rows = df.loc[numeric, GUIDANCE_COLUMNS]
+    text.loc[numeric] = [
+        templates[c].format(required_final_score=_fmt(f), required_performance_score=_fmt(p))
+        for c, f, p in rows.itertuples(index=False, name=None)
+    ]
+    return text
 
-        return "현재 입력된 점수 기준으로 성취율 40% 미달입니다."
 
-    out["score_guidance"] = out.apply(_guidance, axis=1)
+def add_guidance_text(df: pd.DataFrame, policy: Optional[EvaluationPolicy]) -> pd.DataFrame:
+    """
+    내보내기/전체 응답 직전에 score_guidance 문구를 지연 생성(guidance_code 앞에 삽입).
+    이미 문구가 있거나 구조화 컬럼/정책이 없으면 그대로 반환.
+    """
+    if policy is None or "score_guidance" in df.columns or "guidance_code" not in df.columns:
+        return df
+    out = df.copy()
+    out.insert(out.columns.get_loc("guidance_code"), "score_guidance", format_score_guidance(out, policy))
     return out
 
 
@@ -249,29 +397,286 @@ def add_top_reasons(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def enrich_report(df_processed: pd.DataFrame, policy: EvaluationPolicy) -> pd.DataFrame:
+# 스케일러 없는 선형 모델의 기여도 기준점: 학습 피처 평균(모델 전처리 후 공간)을 모델 객체에 저장
+EXPLAIN_MEANS_ATTR = "explain_means_"
+
+
+def _explain_parts(model: Any) -> Tuple[List[Any], Any]:
+    steps = list(model.named_steps.values()) if isinstance(model, Pipeline) else [model]
+    return steps, getattr(steps[-1], "coef_", None)
+
+
+def _explain_matrix(model: Any, X: pd.DataFrame, n_steps: int) -> np.ndarray:
+    Z = model[:-1].transform(X) if n_steps > 1 else X.to_numpy(dtype=float)
+    return np.asarray(Z, dtype=float)
+
+
+def fit_explanation_baseline(model: Any, X: pd.DataFrame) -> Any:
+    """
+    학습 시 호출: 스케일러 없는 선형 모델이면 학습 피처 평균을 모델에 저장(explain_means_).
+    채점 배치 구성과 무관하게 같은 학생은 같은 model_reasons를 받도록 하는 기준점입니다.
+    """
+    steps, coef = _explain_parts(model)
+    if coef is not None and not any(isinstance(s, StandardScaler) for s in steps[:-1]):
+        setattr(model, EXPLAIN_MEANS_ATTR, np.nanmean(_explain_matrix(model, X, len(steps)), axis=0))
+    return model
+
+
+def add_model_explanations(
+    df: pd.DataFrame,
+    model: Any,
+    feature_cols: Optional[List[str]] = None,
+    top_k: int = 3,
+    out_col: str = "model_reasons",
+) -> pd.DataFrame:
+    """
+    선형 모델 계수 기반 학생별 위험 요인(top-k).
+
+    기여도 = 표준화 피처 행렬(n x d) * 계수(d) → 배치 전체를 한 번의 벡터 연산으로 계산.
+    - 파이프라인에 StandardScaler가 있으면 모델 전처리 결과(학습 분포 기준 z)를 그대로 사용
+    - 없으면 학습 평균(explain_means_) 기준 편차를 사용. 평균이 저장되지 않은 이전 모델은 0 기준(값 × 계수)
+      → 어느 경우든 행별 결과가 같은 배치/청크의 다른 행에 영향을 받지 않음
+    - 위험을 높이는(양수) 기여만 큰 순서로 top_k개 표시
+    - coef_가 없는 모델(트리 등)은 컬럼을 추가하지 않음
+    - 계수 개수와 피처 개수가 다르면 ValueError
+    """
+    out = df.copy()
+
+    steps, coef = _explain_parts(model)
+    if coef is None:
+        return out
+
+    if feature_cols is None:
+        feature_cols = list(getattr(model, "feature_names_in_", FEATURE_COLS))
+    X = out.reindex(columns=feature_cols)
+
+    Z = _explain_matrix(model, X, len(steps))
+    coef = np.ravel(coef)
+    if coef.shape[0] != Z.shape[1]:
+        raise ValueError(f"Model has {coef.shape[0]} coefficients but {Z.shape[1]} explanation features.")
+    if not any(isinstance(s, StandardScaler) for s in steps[:-1]):
+        means = getattr(model, EXPLAIN_MEANS_ATTR, None)
+        if means is not None:
+            if np.shape(means) != (Z.shape[1],):
+                raise ValueError(f"Stored explanation means do not match {Z.shape[1]} features.")
+            Z = Z - means
+
+    contrib = np.nan_to_num(Z * coef)
+
+    k = min(top_k, contrib.shape[1])
+    idx = np.argsort(-contrib, axis=1, kind="stable")[:, :k]
+    vals = np.take_along_axis(contrib, idx, axis=1)
+    labels = np.array([FEATURE_LABELS.get(c, c) for c in feature_cols], dtype=object)
+    names = np.where(vals > 0, labels[idx], "")
+
+    out[out_col] = [", ".join(n for n in row if n) or "특이 요인 없음" for row in names]
+    return out
+
+
+# 리포트 확장 단계: 이름 -> (생성 컬럼, 선행 단계). 정의 순서가 실행 순서입니다.
+ENRICH_STAGES: Dict[str, Tuple[List[str], List[str]]] = {
+    "participation": (["participation_risk_score", "participation_flag"], []),
+    "absence": (["absence_limit", "remaining_absence_allowance"], []),
+    "guidance": ([*GUIDANCE_COLUMNS, "score_guidance"], []),
+    "reasons": (["top_reasons"], ["participation"]),  # participation_flag 사용
+    "model_reasons": (["model_reasons"], []),
+}
+
+
+def resolve_enrich_stages(fields: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    요청 컬럼(fields)을 만드는 데 필요한 확장 단계(선행 단계 포함)를 실행 순서대로 반환.
+    fields=None이면 전체 단계.
+    """
+    if fields is None:
+        return list(ENRICH_STAGES)
+
+    wanted = set(fields)
+    needed: set = set()
+
+    def _need(name: str) -> None:
+        if name not in needed:
+            needed.add(name)
+            for dep in ENRICH_STAGES[name][1]:
+                _need(dep)
+
+    for name, (cols, _) in ENRICH_STAGES.items():
+        if wanted.intersection(cols):
+            _need(name)
+    return [name for name in ENRICH_STAGES if name in needed]
+
+
+# 행마다 독립적으로 계산되는 단계(배치 통계는 미리 계산해 공유): 행 구간 단위 병렬 실행 가능
+ROW_LOCAL_STAGES = ["participation", "absence", "guidance", "reasons"]
+
+
+def run_enrich_stage(
+    out: pd.DataFrame,
+    stage: str,
+    policy: EvaluationPolicy,
+    model: Any = None,
+    cohort_col: Optional[str] = None,
+) -> pd.DataFrame:
+    # participation → reasons에 필요
+    if stage == "participation":
+        return add_participation_flags(out, cohort_col=cohort_col)
+
+    # absence
+    if stage == "absence":
+        return add_absence_allowance(out, policy)
+
+    # score guidance (구조화 컬럼만, 문구는 내보내기/응답 시 add_guidance_text로 생성)
+    if stage == "guidance":
+        return add_score_guidance(out, policy, with_text=False)
+
+    # reasons
+    if stage == "reasons":
+        return add_top_reasons(out)
+
+    # model-driven reasons (선형 모델 기여도)
+    if stage == "model_reasons" and model is not None:
+        return add_model_explanations(out, model)
+    return out
+
+
+def enrich_report(
+    df_processed: pd.DataFrame,
+    policy: EvaluationPolicy,
+    model: Any = None,
+    fields: Optional[Iterable[str]] = None,
+    cohort_col: Optional[str] = None,
+) -> pd.DataFrame:
     """
     df_processed: preprocess_pipeline 결과(DataFrame)
     policy: 사용자 입력(EvaluationPolicy)
+    model: 학습 모델(선택). 주면 계수 기반 위험 요인(model_reasons)을 추가
+    fields: 필요한 출력 컬럼(선택). 주면 해당 컬럼을 만드는 단계만 실행
+    cohort_col: 코호트 컬럼(선택). 주면 참여도 플래그를 코호트별 기준으로 계산
 
     리포트 컬럼을 추가하여 반환
     """
     out = df_processed.copy()
+    for stage in resolve_enrich_stages(fields):
+        out = run_enrich_stage(out, stage, policy, model=model, cohort_col=cohort_col)
+    return out
 
-    # participation → reasons에 필요
-    out = add_participation_flags(out)
 
-    # absence
+# 정책(EvaluationPolicy)에만 의존하는 컬럼: 정책 변경 시 이 컬럼들만 다시 계산하면 됨
+POLICY_COLUMNS = [
+    "risk_level",
+    "action",
+    "absence_limit",
+    "remaining_absence_allowance",
+    *GUIDANCE_COLUMNS,
+    "score_guidance",
+]
+
+
+def apply_policy(df: pd.DataFrame, policy: EvaluationPolicy) -> pd.DataFrame:
+    """
+    이미 채점된 리포트에 새 정책을 적용해 POLICY_COLUMNS만 다시 계산.
+    (모델 확률/전처리 컬럼은 정책과 무관하므로 그대로 유지)
+    """
+    out = add_risk_bands(df, policy) if "risk_proba" in df.columns else df
     out = add_absence_allowance(out, policy)
+    # 문구 컬럼이 저장된 (이전) 리포트는 문구도 새 정책으로 갱신
+    out = add_score_guidance(out, policy, with_text="score_guidance" in df.columns)
+    return out
 
-    # score guidance
-    out = add_score_guidance(out, policy)
 
-    # reasons
-    out = add_top_reasons(out)
+def policy_delta(
+    before: pd.DataFrame,
+    after: pd.DataFrame,
+    key: str = "student_id",
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    두 리포트의 정책 컬럼을 비교해 값이 달라진 행만 반환(key + 정책 컬럼).
+    before/after는 같은 행 순서(같은 리포트)를 전제로 함.
+    """
+    if columns is None:
+        columns = POLICY_COLUMNS
+    columns = [c for c in columns if c in after.columns]
+
+    # Categorical(risk_level/action)은 카테고리가 달라도 값으로 비교
+    old = before.reindex(columns=columns).reset_index(drop=True).astype(object)
+    new = after[columns].reset_index(drop=True).astype(object)
+    changed = ~((old == new) | (old.isna() & new.isna())).all(axis=1)
+
+    cols = ([key] if key in after.columns else []) + columns
+    return after.reset_index(drop=True).loc[changed.to_numpy(), cols]
+
+
+# -----------------------------
+# Aggregates (대시보드 요약)
+# -----------------------------
+RISK_LEVELS = [b["level"] for b in RISK_BANDS]
+# 남은 결석 구간 경계(이하): <=0(초과), 1~5, 6~10, 11~20, 21 이상
+ABSENCE_ALLOWANCE_EDGES = [0, 5, 10, 20]
+
 
-    # action (risk_level 이후에 적용하는 편이 자연스러우나, 편의상 여기서는 컬럼만 준비)
-    # risk_level이 없으면 action을 채울 수 없으므로, API에서 risk_level 생성 후 호출하는 것을 권장
+def _histogram(values: pd.Series, bins: int, value_range: Tuple[float, float]) -> Dict[str, Any]:
+    # 범위 밖 값은 양 끝 구간에 포함
+    x = pd.to_numeric(values, errors="coerce")
+    valid = x.dropna().clip(*value_range).to_numpy(dtype=float)
+    counts, edges = np.histogram(valid, bins=bins, range=value_range)
+    return {
+        "edges": [round(float(e), 6) for e in edges],
+        "counts": counts.tolist(),
+        "missing": int(x.isna().sum()),
+    }
+
+
+def _reason_counts(values: pd.Series) -> Dict[str, int]:
+    # "사유1, 사유2" 문자열을 사유 단위로 펼쳐 빈도 집계(많은 순)
+    reasons = values.dropna().astype(str).str.split(", ").explode()
+    return {str(k): int(v) for k, v in reasons[reasons != ""].value_counts().items()}
+
+
+def _absence_buckets(values: pd.Series) -> Dict[str, int]:
+    edges = ABSENCE_ALLOWANCE_EDGES
+    labels = [f"<={edges[0]}"]
+    labels += [f"{lo + 1}-{hi}" for lo, hi in zip(edges[:-1], edges[1:])]
+    labels += [f">{edges[-1]}"]
+    x = pd.to_numeric(values, errors="coerce")
+    buckets = pd.cut(x, bins=[-np.inf, *edges, np.inf], labels=labels, right=True)
+    counts = buckets.value_counts(sort=False)
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+def aggregate_report(df: pd.DataFrame, bins: int = 10) -> Dict[str, Any]:
+    """
+    채점 결과 요약(행 데이터 없이 대시보드 요약 화면을 그릴 수 있는 크기).
+    - risk_level_counts: 위험도별 인원
+    - risk_proba_histogram(0~1) / achievement_rate_histogram(0~100): 구간 경계 + 구간별 인원
+    - top_reasons_counts / model_reasons_counts: 사유별 빈도
+    - absence_allowance_buckets: 남은 결석 구간별 인원
+    리포트에 없는 컬럼의 요약은 None.
+    """
+    out: Dict[str, Any] = {"rows": int(len(df))}
+
+    if "risk_level" in df.columns:
+        counts = df["risk_level"].value_counts()
+        levels = RISK_LEVELS + [str(k) for k in counts.index if k not in RISK_LEVELS]
+        out["risk_level_counts"] = {lvl: int(counts.get(lvl, 0)) for lvl in levels}
+    else:
+        out["risk_level_counts"] = None
+
+    out["risk_proba_histogram"] = (
+        _histogram(df["risk_proba"], bins, (0.0, 1.0)) if "risk_proba" in df.columns else None
+    )
+    out["achievement_rate_histogram"] = (
+        _histogram(df["achievement_rate"], bins, (0.0, 100.0)) if "achievement_rate" in df.columns else None
+    )
+    out["top_reasons_counts"] = _reason_counts(df["top_reasons"]) if "top_reasons" in df.columns else None
+    out["model_reasons_counts"] = (
+        _reason_counts(df["model_reasons"]) if "model_reasons" in df.columns else None
+    )
+    out["absence_allowance_buckets"] = (
+        _absence_buckets(df["remaining_absence_allowance"])
+        if "remaining_absence_allowance" in df.columns
+        else None
+    )
     return out
 
 
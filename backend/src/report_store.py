@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import io
+import json
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.src.config import HISTORY_COLS
+
+
+# ----------------------------
+# Report store (SQLite)
+# ----------------------------
+# 채점 결과를 리포트 단위로 하나의 SQLite 파일에 누적 저장합니다.
+# - reports: 리포트 메타(생성 시각, 행 수, 정책, 컬럼 순서)
+# - report_blobs: 리포트 전체 프레임을 Parquet 한 덩어리로 저장(복원용, pyarrow가 없으면 JSON split)
+# - report_rows: 학생 행의 조회용 핵심 컬럼만(개별 컬럼 + 인덱스)
+#   · (report_id, row_idx) PK  → 요약
+#   · (student_id, created_at) → 학생별 위험도 이력
+#   · payload(행 JSON)는 저장소 도입 초기의 리포트에만 있으며, 이 리포트들은 payload로 복원합니다.
+# - student_snapshots: 추이 피처용 학생별 스냅샷(HISTORY_COLS만 담은 좁은 테이블)
+#   · PK (student_id, created_at, report_id) WITHOUT ROWID → 학생별로 시각 순 클러스터링(학생 단위 파티션)
+#   · as-of 조회(학생마다 기준 시각 이전 최신 1행)는 PK 인덱스 탐색 한 번(O(log n))
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS reports (
+        report_id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        policy TEXT,
+        columns TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report_rows (
+        report_id TEXT NOT NULL,
+        row_idx INTEGER NOT NULL,
+        student_id TEXT,
+        created_at TEXT NOT NULL,
+        risk_proba REAL,
+        risk_level TEXT,
+        achievement_rate REAL,
+        absence_count REAL,
+        payload TEXT,
+        PRIMARY KEY (report_id, row_idx)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report_blobs (
+        report_id TEXT PRIMARY KEY,
+        format TEXT NOT NULL,
+        data BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_report_rows_student ON report_rows (student_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at)",
+]
+
+_SNAPSHOT_SCHEMA = f"""
+CREATE TABLE student_snapshots (
+    student_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    report_id TEXT NOT NULL,
+    {", ".join(f"{c} REAL" for c in HISTORY_COLS)},
+    PRIMARY KEY (student_id, created_at, report_id)
+) WITHOUT ROWID
+"""
+
+INDEXED_COLUMNS = ["risk_proba", "risk_level", "achievement_rate", "absence_count"]
+
+
+def _column_values(df: pd.DataFrame, col: str) -> List[Any]:
+    if col not in df.columns:
+        return [None] * len(df)
+    values = df[col].astype(object).where(df[col].notna(), None)
+    return [v.item() if isinstance(v, np.generic) else v for v in values]
+
+
+def _encode_frame(df: pd.DataFrame) -> Tuple[str, bytes]:
+    # attrs(품질/배치 통계)는 요청 처리 중에만 쓰는 값이므로 저장하지 않습니다.
+    plain = df.copy(deep=False)
+    plain.attrs = {}
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "json", plain.to_json(orient="split", index=False, force_ascii=False, double_precision=15).encode()
+    buf = io.BytesIO()
+    plain.to_parquet(buf, index=False)
+    return "parquet", buf.getvalue()
+
+
+def _decode_frame(fmt: str, data: bytes) -> pd.DataFrame:
+    if fmt == "parquet":
+        return pd.read_parquet(io.BytesIO(data))
+    return pd.read_json(io.StringIO(data.decode()), orient="split")
+
+
+class ReportStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            self._create_snapshots(conn)
+            # 초기 스키마(payload NOT NULL) 저장소에는 빈 문자열을 넣습니다.
+            notnull = {r["name"]: r["notnull"] for r in conn.execute("PRAGMA table_info(report_rows)")}
+            self._empty_payload = "" if notnull.get("payload") else None
+        # 백그라운드 쓰기: 요청 경로는 submit()으로 넘기고, 끝나기 전 읽기는 _pending의 프레임을 사용
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Future, pd.DataFrame, Optional[Dict[str, Any]]]] = {}
+
+    def _create_snapshots(self, conn: sqlite3.Connection) -> None:
+        # 스냅샷 테이블이 없던 저장소는 기존 리포트 행(payload)에서 한 번 채워 넣습니다.
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_snapshots'"
+        ).fetchone()
+        if exists:
+            return
+        conn.execute(_SNAPSHOT_SCHEMA)
+        values = ", ".join(f"json_extract(payload, '$.{c}')" for c in HISTORY_COLS)
+        conn.execute(
+            f"INSERT OR REPLACE INTO student_snapshots (student_id, created_at, report_id, {', '.join(HISTORY_COLS)}) "
+            f"SELECT student_id, created_at, report_id, {values} FROM report_rows "
+            "WHERE student_id IS NOT NULL ORDER BY report_id, row_idx"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-store")
+            return self._executor
+
+    def submit(
+        self,
+        report_id: str,
+        df: pd.DataFrame,
+        created_at: Optional[datetime] = None,
+        policy: Optional[Dict[str, Any]] = None,
+    ) -> Future:
+        """
+        append()를 백그라운드 스레드 한 개에서 순서대로 실행합니다(요청 경로에서 직렬화/쓰기 제외).
+        쓰기가 끝나기 전에도 has_report/load_report/report_policy는 넘겨받은 프레임으로 응답합니다.
+        """
+        with self._lock:
+            future: Future = Future()
+            self._pending[report_id] = (future, df, policy)
+
+        def write() -> None:
+            try:
+                self.append(report_id, df, created_at=created_at, policy=policy)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+            finally:
+                with self._lock:
+                    self._pending.pop(report_id, None)
+
+        self._pool().submit(write)
+        return future
+
+    def flush(self) -> None:
+        # 대기 중인 쓰기를 모두 마칠 때까지 기다립니다(쓰기 실패는 submit()이 돌려준 Future에 남음).
+        with self._lock:
+            futures = [f for f, _, _ in self._pending.values()]
+        wait(futures)
+
+    def shutdown(self) -> None:
+        # 남은 쓰기는 마치고 종료합니다.
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _pending_frame(self, report_id: str) -> Optional[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        with self._lock:
+            entry = self._pending.get(report_id)
+        return None if entry is None else (entry[1], entry[2])
+
+    def append(
+        self,
+        report_id: str,
+        df: pd.DataFrame,
+        created_at: Optional[datetime] = None,
+        policy: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        created = (created_at or datetime.now()).isoformat(timespec="seconds")
+        blob_format, blob = _encode_frame(df)
+        student_ids = [None if v is None else str(v) for v in _column_values(df, "student_id")]
+        indexed = [_column_values(df, c) for c in INDEXED_COLUMNS]
+        history = [_column_values(df, c) for c in HISTORY_COLS]
+
+        rows = [
+            (report_id, i, student_ids[i], created, *(col[i] for col in indexed), self._empty_payload)
+            for i in range(len(df))
+        ]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO reports (report_id, created_at, rows, policy, columns) VALUES (?, ?, ?, ?, ?)",
+                (
+                    report_id,
+                    created,
+                    len(df),
+                    json.dumps(policy, ensure_ascii=False) if policy is not None else None,
+                    json.dumps([str(c) for c in df.columns], ensure_ascii=False),
+                ),
+            )
+            conn.execute(
+                "INSERT INTO report_blobs (report_id, format, data) VALUES (?, ?, ?)",
+                (report_id, blob_format, blob),
+            )
+            conn.executemany(
+                "INSERT INTO report_rows "
+                "(report_id, row_idx, student_id, created_at, risk_proba, risk_level, "
+                "achievement_rate, absence_count, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # 같은 리포트에 student_id가 중복되면 마지막 행을 스냅샷으로 사용
+            conn.executemany(
+                f"INSERT OR REPLACE INTO student_snapshots (student_id, created_at, report_id, {', '.join(HISTORY_COLS)}) "
+                f"VALUES (?, ?, ?{', ?' * len(HISTORY_COLS)})",
+                [
+                    (student_ids[i], created, report_id, *(col[i] for col in history))
+                    for i in range(len(df))
+                    if student_ids[i] is not None
+                ],
+            )
+
+    def snapshots_asof(self, student_ids: Iterable[Any], before: datetime) -> pd.DataFrame:
+        """
+        학생마다 before(미포함) 이전의 가장 최근 스냅샷 1행: (student_id, created_at, HISTORY_COLS...).
+        배치의 학생 ID를 임시 테이블에 넣고 학생별 PK 인덱스 탐색으로 조회합니다(과거 리포트 재스캔 없음).
+        """
+        self.flush()
+        ids = sorted({str(v) for v in student_ids if v is not None and not pd.isna(v)})
+        columns = ["student_id", "created_at", *HISTORY_COLS]
+        if not ids:
+            return pd.DataFrame(columns=columns)
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS asof_ids (student_id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM asof_ids")
+            conn.executemany("INSERT INTO asof_ids (student_id) VALUES (?)", ((i,) for i in ids))
+            rows = conn.execute(
+                f"SELECT s.student_id, s.created_at, {', '.join('s.' + c for c in HISTORY_COLS)} "
+                # CROSS JOIN: SQLite가 조인 순서를 바꾸지 않도록 고정(배치 ID → 스냅샷 PK 탐색)
+                "FROM asof_ids a CROSS JOIN student_snapshots s ON s.student_id = a.student_id "
+                "AND s.created_at = (SELECT MAX(created_at) FROM student_snapshots "
+                "WHERE student_id = a.student_id AND created_at < ?) "
+                "ORDER BY s.student_id, s.created_at, s.report_id",
+                (before.isoformat(timespec="seconds"),),
+            ).fetchall()
+        return pd.DataFrame([tuple(r) for r in rows], columns=columns)
+
+    def has_report(self, report_id: str) -> bool:
+        if self._pending_frame(report_id) is not None:
+            return True
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        return row is not None
+
+    def load_report(self, report_id: str) -> Optional[pd.DataFrame]:
+        pending = self._pending_frame(report_id)
+        if pending is not None:
+            return pending[0]
+        with self._connect() as conn:
+            meta = conn.execute("SELECT columns FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+            if meta is None:
+                return None
+            blob = conn.execute(
+                "SELECT format, data FROM report_blobs WHERE report_id = ?", (report_id,)
+            ).fetchone()
+            if blob is not None:
+                return _decode_frame(blob["format"], blob["data"])
+            payloads = conn.execute(
+                "SELECT payload FROM report_rows WHERE report_id = ? ORDER BY row_idx", (report_id,)
+            ).fetchall()
+        records = [json.loads(r["payload"]) for r in payloads]
+        return pd.DataFrame.from_records(records, columns=json.loads(meta["columns"]))
+
+    def report_policy(self, report_id: str) -> Optional[Dict[str, Any]]:
+        pending = self._pending_frame(report_id)
+        if pending is not None:
+            return pending[1]
+        with self._connect() as conn:
+            row = conn.execute("SELECT policy FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        return json.loads(row["policy"]) if row is not None and row["policy"] else None
+
+    def list_reports(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        self.flush()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT report_id, created_at, rows FROM reports ORDER BY created_at DESC, report_id DESC "
+                "LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def student_history(self, student_id: str) -> List[Dict[str, Any]]:
+        self.flush()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT report_id, created_at, risk_proba, risk_level, achievement_rate, absence_count "
+                "FROM report_rows WHERE student_id = ? ORDER BY created_at",
+                (str(student_id),),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def report_summary(self, report_id: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        with self._connect() as conn:
+            meta = conn.execute(
+                "SELECT report_id, created_at, rows, policy FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+            if meta is None:
+                return None
+            stats = conn.execute(
+                "SELECT AVG(risk_proba) AS mean_risk_proba, MAX(risk_proba) AS max_risk_proba, "
+                "AVG(achievement_rate) AS mean_achievement_rate "
+                "FROM report_rows WHERE report_id = ?",
+                (report_id,),
+            ).fetchone()
+            levels = conn.execute(
+                "SELECT risk_level, COUNT(*) AS n FROM report_rows WHERE report_id = ? GROUP BY risk_level",
+                (report_id,),
+            ).fetchall()
+        summary = dict(meta)
+        summary["policy"] = json.loads(summary["policy"]) if summary["policy"] else None
+        summary.update(dict(stats))
+        summary["risk_level_counts"] = {r["risk_level"]: r["n"] for r in levels}
+        return summary
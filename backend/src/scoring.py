@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.src.config import FEATURE_COLS, VALUE_RANGES
+from backend.src.data_quality import QUALITY_ATTR, get_quality
+from backend.src.history import add_history_deltas, add_history_features, history_columns
+from backend.src.parallel_enrich import enrich_partitioned
+from backend.src.preprocessing import fit_chunk_plan, preprocess_pipeline, preprocess_planned_chunk
+from backend.src.report_logic import (
+    ENRICH_STAGES,
+    EvaluationPolicy,
+    assign_risk_bands,
+    enrich_report,
+    policy_risk_bands,
+    resolve_enrich_stages,
+    run_enrich_stage,
+)
+
+
+# 채점 단계 이름 (비동기 작업 진행률 표시에 사용)
+# parse / write는 입출력을 담당하는 호출 측(API, 스크립트)에서 보고합니다.
+STAGES = ["parse", "preprocess", "score", "enrich", "write"]
+
+StageCallback = Callable[[str], None]
+# (섀도 확률, 오류 메시지): 섀도 모델 실패 시 확률은 None
+ShadowCallback = Callable[[Optional[np.ndarray], Optional[str]], None]
+# 청크 채점 입력: DataFrame, 또는 호출할 때마다 원본 청크를 처음부터 다시 읽는 함수(파일 스트리밍, 두 번 호출됨)
+ChunkSource = Union[pd.DataFrame, Callable[[], Iterable[pd.DataFrame]]]
+# 이전 스냅샷: DataFrame, 또는 청크의 student_id로 조회하는 함수(ReportStore.snapshots_asof)
+HistorySource = Union[pd.DataFrame, Callable[[pd.Series], pd.DataFrame]]
+
+
+def model_feature_cols(model: Any) -> List[str]:
+    # 모델이 학습 당시 feature_names_in_이 있으면 그것을 우선 사용(정렬/누락 방어)
+    return list(getattr(model, "feature_names_in_", FEATURE_COLS))
+
+
+def report_columns(input_columns: Iterable[str]) -> List[str]:
+    """
+    input_columns(업로드 컬럼)로 채점했을 때 리포트에 생길 수 있는 컬럼 전체.
+    채점 전에 요청 컬럼(fields)을 검증하는 데 사용합니다.
+    """
+    return list(dict.fromkeys([
+        *input_columns,
+        *FEATURE_COLS,
+        "achievement_rate",
+        *history_columns(),
+        "risk_proba",
+        "risk_level",
+        "action",
+        *(c for cols, _ in ENRICH_STAGES.values() for c in cols),
+    ]))
+
+
+def policy_value_ranges(policy: EvaluationPolicy) -> dict:
+    # 데이터 품질 검사 범위: 점수 상한은 정책의 만점, 결석 상한은 총 수업 횟수
+    return {
+        **VALUE_RANGES,
+        "midterm_score": (0, policy.midterm_max),
+        "final_score": (0, policy.final_max),
+        "performance_score": (0, policy.performance_max),
+        "absence_count": (0, policy.total_classes),
+    }
+
+
+def predict_risk_proba(df_processed: pd.DataFrame, model: Any) -> np.ndarray:
+    X = df_processed.reindex(columns=model_feature_cols(model))
+    return model.predict_proba(X)[:, 1]
+
+
+def _score_processed(
+    df_processed: pd.DataFrame,
+    model: Any,
+    policy: EvaluationPolicy,
+    notify: StageCallback,
+    fields: Optional[Iterable[str]] = None,
+    cohort_col: Optional[str] = None,
+    shadow_model: Any = None,
+    on_shadow: Optional[ShadowCallback] = None,
+    history: Optional[pd.DataFrame] = None,
+    as_of: Optional[datetime] = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    # 전처리 결과 → (이전 스냅샷 추이 피처) → 모델 추론(risk_proba/risk_level/action) → 리포트 컬럼 확장
+    if history is not None:
+        df_processed = add_history_features(df_processed, history, as_of or datetime.now())
+    notify("score")
+    df_result = df_processed.copy()
+    X = df_processed.reindex(columns=model_feature_cols(model))
+    df_result["risk_proba"] = model.predict_proba(X)[:, 1]
+    add_history_deltas(df_result, ["risk_proba"])
+
+    if shadow_model is not None and on_shadow is not None:
+        shadow_cols = model_feature_cols(shadow_model)
+        X_shadow = X if shadow_cols == list(X.columns) else df_processed.reindex(columns=shadow_cols)
+        try:
+            shadow_proba, error = shadow_model.predict_proba(X_shadow)[:, 1], None
+        except Exception as exc:
+            # 섀도 모델 오류(피처 불일치 등)는 기본 채점 결과에 영향을 주지 않습니다.
+            shadow_proba, error = None, str(exc)
+        on_shadow(shadow_proba, error)
+
+    if n_jobs != 1:
+        # 위험 등급 매핑 + 행 단위 확장 단계를 행 구간별로 프로세스 풀에서 실행(작은 배치는 직렬)
+        notify("enrich")
+        return enrich_partitioned(df_result, policy, model=model, fields=fields, cohort_col=cohort_col, n_jobs=n_jobs)
+
+    df_result["risk_level"], df_result["action"] = assign_risk_bands(
+        df_result["risk_proba"], policy_risk_bands(policy)
+    )
+
+    notify("enrich")
+    return enrich_report(df_result, policy, model=model, fields=fields, cohort_col=cohort_col)
+
+
+def score_report(
+    df_raw: pd.DataFrame,
+    model: Any,
+    policy: EvaluationPolicy,
+    on_stage: Optional[StageCallback] = None,
+    fields: Optional[Iterable[str]] = None,
+    cohort_col: Optional[str] = None,
+    shadow_model: Any = None,
+    on_shadow: Optional[ShadowCallback] = None,
+    history: Optional[pd.DataFrame] = None,
+    as_of: Optional[datetime] = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    원본 DataFrame → 전처리 → 모델 추론(risk_proba/risk_level/action) → 리포트 컬럼 확장.
+    on_stage: 각 단계 시작 시 단계 이름으로 호출(선택)
+    fields: 필요한 출력 컬럼(선택). 주면 해당 컬럼에 필요한 확장 단계만 실행
+    cohort_col: 코호트 컬럼(선택). 배치 통계/참여도 플래그를 코호트(반/학년)별로 계산
+    shadow_model: 비교용 섀도 모델(선택). 같은 전처리 결과로 확률만 계산해 on_shadow로 전달
+    history: 학생별 이전 스냅샷(선택, ReportStore.snapshots_asof). 주면 as_of 기준 as-of 조인으로
+             prev_*/delta_*/has_history/days_since_prev 컬럼을 추가(추이 피처로 학습한 모델은 이를 입력으로 사용)
+    n_jobs: 1이 아니면 위험 등급/행 단위 리포트 단계를 행 구간으로 나눠 프로세스 풀에서 실행(결과는 직렬과 같음)
+    결과의 df.attrs["data_quality"]에 업로드 데이터 품질 요약(행 단위 문제 목록)을 담습니다.
+    """
+    notify = on_stage or (lambda stage: None)
+
+    notify("preprocess")
+    df_processed = preprocess_pipeline(df_raw, cohort_col=cohort_col, value_ranges=policy_value_ranges(policy))
+    df_result = _score_processed(
+        df_processed, model, policy, notify, fields, cohort_col, shadow_model, on_shadow, history, as_of, n_jobs
+    )
+    df_result.attrs[QUALITY_ATTR] = get_quality(df_processed)
+    return df_result
+
+
+def _iter_chunks(source: ChunkSource, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if isinstance(source, pd.DataFrame):
+        step = max(1, chunk_rows)
+        for start in range(0, len(source), step):
+            yield source.iloc[start:start + step]
+        return
+    # 파일 청크(Parquet 배치 등)는 인덱스가 청크마다 0부터이므로 업로드 전체 행 번호로 맞춤
+    offset = 0
+    for chunk in source():
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def score_report_chunked(
+    source: ChunkSource,
+    model: Any,
+    policy: EvaluationPolicy,
+    chunk_rows: int,
+    on_stage: Optional[StageCallback] = None,
+    fields: Optional[Iterable[str]] = None,
+    cohort_col: Optional[str] = None,
+    shadow_model: Any = None,
+    on_shadow: Optional[ShadowCallback] = None,
+    history: Optional[HistorySource] = None,
+    as_of: Optional[datetime] = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    score_report와 같은 결과를 chunk_rows 행씩 나눠 계산(큰 업로드용).
+    source가 청크 읽기 함수면 원본 전체를 메모리에 올리지 않고 두 번 순회합니다.
+    - 1차: 중복 행/품질 요약/결측 채움 값/배치 통계를 전체 행 기준으로 계산(fit_chunk_plan)
+    - 2차: 청크마다 전처리 → 추론 → 행 단위 확장 단계(통계 공유), 결과 리포트만 모음
+    계수 기반 model_reasons는 모은 결과 전체에 한 번 실행합니다. 청크 크기와 무관하게 결과가 같습니다.
+    """
+    notify = on_stage or (lambda stage: None)
+    as_of = as_of or datetime.now()  # 모든 청크가 같은 기준 시각으로 이전 스냅샷을 조인
+    shadow_parts: List[np.ndarray] = []
+    shadow_errors: List[str] = []
+    fallback = dict(
+        fields=fields, cohort_col=cohort_col, shadow_model=shadow_model, on_shadow=on_shadow, as_of=as_of, n_jobs=n_jobs
+    )
+
+    def collect_shadow(proba: Optional[np.ndarray], error: Optional[str]) -> None:
+        if proba is None:
+            shadow_errors.append(error or "")
+        else:
+            shadow_parts.append(proba)
+
+    def history_for(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        if callable(history):
+            return history(df["student_id"]) if "student_id" in df.columns else None
+        return history
+
+    if isinstance(source, pd.DataFrame) and source.empty:
+        return score_report(source, model, policy, on_stage=on_stage, history=history_for(source), **fallback)
+
+    notify("preprocess")
+    value_ranges = policy_value_ranges(policy)
+    plan = fit_chunk_plan(_iter_chunks(source, chunk_rows), cohort_col=cohort_col, value_ranges=value_ranges)
+    if plan.n_rows == 0:
+        empty = pd.DataFrame(columns=plan.columns)
+        return score_report(empty, model, policy, history=history_for(empty), **fallback)
+
+    # model_reasons는 청크 후 한 번: 청크에서는 나머지 단계 컬럼만 요청
+    stages = resolve_enrich_stages(fields)
+    chunk_fields = [c for stage in stages if stage != "model_reasons" for c in ENRICH_STAGES[stage][0]]
+    notify("score")
+    parts = []
+    offset = 0
+    for raw in _iter_chunks(source, chunk_rows):
+        chunk = preprocess_planned_chunk(raw, plan, offset)
+        offset += len(raw)
+        parts.append(_score_processed(
+            chunk,
+            model,
+            policy,
+            lambda stage: None,
+            chunk_fields,
+            cohort_col,
+            shadow_model,
+            collect_shadow if on_shadow is not None else None,
+            history_for(chunk),
+            as_of,
+            n_jobs,
+        ))
+    notify("enrich")
+    df_result = pd.concat(parts)
+    del parts
+    if "model_reasons" in stages:
+        df_result = run_enrich_stage(df_result, "model_reasons", policy, model=model)
+    df_result.attrs[QUALITY_ATTR] = plan.quality
+
+    if shadow_model is not None and on_shadow is not None:
+        if shadow_errors:
+            on_shadow(None, shadow_errors[0])
+        else:
+            on_shadow(np.concatenate(shadow_parts), None)
+    return df_result
@@ -55,6 +55,44 @@ export async function predictCsv({ file, policyObj, mode = 'full' }: PredictCsvP
 		throw new Error(errText || 'Request failed');
 	}
 
+	// 202: 업로드가 커서 서버가 비동기 작업(route=job)으로 넘긴 경우
+	// 작업이 끝날 때까지 상태를 확인한 뒤 같은 형식의 결과를 받아옵니다.
+	if (res.status === 202) {
+		const job = (await res.json()) as JobPayload;
+		return waitForJobResult(job, mode);
+	}
+
 	// 성공 시 JSON 응답 본문(예측 결과/리포트 URL 등)을 반환합니다.
 	return res.json();
 }
+
+// 비동기 채점 작업 상태 응답 중 클라이언트가 사용하는 필드입니다.
+interface JobPayload {
+	status: string;
+	error: string | null;
+	status_url: string;
+	result_url: string;
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
+async function waitForJobResult(job: JobPayload, mode: string): Promise<unknown> {
+	let current = job;
+	while (current.status !== 'done') {
+		if (current.status === 'failed') {
+			throw new Error(current.error || 'Job failed');
+		}
+		await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+		const statusRes = await fetch(buildApiUrl(current.status_url));
+		if (!statusRes.ok) {
+			throw new Error((await statusRes.text()) || 'Request failed');
+		}
+		current = (await statusRes.json()) as JobPayload;
+	}
+
+	const resultRes = await fetch(buildApiUrl(`${current.result_url}?mode=${encodeURIComponent(mode)}`));
+	if (!resultRes.ok) {
+		throw new Error((await resultRes.text()) || 'Request failed');
+	}
+	return resultRes.json();
+}
@@ -4,6 +4,7 @@ export const COLUMN_LABELS: Record<string, string> = {
 	risk_level: '위험도',
 	risk_proba: '위험 확률',
 	top_reasons: '위험 사유',
+	model_reasons: '모델 기반 위험 요인',
 	action: '권장 조치',
 
 	// 점수/안내
@@ -11,6 +12,9 @@ export const COLUMN_LABELS: Record<string, string> = {
 	final_score: '기말고사 점수',
 	performance_score: '수행평가 점수',
 	score_guidance: '점수 안내(역산)',
+	guidance_code: '점수 안내 코드',
+	required_final_score: '기말 최소 필요 점수',
+	required_performance_score: '수행 최소 필요 점수',
 
 	// 참여/행동
 	assignment_count: '과제 제출 횟수',
@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# API 모듈은 import 시점에 환경변수를 읽으므로, 저장소/작업 경로를 테스트 전용 임시 폴더로 먼저 지정합니다.
+_TMP = Path(tempfile.mkdtemp(prefix="edutech-tests-"))
+for key, rel in {
+    "REPORT_DIR": "reports",
+    "REPORT_STORE_PATH": "reports/report_store.sqlite3",
+    "JOB_DIR": "jobs",
+    "DRIFT_STORE_PATH": "reports/drift.sqlite3",
+    "SHADOW_LOG_DIR": "shadow",
+    "MODEL_PATH": "models/logistic_model.joblib",
+}.items():
+    os.environ.setdefault(key, str(_TMP / rel))
+
+DATA_PATH = PROJECT_ROOT / "data/dummy/dummy_midterm_like_labeled.csv"
+# 모델 파일은 저장소에 없으므로 세션마다 더미 데이터로 학습해 임시 폴더에 저장합니다(train_model.py와 같은 방식).
+MODEL_PATH = Path(os.environ["MODEL_PATH"])
+
+POLICY = {
+    "threshold": 0.4,
+    "midterm_max": 100,
+    "midterm_weight": 40,
+    "final_max": 100,
+    "final_weight": 40,
+    "performance_max": 100,
+    "performance_weight": 20,
+    "total_classes": 160,
+}
+
+
+@pytest.fixture(scope="session")
+def raw_df() -> pd.DataFrame:
+    return pd.read_csv(DATA_PATH, encoding="utf-8-sig")
+
+
+@pytest.fixture(scope="session")
+def policy_json() -> str:
+    return json.dumps(POLICY)
+
+
+@pytest.fixture(scope="session")
+def model_path() -> Path:
+    # 로지스틱 회귀(기본 하이퍼파라미터) + 설명 기준점 + 드리프트 기준 분포
+    from backend.scripts.train_model import (
+        _save_drift_reference,
+        _save_model,
+        build_estimator,
+        build_feature_matrix,
+    )
+    from backend.src.config import FEATURE_COLS
+    from backend.src.report_logic import fit_explanation_baseline
+
+    if not MODEL_PATH.exists():
+        X, y = build_feature_matrix("", str(DATA_PATH), tuple(FEATURE_COLS), "")
+        model = build_estimator("logistic").fit(X, y)
+        fit_explanation_baseline(model, X)
+        MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _save_model(model, MODEL_PATH)
+        _save_drift_reference(model, X, MODEL_PATH)
+    return MODEL_PATH
+
+
+@pytest.fixture(scope="session")
+def model(model_path):
+    import joblib
+
+    return joblib.load(model_path)
+
+
+@pytest.fixture(scope="session")
+def client(model_path):
+    from fastapi.testclient import TestClient
+
+    from backend.api import main
+
+    with TestClient(main.app) as c:
+        yield c
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.api.admission import AdmissionControlMiddleware, CostLimiter, Overloaded
+
+
+def test_limiter_admits_within_budget_and_queues_fifo():
+    async def scenario():
+        limiter = CostLimiter(max_cost=4, max_queue=4, queue_timeout=1)
+        order = []
+        await limiter.acquire(3)
+
+        async def waiter(name, cost):
+            await limiter.acquire(cost)
+            order.append(name)
+
+        big = asyncio.create_task(waiter("big", 4))
+        await asyncio.sleep(0)
+        # 앞선 대기 요청이 있으면 들어갈 수 있는 작은 요청도 새치기하지 않음
+        small = asyncio.create_task(waiter("small", 1))
+        await asyncio.sleep(0)
+        assert order == []
+        limiter.release(3)
+        await big
+        limiter.release(4)
+        await small
+        return order, limiter.metrics()
+
+    order, metrics = asyncio.run(scenario())
+    assert order == ["big", "small"]
+    assert metrics["admitted"] == 3
+    assert metrics["in_flight_cost"] == 1
+
+
+def test_limiter_rejects_when_queue_full_or_timed_out():
+    async def scenario():
+        limiter = CostLimiter(max_cost=1, max_queue=1, queue_timeout=0.05)
+        await limiter.acquire(1)
+        queued = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="queue_full"):
+            await limiter.acquire(1)
+        with pytest.raises(Overloaded, match="timeout"):
+            await queued
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.rejected == {"queue_full": 1, "timeout": 1}
+    assert limiter.in_use == 1
+
+
+def test_middleware_returns_503_with_retry_after():
+    async def app(scope, receive, send):
+        raise AssertionError("should not be reached")
+
+    async def scenario():
+        limiter = CostLimiter(max_cost=1, max_queue=0, queue_timeout=1)
+        await limiter.acquire(1)
+        mw = AdmissionControlMiddleware(app, limiter, retry_after=7)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/api/predict", "headers": []}
+        await mw(scope, None, send)
+        return sent
+
+    start, body = asyncio.run(scenario())
+    assert start["status"] == 503
+    assert (b"retry-after", b"7") in start["headers"]
+    assert b"queue_full" in body["body"]
+
+
+def test_predict_does_not_block_event_loop(client, policy_json, monkeypatch):
+    # 채점 중(스레드 풀에서 대기)에도 같은 이벤트 루프의 다른 요청이 처리되어야 함
+    from backend.api import main
+
+    entered, release = threading.Event(), threading.Event()
+    original = main._read_upload_frame
+
+    def slow_read(*args, **kwargs):
+        entered.set()
+        release.wait(10)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(main, "_read_upload_frame", slow_read)
+    with open(main.DUMMY_DATA_PATH, "rb") as f:
+        payload = f.read()
+
+    results = {}
+    upload = threading.Thread(
+        target=lambda: results.setdefault(
+            "predict",
+            client.post(
+                "/api/predict?mode=compact",
+                files={"file": ("u.csv", payload, "text/csv")},
+                data={"policy": policy_json},
+            ),
+        )
+    )
+    upload.start()
+    try:
+        assert entered.wait(10)
+        health = threading.Thread(target=lambda: results.setdefault("health", client.get("/api/health")))
+        health.start()
+        health.join(5)
+        assert not health.is_alive()
+        assert results["health"].status_code == 200
+    finally:
+        release.set()
+        upload.join(30)
+    assert results["predict"].status_code == 200
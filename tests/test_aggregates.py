@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.report_logic import aggregate_report
+
+
+@pytest.fixture(scope="module")
+def report(client, policy_json, raw_df):
+    res = client.post(
+        "/api/predict?mode=compact",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": policy_json},
+    )
+    assert res.status_code == 200
+    from backend.api import main
+
+    report_id = res.json()["report_id"]
+    return report_id, main._load_report_frame(report_id)
+
+
+@pytest.mark.parametrize("bins", [1, 7, 100])
+def test_aggregates_match_report_rows(client, report, bins):
+    report_id, df = report
+    res = client.get(f"/api/reports/{report_id}/aggregates?bins={bins}")
+    assert res.status_code == 200
+    body = res.json()
+    assert body["rows"] == len(df)
+    for key in ("risk_proba_histogram", "achievement_rate_histogram"):
+        hist = body[key]
+        assert len(hist["counts"]) == bins
+        assert len(hist["edges"]) == bins + 1
+        assert sum(hist["counts"]) + hist["missing"] == body["rows"]
+    assert body["risk_level_counts"] == {str(k): int(v) for k, v in df["risk_level"].value_counts().items()}
+    assert sum(body["absence_allowance_buckets"].values()) == body["rows"]
+
+
+@pytest.mark.parametrize("bins", [0, 101])
+def test_bins_out_of_range_is_rejected(client, report, bins):
+    report_id, _ = report
+    res = client.get(f"/api/reports/{report_id}/aggregates?bins={bins}")
+    assert res.status_code == 400
+    assert res.json()["detail"] == "bins must be between 1 and 100."
+
+
+def test_aggregate_clips_range_and_splits_reasons():
+    df = pd.DataFrame({
+        "risk_level": pd.Categorical(["High", "Low", "Low"], categories=["High", "Medium", "Low"]),
+        "risk_proba": [1.2, -0.1, np.nan],  # 범위 밖 값은 양 끝 구간
+        "top_reasons": ["결석 많음, 과제 미제출", "결석 많음", None],
+        "remaining_absence_allowance": [-2, 7, 30],
+    })
+    out = aggregate_report(df, bins=2)
+    assert out["risk_level_counts"] == {"High": 1, "Medium": 0, "Low": 2}
+    assert out["risk_proba_histogram"]["counts"] == [1, 1]
+    assert out["risk_proba_histogram"]["missing"] == 1
+    assert out["top_reasons_counts"] == {"결석 많음": 2, "과제 미제출": 1}
+    assert out["absence_allowance_buckets"] == {"<=0": 1, "1-5": 0, "6-10": 1, "11-20": 0, ">20": 1}
+    assert out["achievement_rate_histogram"] is None
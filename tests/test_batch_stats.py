@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.batch_stats import STATS_ATTR, attach_batch_stats, get_batch_stats, row_quantile
+from backend.src.preprocessing import preprocess_chunks, preprocess_pipeline
+
+
+@pytest.fixture
+def sparse_df(raw_df):
+    # 참여도 컬럼 일부를 결측으로 만든 업로드 (연속값이 되도록 소수 섞음)
+    df = raw_df.copy()
+    rng = np.random.default_rng(7)
+    df["question_count"] = df["question_count"] + rng.random(len(df)).round(3)
+    df.loc[rng.random(len(df)) < 0.3, ["assignment_count", "question_count"]] = np.nan
+    return df
+
+
+def test_stats_are_computed_on_filled_values(sparse_df):
+    out = preprocess_pipeline(sparse_df)
+    stats = out.attrs[STATS_ATTR]
+    assert out["question_count"].notna().all()
+    assert stats["quantiles"]["0.15"]["question_count"] == pytest.approx(out["question_count"].quantile(0.15))
+    # 결측 채움 이전 관측값 기준과는 달라야 함(채운 median이 분포에 포함)
+    observed = pd.to_numeric(sparse_df["question_count"]).quantile(0.15)
+    assert stats["quantiles"]["0.15"]["question_count"] != pytest.approx(observed)
+
+
+def test_clipped_pipeline_stats_follow_clipped_values(sparse_df):
+    out = preprocess_pipeline(sparse_df, clip_outliers=True)
+    stats = get_batch_stats(out, ["question_count"])
+    assert stats["quantiles"]["0.25"]["question_count"] == pytest.approx(out["question_count"].quantile(0.25))
+
+
+def test_cache_is_reused_only_for_same_values(monkeypatch):
+    from backend.src import batch_stats
+
+    df = attach_batch_stats(pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0], "b": [4.0, 3.0, 2.0, 1.0]}))
+    calls = []
+    compute = batch_stats.compute_batch_stats
+    monkeypatch.setattr(batch_stats, "compute_batch_stats", lambda *a, **k: calls.append(1) or compute(*a, **k))
+
+    # 컬럼 추가/행 순서 변경은 같은 값으로 보고 재사용
+    assert get_batch_stats(df.assign(c=1.0), ["a"])["median"]["a"] == 2.5
+    assert get_batch_stats(df.iloc[::-1], ["a", "b"])["median"]["b"] == 2.5
+    assert calls == []
+
+    # 행 수는 같지만 값이 바뀐 프레임(attrs는 그대로 전파됨)은 다시 계산
+    changed = df.assign(a=[10.0, 20.0, 30.0, 40.0])
+    assert changed.attrs[STATS_ATTR]["median"]["a"] == 2.5
+    assert get_batch_stats(changed, ["a"])["median"]["a"] == 25.0
+    assert calls == [1]
+
+
+def test_cohort_quantiles_fall_back_to_global():
+    df = pd.DataFrame({
+        "cls": ["A", "A", "A", "B", "B", "B", None],
+        "x": [1.0, 2.0, 3.0, 10.0, 20.0, 30.0, 5.0],
+    })
+    stats = get_batch_stats(df, ["x"], cohort_col="cls")
+    q = row_quantile(df, stats, "x", 0.25)
+    assert q.iloc[0] == pytest.approx(1.5)
+    assert q.iloc[3] == pytest.approx(15.0)
+    assert q.iloc[6] == pytest.approx(df["x"].quantile(0.25))
+
+
+@pytest.mark.parametrize("clip", [False, True])
+def test_chunked_preprocessing_matches_in_memory(sparse_df, clip):
+    cohort = sparse_df.assign(cls=np.where(np.arange(len(sparse_df)) % 2, "A", "B"))
+    whole = preprocess_pipeline(cohort, clip_outliers=clip, cohort_col="cls")
+    chunks = list(preprocess_chunks(cohort, 70, clip_outliers=clip, cohort_col="cls"))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks), whole)
+    for chunk in chunks:
+        shared = chunk.attrs[STATS_ATTR]
+        assert shared["shared"]
+        assert shared["quantiles"] == whole.attrs[STATS_ATTR]["quantiles"]
+        assert shared["cohort_quantiles"] == whole.attrs[STATS_ATTR]["cohort_quantiles"]
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src import report_logic, scoring
+from backend.src.data_quality import QUALITY_ATTR, ChunkedQuality, check_quality
+from backend.src.preprocessing import iter_table_chunks
+from backend.src.report_logic import parse_policy_json
+from backend.src.scoring import score_report, score_report_chunked
+
+
+@pytest.fixture(scope="module")
+def policy(policy_json):
+    return parse_policy_json(policy_json)
+
+
+@pytest.fixture(scope="module")
+def dirty_df(raw_df):
+    # 중복 행/중복 ID/범위 밖 값/수치 변환 실패/결측이 청크 경계에 걸치도록 섞은 업로드
+    df = raw_df.drop(columns=["at_risk"]).copy()
+    df = pd.concat([df, df.iloc[[5, 150]]], ignore_index=True)
+    df["student_id"] = df["student_id"].astype(object)
+    df.loc[[40, 260], "student_id"] = df.loc[[3, 120], "student_id"].to_numpy()
+    df["absence_count"] = df["absence_count"].astype(object)
+    # CSV 청크는 dtype을 청크마다 추론하므로, 원래 값 표시가 같도록 소수값 사용
+    df.loc[[7, 77, 177], "absence_count"] = ["abc", -3.5, 999.5]
+    df.loc[df.index % 13 == 0, "question_count"] = np.nan
+    df["cls"] = np.where(df.index % 3 == 0, "A", "B")
+    return df
+
+
+def _compare(chunked, whole):
+    assert chunked.attrs[QUALITY_ATTR] == whole.attrs[QUALITY_ATTR]
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_chunk_quality_matches_single_pass(dirty_df):
+    numeric = ["absence_count", "question_count", "midterm_score"]
+    _, whole = check_quality(dirty_df, numeric, value_ranges={"absence_count": (0, 100)})
+    collector = ChunkedQuality(numeric, value_ranges={"absence_count": (0, 100)})
+    for start in range(0, len(dirty_df), 64):
+        collector.add(dirty_df.iloc[start:start + 64])
+    assert collector.summary() == whole
+    assert whole["counts"]["duplicate_student_id"] == 8
+
+
+@pytest.mark.parametrize("chunk_rows", [37, 100, 1000])
+def test_frame_source_matches_in_memory(dirty_df, model, policy, chunk_rows):
+    whole = score_report(dirty_df, model, policy, cohort_col="cls")
+    _compare(score_report_chunked(dirty_df, model, policy, chunk_rows, cohort_col="cls"), whole)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_file_source_matches_in_memory(dirty_df, model, policy, tmp_path, fmt):
+    path = tmp_path / f"upload.{fmt}"
+    if fmt == "csv":
+        dirty_df.to_csv(path, index=False)
+        frame = pd.read_csv(path)
+    else:
+        pytest.importorskip("pyarrow")
+        dirty_df.astype({"absence_count": str}).to_parquet(path, index=False, row_group_size=50)
+        frame = pd.read_parquet(path)
+    whole = score_report(frame, model, policy)
+    chunked = score_report_chunked(lambda: iter_table_chunks(path, fmt, chunksize=50), model, policy, 50)
+    _compare(chunked, whole)
+
+
+def test_model_reasons_runs_once_on_concatenated_report(dirty_df, model, policy, monkeypatch):
+    calls = []
+    explain = report_logic.add_model_explanations
+    monkeypatch.setattr(report_logic, "add_model_explanations", lambda df, *a, **k: calls.append(len(df)) or explain(df, *a, **k))
+    out = score_report_chunked(dirty_df, model, policy, 40)
+    assert calls == [len(out)]
+
+    calls.clear()
+    out = score_report_chunked(dirty_df, model, policy, 40, fields=["risk_level"])
+    assert calls == []
+    assert "model_reasons" not in out.columns
+
+
+def test_shadow_probabilities_cover_all_chunks(dirty_df, model, policy):
+    got, want = {}, {}
+    score_report(dirty_df, model, policy, shadow_model=model, on_shadow=lambda p, e: want.update(p=p, e=e))
+    score_report_chunked(dirty_df, model, policy, 60, shadow_model=model, on_shadow=lambda p, e: got.update(p=p, e=e))
+    assert got["e"] is None
+    np.testing.assert_allclose(got["p"], want["p"])
+
+
+def test_history_callable_is_queried_per_chunk(dirty_df, model, policy):
+    seen = []
+
+    def history(ids):
+        seen.append(len(ids))
+        return pd.DataFrame({
+            "student_id": ids.iloc[:1],
+            "created_at": ["2024-01-01T00:00:00"],
+            "absence_count": [0.0],
+            "risk_proba": [0.5],
+        })
+
+    out = score_report_chunked(dirty_df, model, policy, 100, history=history)
+    assert len(seen) == int(np.ceil(len(dirty_df) / 100))
+    assert out["has_history"].sum() == len(seen)
+
+
+def test_empty_upload_falls_back_with_all_arguments(model, policy, monkeypatch):
+    captured = {}
+    monkeypatch.setattr(scoring, "score_report", lambda *a, **k: captured.update(k) or pd.DataFrame())
+    on_shadow = lambda p, e: None
+    score_report_chunked(
+        pd.DataFrame(columns=["student_id", "cls"]), model, policy, 10,
+        cohort_col="cls", shadow_model=model, on_shadow=on_shadow, fields=["risk_level"], n_jobs=2,
+    )
+    assert captured["cohort_col"] == "cls"
+    assert captured["shadow_model"] is model
+    assert captured["on_shadow"] is on_shadow
+    assert captured["fields"] == ["risk_level"]
+    assert captured["n_jobs"] == 2
+
+
+def test_upload_chunks_enforces_row_limit(raw_df, tmp_path, monkeypatch):
+    main = pytest.importorskip("backend.api.main")
+    from fastapi import HTTPException
+
+    path = tmp_path / "u.csv"
+    raw_df.to_csv(path, index=False)
+    monkeypatch.setattr(main, "MAX_UPLOAD_ROWS", 120)
+    monkeypatch.setattr(main, "ROUTE_CHUNK_ROWS", 50)
+    chunks = main._upload_chunks(str(path), "csv")
+    with pytest.raises(HTTPException) as exc:
+        list(chunks())
+    assert exc.value.status_code == 413
@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+import pytest
+
+from backend.src.cost_estimate import CSV_SAMPLE_BYTES, choose_route, estimate_upload
+
+
+def _csv(df):
+    return io.BytesIO(df.to_csv(index=False).encode("utf-8"))
+
+
+def test_small_csv_is_counted_exactly(raw_df):
+    df = raw_df.head(3)
+    source = _csv(df)
+    est = estimate_upload(source)
+    assert (est.rows, est.rows_exact, est.columns) == (3, True, len(df.columns))
+    assert source.tell() == 0
+
+
+def test_large_csv_rows_are_extrapolated(raw_df):
+    source = _csv(raw_df)
+    assert len(source.getvalue()) > CSV_SAMPLE_BYTES
+    est = estimate_upload(source)
+    assert not est.rows_exact
+    assert est.rows == pytest.approx(len(raw_df), rel=0.2)
+    assert est.frame_bytes == pytest.approx(raw_df.memory_usage(deep=True, index=False).sum(), rel=0.5)
+    assert source.tell() == 0
+
+
+def test_long_header_grows_csv_sample():
+    df = pd.DataFrame({f"column_{i:04d}": [i] for i in range(300)})
+    est = estimate_upload(_csv(pd.concat([df] * 5)))
+    assert est.columns == 300
+    assert est.rows == 5
+
+
+def test_parquet_rows_come_from_metadata(raw_df):
+    pytest.importorskip("pyarrow")
+    source = io.BytesIO()
+    raw_df.to_parquet(source, index=False)
+    est = estimate_upload(source, "parquet")
+    assert (est.rows, est.rows_exact) == (len(raw_df), True)
+    assert est.row_bytes > 0
+
+
+def test_route_follows_peak_estimates(raw_df):
+    est = estimate_upload(_csv(raw_df))
+    memory = est.peak_bytes("memory")
+    chunked = est.peak_bytes("chunked", 10)
+    assert chunked < memory
+    assert choose_route(est, memory, 0, 10) == "memory"
+    assert choose_route(est, memory - 1, chunked, 10) == "chunked"
+    assert choose_route(est, memory - 1, chunked - 1, 10) == "job"
+    assert choose_route(est, memory, chunked, 10, forced="job") == "job"
+    assert est.to_dict(10)["peak_bytes"] == {"memory": memory, "chunked": chunked}
@@ -0,0 +1,66 @@
+import pandas as pd
+
+from backend.src.config import QUALITY_MAX_ISSUES
+from backend.src.data_quality import ISSUE_TYPES, check_quality
+
+NUMERIC = ["midterm_score", "absence_count"]
+RANGES = {"midterm_score": (0, 100), "absence_count": (0, 48)}  # 48 = total_classes
+
+
+def _frame():
+    # 업로드 직후처럼 모두 문자열인 4행: 2~4행에 값 문제 하나씩, 1·4행은 student_id 중복
+    return pd.DataFrame({
+        "student_id": ["S1", "S2", "S3", "S1"],
+        "midterm_score": ["80", "abc", "75", "90"],
+        "absence_count": ["2", "3", "60", "1"],
+        "participation_level": ["상", "중", "하", "최상"],
+    })
+
+
+def test_each_issue_is_counted_with_its_row():
+    coerced, quality = check_quality(_frame(), NUMERIC, value_ranges=RANGES)
+    assert quality["rows"] == 4
+    assert quality["counts"] == {
+        "non_numeric": 1,
+        "out_of_range": 1,
+        "unknown_participation_level": 1,
+        "duplicate_student_id": 2,
+    }
+    assert quality["rows_with_issues"] == 4
+    assert not quality["truncated"]
+    found = {(item["row"], item["column"], item["issue"], item["value"]) for item in quality["issues"]}
+    assert found == {
+        (2, "midterm_score", "non_numeric", "abc"),
+        (3, "absence_count", "out_of_range", "60"),
+        (4, "participation_level", "unknown_participation_level", "최상"),
+        (1, "student_id", "duplicate_student_id", "S1"),
+        (4, "student_id", "duplicate_student_id", "S1"),
+    }
+    assert [item["row"] for item in quality["issues"]] == sorted(item["row"] for item in quality["issues"])
+    # 비수치 셀은 NaN, 범위 밖 값은 그대로
+    assert coerced["midterm_score"].isna().tolist() == [False, True, False, False]
+    assert coerced["absence_count"].tolist() == [2, 3, 60, 1]
+
+
+def test_clean_and_blank_cells_report_nothing():
+    df = _frame().iloc[:3].assign(midterm_score=["80", " ", None], absence_count=["2", "3", "4"])
+    _, quality = check_quality(df, NUMERIC, value_ranges=RANGES)
+    assert quality["counts"] == {issue: 0 for issue in ISSUE_TYPES}
+    assert quality["rows_with_issues"] == 0
+    assert quality["issues"] == []
+    assert not quality["truncated"]
+
+
+def test_issue_list_is_truncated_but_counts_are_complete():
+    n = QUALITY_MAX_ISSUES + 50
+    df = pd.DataFrame({
+        "student_id": [f"S{i}" for i in range(n)],
+        "midterm_score": ["x"] * n,
+        "absence_count": ["1"] * n,
+    })
+    _, quality = check_quality(df, NUMERIC, value_ranges=RANGES)
+    assert quality["counts"]["non_numeric"] == n
+    assert quality["rows_with_issues"] == n
+    assert len(quality["issues"]) == QUALITY_MAX_ISSUES
+    assert [item["row"] for item in quality["issues"]] == list(range(1, QUALITY_MAX_ISSUES + 1))
+    assert quality["truncated"]
@@ -0,0 +1,116 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.drift import (
+    DriftStore,
+    build_reference,
+    drift_scores,
+    load_reference,
+    psi_status,
+    reference_path,
+    save_reference,
+    sketch,
+)
+
+
+@pytest.fixture(scope="module")
+def train_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"x": rng.normal(0, 1, 2000), "y": rng.uniform(0, 10, 2000)})
+
+
+@pytest.fixture(scope="module")
+def reference(train_df):
+    return build_reference(train_df, features=["x", "y"])
+
+
+def _by_feature(rows):
+    return {r["feature"]: r for r in rows}
+
+
+def test_reference_bins_cover_training_rows(train_df, reference):
+    for col in ("x", "y"):
+        ref = reference["features"][col]
+        assert len(ref["edges"]) == 9
+        assert sum(ref["counts"]) == len(train_df)
+        assert ref["missing"] == 0
+    assert reference["reference_id"] == build_reference(train_df, features=["x", "y"])["reference_id"]
+
+
+def test_reference_round_trips_next_to_model(reference, tmp_path):
+    path = reference_path(tmp_path / "logistic_v2.joblib")
+    assert path.name == "logistic_v2.drift.json"
+    save_reference(reference, path)
+    assert load_reference(path) == reference
+
+
+def test_same_distribution_is_stable_and_shift_is_flagged(train_df, reference):
+    rng = np.random.default_rng(1)
+    same = pd.DataFrame({"x": rng.normal(0, 1, 2000), "y": rng.uniform(0, 10, 2000)})
+    shifted = same.assign(x=same["x"] + 1.5)
+    shifted.loc[:199, "y"] = np.nan
+
+    stable = _by_feature(drift_scores(reference, sketch(same, reference)))
+    assert stable["x"]["status"] == "stable"
+    assert stable["x"]["ks"] < 0.05
+
+    drifted = _by_feature(drift_scores(reference, sketch(shifted, reference)))
+    assert drifted["x"]["status"] == "significant"
+    assert drifted["x"]["ks"] > 0.3
+    assert drifted["y"]["missing_rate"] == pytest.approx(0.1)
+    assert drifted["y"]["reference_missing_rate"] == 0
+
+
+def test_sketches_merge_by_adding_counts(train_df, reference):
+    # 나눠 집계한 sketch를 더하면 전체를 한 번에 집계한 것과 같음
+    whole = sketch(train_df, reference)
+    merged: dict = {}
+    for part in (train_df.iloc[:700], train_df.iloc[700:]):
+        for col, bins in sketch(part, reference).items():
+            for b, c in bins.items():
+                merged.setdefault(col, {}).setdefault(b, 0)
+                merged[col][b] += c
+    assert merged == whole
+
+
+def test_store_accumulates_per_day(tmp_path, train_df, reference):
+    store = DriftStore(tmp_path / "drift.sqlite3")
+    rid = reference["reference_id"]
+    first, second = train_df.iloc[:1000], train_df.iloc[1000:]
+    store.add(rid, "v1", sketch(first, reference), day=date(2024, 3, 1))
+    store.add(rid, "v1", sketch(second, reference), day=date(2024, 3, 2))
+    store.add("other", "v0", sketch(first, reference), day=date(2024, 3, 2))
+
+    assert store.days(rid) == ["2024-03-01", "2024-03-02"]
+    assert store.totals(rid) == sketch(train_df, reference)
+    assert store.totals(rid, since=date(2024, 3, 2)) == sketch(second, reference)
+
+
+def test_psi_levels():
+    assert psi_status(None) is None
+    assert psi_status(0.05) == "stable"
+    assert psi_status(0.2) == "moderate"
+    assert psi_status(0.3) == "significant"
+
+
+def test_drift_endpoint_reports_recorded_uploads(client, policy_json, raw_df, monkeypatch):
+    from backend.api import main
+
+    # 업로드 데이터 자체를 기준으로 한 새 기준 분포(다른 테스트의 누적과 섞이지 않는 reference_id)
+    reference = build_reference(raw_df.assign(risk_proba=np.linspace(0, 1, len(raw_df))), bins=5)
+    monkeypatch.setattr(main, "_drift_reference", lambda version: reference)
+    res = client.post(
+        "/api/predict?mode=compact",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": policy_json},
+    )
+    assert res.status_code == 200
+    body = client.get("/api/drift?days=1").json()
+    assert body["reference"]["reference_id"] == reference["reference_id"]
+    assert body["window"]["rows"] == len(raw_df)
+    features = {r["feature"]: r for r in body["features"]}
+    assert features["absence_count"]["status"] == "stable"
+    assert client.get("/api/drift?days=0").status_code == 400
@@ -0,0 +1,80 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from backend.src.evaluation import (
+    _repeat_blocks,
+    feature_importance,
+    model_metrics,
+    permutation_importance_parallel,
+)
+
+FEATURES = ["signal", "weak", "noise"]
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(400, 3))
+    y = (2 * X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def model_path(data, tmp_path_factory):
+    X, y = data
+    model = Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression())])
+    model.fit(pd.DataFrame(X, columns=FEATURES), y)
+    path = tmp_path_factory.mktemp("eval") / "model.joblib"
+    joblib.dump(model, path)
+    return path
+
+
+@pytest.mark.parametrize("n_features, n_repeats, n_workers", [(3, 20, 1), (2, 7, 8), (12, 5, 4)])
+def test_repeat_blocks_cover_every_repeat_once(n_features, n_repeats, n_workers):
+    blocks = _repeat_blocks(n_features, n_repeats, n_workers)
+    assert [r for block in blocks for r in block] == list(range(n_repeats))
+    if n_features < n_workers:
+        assert len(blocks) > 1
+
+
+def test_metrics_and_coefficients(data, model_path):
+    X, y = data
+    model = joblib.load(model_path)
+    metrics = model_metrics(model, pd.DataFrame(X, columns=FEATURES), y)
+    assert list(metrics.columns) == ["model", "accuracy", "precision", "recall", "f1"]
+    assert metrics.loc[0, "model"] == "logistic_regression"
+    assert metrics.loc[0, "accuracy"] > 0.8
+
+    coef = feature_importance(model, FEATURES)
+    assert list(coef.columns) == ["feature", "coefficient"]
+    assert coef.loc[0, "feature"] == "signal"
+
+
+def test_tree_importance_and_unsupported_models(data):
+    X, y = data
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    assert list(feature_importance(forest, FEATURES).columns) == ["feature", "importance"]
+    with pytest.raises(ValueError, match="DummyClassifier"):
+        feature_importance(DummyClassifier().fit(X, y), FEATURES)
+
+
+def test_permutation_importance_is_seeded_and_independent_of_n_jobs(data, model_path):
+    X, y = data
+    serial = permutation_importance_parallel(model_path, X, y, FEATURES, n_repeats=6, seed=7, n_jobs=1)
+    parallel = permutation_importance_parallel(model_path, X, y, FEATURES, n_repeats=6, seed=7, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    assert serial["feature"].tolist() == FEATURES
+    noise = serial.set_index("feature").loc["noise", "importance_mean"]
+    assert serial.loc[0, "importance_mean"] > 0.1
+    assert abs(noise) < 0.02
+
+    other = permutation_importance_parallel(model_path, X, y, FEATURES, n_repeats=6, seed=8, n_jobs=1)
+    assert not np.allclose(other["importance_std"], serial["importance_std"])
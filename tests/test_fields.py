@@ -0,0 +1,84 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.src.report_logic import ENRICH_STAGES
+from backend.src.scoring import report_columns
+
+
+def _predict(client, policy_json, raw_df, query="", url=None):
+    payload = raw_df.to_csv(index=False).encode("utf-8")
+    return client.post(
+        url or f"/api/predict{query}",
+        files={"file": ("u.csv", payload, "text/csv")},
+        data={"policy": policy_json},
+    )
+
+
+def test_report_columns_cover_scored_output(model, raw_df, policy_json):
+    from backend.src.report_logic import parse_policy_json
+    from backend.src.scoring import score_report
+
+    out = score_report(raw_df, model, parse_policy_json(policy_json))
+    known = set(report_columns(raw_df.columns))
+    assert set(out.columns) <= known
+    assert {c for cols, _ in ENRICH_STAGES.values() for c in cols} <= known
+
+
+def test_unknown_fields_are_rejected_before_scoring(client, policy_json, raw_df, monkeypatch):
+    from backend.api import main
+
+    def fail(*args, **kwargs):
+        raise AssertionError("scoring should not run")
+
+    monkeypatch.setattr(main, "_score_upload", fail)
+    res = _predict(client, policy_json, raw_df, "?fields=risk_level,nope")
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Unknown fields: nope"
+
+
+def test_projected_response_keeps_full_saved_report(client, policy_json, raw_df):
+    res = _predict(client, policy_json, raw_df, "?fields=risk_level")
+    assert res.status_code == 200
+    body = res.json()
+    assert set(body["data"][0]) == {"student_id", "risk_level"}
+
+    download = client.get(body["report_url"])
+    assert download.status_code == 200
+    saved = pd.read_csv(io.BytesIO(download.content), encoding="utf-8-sig")
+    for col in ("participation_flag", "remaining_absence_allowance", "top_reasons", "model_reasons", "score_guidance"):
+        assert col in saved.columns
+    assert len(saved) == body["rows"]
+
+
+@pytest.mark.parametrize("path", ["/api/predict?route=job", "/api/jobs"])
+@pytest.mark.parametrize("query, detail", [
+    ("fields=risk_level,nope", "Unknown fields: nope"),
+    ("cohort=nope", "Unknown cohort column: nope"),
+])
+def test_job_routes_validate_before_submitting(client, policy_json, raw_df, monkeypatch, path, query, detail):
+    from backend.api import main
+
+    def fail(*args, **kwargs):
+        raise AssertionError("job should not be submitted")
+
+    monkeypatch.setattr(main, "_submit_job", fail)
+    sep = "&" if "?" in path else "?"
+    res = _predict(client, policy_json, raw_df, "", url=f"{path}{sep}{query}")
+    assert res.status_code == 400
+    assert res.json()["detail"] == detail
+
+
+def test_job_route_submits_whole_upload_after_header_check(client, policy_json, raw_df, monkeypatch):
+    from backend.api import main
+
+    copied = []
+    submit = main.job_manager.submit
+    monkeypatch.setattr(
+        main.job_manager, "submit", lambda params: copied.append(Path(params["input_path"]).read_bytes()) or submit(params)
+    )
+    res = _predict(client, policy_json, raw_df, "", url="/api/jobs?fields=risk_level&cohort=student_id")
+    assert res.status_code == 202
+    assert copied == [raw_df.to_csv(index=False).encode("utf-8")]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from backend.src.config import HISTORY_COLS
+from backend.src.history import history_columns
+
+
+@pytest.fixture
+def lookups(client, monkeypatch):
+    # 리포트 저장소 조회 대신 호출만 기록(이전 스냅샷 없음)
+    from backend.api import main
+
+    calls = []
+
+    def snapshots_asof(ids, before):
+        calls.append(len(ids))
+        return pd.DataFrame(columns=["student_id", "created_at", *HISTORY_COLS])
+
+    monkeypatch.setattr(main.report_store, "snapshots_asof", snapshots_asof)
+    return calls
+
+
+def _predict(client, policy_json, raw_df, query=""):
+    res = client.post(
+        f"/api/predict{query}",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": policy_json},
+    )
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_history_is_skipped_by_default(client, policy_json, raw_df, lookups):
+    body = _predict(client, policy_json, raw_df)
+    assert lookups == []
+    assert "has_history" not in body["data"][0]
+
+
+def test_requested_history_fields_trigger_lookup(client, policy_json, raw_df, lookups):
+    body = _predict(client, policy_json, raw_df, "?fields=student_id,delta_absence_count,has_history")
+    assert lookups == [len(raw_df)]
+    assert {row["has_history"] for row in body["data"]} == {0}
+
+
+def test_history_setting_and_history_models_force_lookup(model, monkeypatch):
+    from backend.api import main
+
+    assert not main._needs_history(model)
+    assert not main._needs_history(model, ["risk_level"])
+    assert all(main._needs_history(model, [col]) for col in history_columns())
+
+    monkeypatch.setattr(main, "model_feature_cols", lambda m: ["absence_count", "delta_absence_count"])
+    assert main._needs_history(model)
+    monkeypatch.undo()
+    monkeypatch.setattr(main, "HISTORY_FEATURES", True)
+    assert main._needs_history(model)
@@ -0,0 +1,93 @@
+import gzip
+import os
+
+import pytest
+
+from backend.api.http_cache import (
+    ensure_gzip_sibling,
+    etag_matches,
+    negotiate_encoding,
+    stat_etag,
+    variant_etag,
+)
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_etag_matching_is_weak_and_supports_lists():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+    assert variant_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert variant_etag('"abc"', None) == '"abc"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", "br"),
+    ("gzip;q=0.5, br;q=0.4", "gzip"),
+    ("br;q=0, *", "gzip"),
+    ("identity", None),
+    (None, None),
+])
+def test_encoding_negotiation(header, expected):
+    assert negotiate_encoding(header, ["gzip", "br"]) == expected
+
+
+def test_gzip_sibling_and_etag_follow_file_changes(tmp_path):
+    path = tmp_path / "r.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    etag = stat_etag(path)
+    gz = ensure_gzip_sibling(path)
+    assert gzip.decompress(gz.read_bytes()) == path.read_bytes()
+
+    path.write_text("a,b\n3,4\n5,6\n", encoding="utf-8")
+    os.utime(gz, ns=(0, 0))  # 압축본이 원본보다 오래됨
+    assert stat_etag(path) != etag
+    assert gzip.decompress(ensure_gzip_sibling(path).read_bytes()) == path.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def report_url(client, policy_json, raw_df):
+    res = client.post(
+        "/api/predict?mode=compact",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": policy_json},
+    )
+    assert res.status_code == 200
+    return res.json()["report_url"]
+
+
+def test_download_revalidates_with_etag(client, report_url):
+    first = client.get(report_url, headers=IDENTITY)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = client.get(report_url, headers={**IDENTITY, "If-None-Match": f"W/{etag}"})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+
+def test_download_gzip_variant_has_own_etag(client, report_url):
+    plain = client.get(report_url, headers=IDENTITY)
+    zipped = client.get(report_url, headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] != plain.headers["etag"]
+    assert zipped.content == plain.content  # 클라이언트가 압축 해제
+    assert client.get(
+        report_url, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["etag"]}
+    ).status_code == 200
+
+
+def test_download_range_and_if_range(client, report_url):
+    full = client.get(report_url, headers=IDENTITY)
+    part = client.get(report_url, headers={**IDENTITY, "Range": "bytes=10-29"})
+    assert part.status_code == 206
+    assert part.content == full.content[10:30]
+    assert part.headers["content-range"] == f"bytes 10-29/{len(full.content)}"
+
+    stale = client.get(report_url, headers={**IDENTITY, "Range": "bytes=10-29", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == full.content
@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.src import jobs
+from backend.src.jobs import JobManager, JobStore
+
+
+def _age(store, job_id, seconds, boot="other-boot"):
+    # 다른 프로세스가 소유했고 heartbeat가 seconds초 전에 멈춘 running 작업으로 만듦
+    old = (datetime.now() - timedelta(seconds=seconds)).isoformat(timespec="seconds")
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'running', owner_boot = ?, heartbeat_at = ?, updated_at = ? WHERE job_id = ?",
+            (boot, old, old, job_id),
+        )
+
+
+def _wait_status(store, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while store.get(job_id)["status"] != status and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return store.get(job_id)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "jobs.sqlite3")
+
+
+def test_claim_is_exclusive(store):
+    job_id = store.create({"x": 1})
+    assert store.claim(job_id)
+    assert not store.claim(job_id)
+    job = store.get(job_id)
+    assert job["status"] == "running"
+    assert job["owner_boot"] == jobs.boot_id()
+    assert job["heartbeat_at"] is not None
+
+
+def test_requeue_uses_heartbeat_not_pid(store):
+    # 이전 boot의 작업은 같은 PID라도 heartbeat가 끊기면 재큐
+    stale = store.create({})
+    fresh = store.create({})
+    mine = store.create({})
+    _age(store, stale, 120)
+    _age(store, fresh, 1)
+    _age(store, mine, 120, boot=jobs.boot_id())
+
+    assert store.requeue_orphaned(timedelta(seconds=60)) == [stale]
+    assert store.get(stale)["status"] == "queued"
+    assert store.get(stale)["owner_boot"] is None
+    assert store.get(fresh)["status"] == "running"
+    assert store.get(mine)["status"] == "running"
+
+
+def test_heartbeat_only_touches_own_jobs(store):
+    mine = store.create({})
+    other = store.create({})
+    _age(store, mine, 120, boot=jobs.boot_id())
+    _age(store, other, 120)
+    assert store.heartbeat() == 1
+    assert store.requeue_orphaned(timedelta(seconds=60)) == [other]
+
+
+def test_sweep_requeues_and_runs_orphans(store):
+    done = threading.Event()
+
+    def runner(job, report_stage):
+        done.set()
+        return {"ok": True}
+
+    job_id = store.create({})
+    _age(store, job_id, 120)
+    manager = JobManager(store, runner, max_workers=1, stale_after=timedelta(seconds=60))
+    try:
+        assert manager.sweep() == [job_id]
+        assert done.wait(5)
+    finally:
+        manager.shutdown()
+    assert _wait_status(store, job_id, "done")["result"] == {"ok": True}
+
+
+def test_failed_job_is_recorded(store):
+    finished = threading.Event()
+
+    def runner(job, report_stage):
+        report_stage("parse")
+        finished.set()
+        raise ValueError("bad input")
+
+    manager = JobManager(store, runner, max_workers=1)
+    try:
+        job_id = manager.submit({})
+        assert finished.wait(5)
+    finally:
+        manager.shutdown()
+    job = _wait_status(store, job_id, "failed")
+    assert job["status"] == "failed"
+    assert job["error"] == "bad input"
+
+
+def test_scoring_job_removes_input_on_failure(tmp_path):
+    main = pytest.importorskip("backend.api.main")
+    input_path = tmp_path / "broken.csv"
+    input_path.write_text("not,a\nvalid,upload\n", encoding="utf-8")
+    job = {
+        "params": {
+            "input_path": str(input_path),
+            "input_format": "csv",
+            "policy": "{}",
+            "report_format": "csv",
+        }
+    }
+    with pytest.raises(Exception):
+        main._run_scoring_job(job, lambda stage: None)
+    assert not input_path.exists()
@@ -0,0 +1,82 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src.model_registry import ModelRegistry, ShadowLog
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    d = tmp_path / "models"
+    d.mkdir()
+    joblib.dump({"name": "v1"}, d / "v1.joblib")
+    joblib.dump({"name": "v2"}, d / "v2.joblib")
+    return d
+
+
+def test_versions_include_default_outside_dir(model_dir, tmp_path):
+    default = tmp_path / "prod.joblib"
+    joblib.dump({"name": "prod"}, default)
+    registry = ModelRegistry(model_dir, default, mmap_mode=None)
+    assert registry.versions() == ["prod", "v1", "v2"]
+    assert registry.get() == ("prod", {"name": "prod"})
+    assert registry.get("v2") == ("v2", {"name": "v2"})
+    with pytest.raises(KeyError):
+        registry.get("v9")
+
+
+def test_models_load_once_and_reload_on_change(model_dir, monkeypatch):
+    registry = ModelRegistry(model_dir, model_dir / "v1.joblib", mmap_mode=None)
+    loads = []
+    load = joblib.load
+    monkeypatch.setattr(joblib, "load", lambda *a, **k: loads.append(a[0]) or load(*a, **k))
+
+    first = registry.get("v1")[1]
+    assert registry.get("v1")[1] is first
+    assert len(loads) == 1
+
+    # 재학습으로 파일이 교체되면(수정시각/크기 변경) 다시 읽음
+    path = model_dir / "v1.joblib"
+    joblib.dump({"name": "v1", "retrained": True}, path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert registry.get("v1")[1] == {"name": "v1", "retrained": True}
+    assert len(loads) == 2
+
+
+def test_new_versions_are_found_on_first_request(model_dir):
+    registry = ModelRegistry(model_dir, model_dir / "v1.joblib", mmap_mode=None)
+    joblib.dump({"name": "v3"}, model_dir / "v3.joblib")
+    assert registry.get("v3") == ("v3", {"name": "v3"})
+    described = {row["version"]: row for row in registry.describe()}
+    assert described["v1"]["default"]
+    assert described["v3"]["loaded"]
+    assert not described["v2"]["loaded"]
+
+
+def test_missing_default_file_raises_not_found(model_dir):
+    registry = ModelRegistry(model_dir, model_dir / "gone.joblib", mmap_mode=None)
+    with pytest.raises(FileNotFoundError):
+        registry.get()
+    assert {row["version"]: row["size_bytes"] for row in registry.describe()}["gone"] is None
+
+
+def test_shadow_log_writes_rows_and_summary(tmp_path):
+    log = ShadowLog(tmp_path / "shadow")
+    ids = pd.Series(["S1", "S2", "S3"])
+    log.submit("r1", ids, "v1", np.array([0.1, 0.5, 0.9]), "v2", np.array([0.2, 0.5, 0.6]))
+    log.submit("r2", ids, "v1", np.array([0.1, 0.5, 0.9]), "v9", None, error="Shadow model not found: v9")
+    log.shutdown()
+
+    rows = pd.read_csv(tmp_path / "shadow" / "r1.csv", encoding="utf-8-sig")
+    assert rows["shadow_proba"].tolist() == [0.2, 0.5, 0.6]
+    lines = (tmp_path / "shadow" / "summary.jsonl").read_text(encoding="utf-8").splitlines()
+    first, second = map(json.loads, lines)
+    assert first["max_abs_diff"] == pytest.approx(0.3)
+    assert first["mean_abs_diff"] == pytest.approx(0.4 / 3, abs=1e-6)
+    assert second["error"] == "Shadow model not found: v9"
+    assert not (tmp_path / "shadow" / "r2.csv").exists()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.src import parallel_enrich
+from backend.src.parallel_enrich import RISK_COLUMNS, _stage_columns, enrich_partitioned, partition_count
+from backend.src.report_logic import ENRICH_STAGES, parse_policy_json
+from backend.src.scoring import score_report
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def policy(policy_json):
+    return parse_policy_json(policy_json)
+
+
+@pytest.fixture(scope="module")
+def scored(raw_df, model, policy):
+    # 위험 등급/확장 컬럼을 뺀 채점 결과(risk_proba까지)
+    df = pd.concat([raw_df] * 4, ignore_index=True)
+    df["student_id"] = [f"S{i:05d}" for i in range(len(df))]  # 중복 행으로 제거되지 않도록
+    df["cls"] = np.where(df.index % 3 == 0, "A", "B")
+    out = score_report(df, model, policy, cohort_col="cls")
+    return out.drop(columns=[*RISK_COLUMNS, *_stage_columns(ENRICH_STAGES)], errors="ignore")
+
+
+def test_partition_count_respects_min_rows_and_workers():
+    assert partition_count(100, n_jobs=4, min_rows=50) == 2
+    assert partition_count(1000, n_jobs=4, min_rows=50) == 4
+    assert partition_count(1000, n_jobs=1, min_rows=50) == 1
+    assert partition_count(10, n_jobs=4, min_rows=50) == 1
+
+
+@pytest.mark.parametrize("fields", [None, ["risk_level", "participation_flag", "top_reasons"]])
+def test_partitioned_matches_serial(scored, model, policy, fields):
+    serial = enrich_partitioned(scored, policy, model=model, fields=fields, cohort_col="cls", n_jobs=1)
+    parallel = enrich_partitioned(
+        scored, policy, model=model, fields=fields, cohort_col="cls", n_jobs=3, min_rows=300
+    )
+    assert partition_count(len(scored), 3, 300) == 3
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_participation_stats_are_computed_once_on_all_rows(scored, model, policy, monkeypatch):
+    calls = []
+    get_stats = parallel_enrich.get_batch_stats
+    monkeypatch.setattr(parallel_enrich, "get_batch_stats", lambda df, *a, **k: calls.append(len(df)) or get_stats(df, *a, **k))
+    # cohort_col을 주지 않으면 채점 때 계산된 코호트 통계를 재사용(직렬 경로와 같음)
+    parallel = enrich_partitioned(scored, policy, model=model, n_jobs=2, min_rows=300)
+    assert calls == [len(scored)]
+    pd.testing.assert_frame_equal(parallel, enrich_partitioned(scored, policy, model=model, n_jobs=1))
+
+    calls.clear()
+    enrich_partitioned(scored, policy, model=model, fields=["absence_limit"], n_jobs=2, min_rows=300)
+    assert calls == []
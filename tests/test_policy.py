@@ -0,0 +1,120 @@
+import json
+
+import pandas as pd
+import pytest
+
+from backend.src.report_logic import POLICY_COLUMNS, apply_policy, parse_policy_json, policy_delta
+
+from conftest import POLICY
+
+
+@pytest.fixture(scope="module")
+def report_id(client, policy_json, raw_df):
+    res = client.post(
+        "/api/predict?mode=compact",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": policy_json},
+    )
+    assert res.status_code == 200
+    return res.json()["report_id"]
+
+
+def _recompute(client, report_id, **changes):
+    return client.post(f"/api/reports/{report_id}/policy", data={"policy": json.dumps({**POLICY, **changes})})
+
+
+def _stored(report_id):
+    from backend.api import main
+
+    main.report_store.flush()
+    return main.report_store.load_report(report_id).set_index("student_id")
+
+
+def test_same_policy_changes_nothing(client, report_id, raw_df):
+    body = _recompute(client, report_id).json()
+    assert body["rows"] == len(raw_df)
+    assert body["changed_rows"] == 0
+    assert body["data"] == []
+
+
+def _differs(stored, row):
+    sid = row["student_id"]
+    return any(
+        not (pd.isna(stored.loc[sid, c]) and row[c] is None) and stored.loc[sid, c] != row[c]
+        for c in POLICY_COLUMNS if c in row
+    )
+
+
+@pytest.mark.parametrize("changes, column", [
+    ({"total_classes": 120}, "absence_limit"),
+    ({"threshold": 0.6}, "guidance_code"),
+])
+def test_policy_change_returns_changed_rows(client, report_id, changes, column):
+    stored = _stored(report_id)
+    body = _recompute(client, report_id, **changes).json()
+    assert body["changed_rows"] > 0
+    assert len(body["data"]) == body["changed_rows"]
+    assert any(stored.loc[row["student_id"], column] != row[column] for row in body["data"])
+    for row in body["data"]:
+        assert set(row) <= {"student_id", *POLICY_COLUMNS}
+        assert _differs(stored, row)
+
+
+def test_only_rows_whose_values_change_are_returned(client, report_id):
+    # Medium 하한만 0.40 → 0.45로 올리면 그 사이 확률의 학생만 Low로 바뀜
+    stored = _stored(report_id)
+    bands = [
+        {"level": "High", "min_proba": 0.70, "action": "즉시 상담 및 보충학습 개입 필요"},
+        {"level": "Medium", "min_proba": 0.45, "action": "과제 참여 모니터링 및 사전 지도"},
+        {"level": "Low", "min_proba": 0.0, "action": "일반 관찰 유지"},
+    ]
+    body = _recompute(client, report_id, risk_bands=bands).json()
+    expected = set(stored.index[(stored["risk_proba"] >= 0.40) & (stored["risk_proba"] < 0.45)])
+    assert expected
+    assert {row["student_id"] for row in body["data"]} == expected
+    assert {row["risk_level"] for row in body["data"]} == {"Low"}
+
+
+def test_risk_band_change_recomputes_level_and_action(client, report_id):
+    stored = _stored(report_id)
+    bands = [
+        {"level": "Watch", "min_proba": 0.5, "action": "check"},
+        {"level": "Fine", "min_proba": 0.0, "action": "none"},
+    ]
+    body = _recompute(client, report_id, risk_bands=bands).json()
+    assert body["changed_rows"] == body["rows"]
+    for row in body["data"]:
+        high = stored.loc[row["student_id"], "risk_proba"] >= 0.5
+        assert (row["risk_level"], row["action"]) == (("Watch", "check") if high else ("Fine", "none"))
+
+
+def test_recompute_leaves_stored_report_unchanged(client, report_id):
+    from backend.api import main
+
+    before = _stored(report_id)
+    assert _recompute(client, report_id, total_classes=80, threshold=0.7).status_code == 200
+    pd.testing.assert_frame_equal(_stored(report_id), before)
+    pd.testing.assert_frame_equal(main._load_report_frame(report_id).set_index("student_id"), before)
+
+
+def test_unknown_report_and_bad_policy(client, report_id):
+    assert _recompute(client, "0" * 32).status_code == 404
+    res = client.post(f"/api/reports/{report_id}/policy", data={"policy": "{not json"})
+    assert res.status_code == 400
+    assert "policy JSON" in res.json()["detail"]
+
+
+def test_policy_delta_compares_categories_by_value():
+    policy = parse_policy_json(json.dumps(POLICY))
+    before = pd.DataFrame({
+        "student_id": ["a", "b"],
+        "risk_proba": [0.2, 0.8],
+        "absence_count": [1, 2],
+    })
+    scored = apply_policy(before, policy)
+    # 카테고리 목록만 다른 같은 값은 변경이 아님
+    recat = scored.assign(risk_level=scored["risk_level"].astype(str).astype("category"))
+    assert policy_delta(scored, recat).empty
+    changed = policy_delta(scored, apply_policy(before, parse_policy_json(json.dumps({**POLICY, "total_classes": 10}))))
+    assert changed["student_id"].tolist() == ["a", "b"]
+    assert changed["absence_limit"].tolist() == [3, 3]  # floor(10 / 3)
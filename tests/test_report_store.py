@@ -0,0 +1,169 @@
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.src.report_store import ReportStore
+
+
+def _report(n=4, offset=0):
+    return pd.DataFrame({
+        "student_id": [f"S{i + offset:03d}" for i in range(n)],
+        "risk_proba": [0.1 * (i + 1) for i in range(n)],
+        "risk_level": pd.Categorical(["Low", "High", "Medium", "Low"][:n], categories=["High", "Medium", "Low"]),
+        "achievement_rate": [0.5, None, 0.7, 0.9][:n],
+        "absence_count": [0, 3, 1, 8][:n],
+        "midterm_score": [80.0, 40.0, 65.0, 90.0][:n],
+        "top_reasons": ["a", "b, c", None, "d"][:n],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ReportStore(tmp_path / "store.sqlite3")
+    yield s
+    s.shutdown()
+
+
+def test_append_round_trips_frame(store):
+    df = _report()
+    df.attrs["data_quality"] = {"rows": 4}
+    store.append("r1", df, created_at=datetime(2024, 1, 1), policy={"threshold": 0.4})
+    loaded = store.load_report("r1")
+    pd.testing.assert_frame_equal(loaded, df)
+    assert loaded.attrs == {}
+    assert store.report_policy("r1") == {"threshold": 0.4}
+
+
+def test_rows_are_indexed_without_payload(store):
+    store.append("r1", _report(), created_at=datetime(2024, 1, 1))
+    with sqlite3.connect(store.db_path) as conn:
+        payloads = conn.execute("SELECT payload FROM report_rows").fetchall()
+        blobs = conn.execute("SELECT format FROM report_blobs").fetchall()
+    assert {p for (p,) in payloads} == {None}
+    assert blobs == [("parquet",)]
+    summary = store.report_summary("r1")
+    assert summary["rows"] == 4
+    assert summary["risk_level_counts"] == {"Low": 2, "High": 1, "Medium": 1}
+    assert [h["report_id"] for h in store.student_history("S001")] == ["r1"]
+
+
+def test_submit_is_readable_before_and_after_write(store):
+    df = _report()
+    future = store.submit("r2", df, policy={"threshold": 0.5})
+    assert store.has_report("r2")
+    assert store.load_report("r2") is not None
+    future.result(timeout=10)
+    store.flush()
+    assert store.report_policy("r2") == {"threshold": 0.5}
+    pd.testing.assert_frame_equal(store.load_report("r2"), df)
+    assert [r["report_id"] for r in store.list_reports()] == ["r2"]
+
+
+def test_legacy_payload_reports_still_load(tmp_path):
+    # 초기 스키마(payload NOT NULL, report_blobs 없음)의 저장소
+    path = tmp_path / "legacy.sqlite3"
+    df = _report(2)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE reports (report_id TEXT PRIMARY KEY, created_at TEXT NOT NULL, rows INTEGER NOT NULL, "
+            "policy TEXT, columns TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE report_rows (report_id TEXT NOT NULL, row_idx INTEGER NOT NULL, student_id TEXT, "
+            "created_at TEXT NOT NULL, risk_proba REAL, risk_level TEXT, achievement_rate REAL, "
+            "absence_count REAL, payload TEXT NOT NULL, PRIMARY KEY (report_id, row_idx))"
+        )
+        conn.execute(
+            "INSERT INTO reports VALUES ('old', '2023-01-01T00:00:00', 2, NULL, ?)",
+            (json.dumps(list(df.columns)),),
+        )
+        for i, line in enumerate(df.astype({"risk_level": str}).to_json(orient="records", lines=True).splitlines()):
+            conn.execute(
+                "INSERT INTO report_rows VALUES ('old', ?, ?, '2023-01-01T00:00:00', NULL, NULL, NULL, NULL, ?)",
+                (i, df["student_id"][i], line),
+            )
+
+    store = ReportStore(path)
+    try:
+        assert store.load_report("old")["student_id"].tolist() == ["S000", "S001"]
+        # 새 리포트는 NOT NULL payload 컬럼에도 쓸 수 있어야 함
+        store.append("new", _report(2, offset=10))
+        assert store.load_report("new")["student_id"].tolist() == ["S010", "S011"]
+    finally:
+        store.shutdown()
+
+
+def test_snapshots_asof_sees_pending_writes(store):
+    store.submit("r1", _report(), created_at=datetime(2024, 1, 1))
+    snaps = store.snapshots_asof(["S000", "S003", "missing"], datetime(2024, 2, 1))
+    assert snaps["student_id"].tolist() == ["S000", "S003"]
+    assert snaps.set_index("student_id").loc["S003", "absence_count"] == 8
+
+
+def _job(tmp_path, raw_df, policy_json):
+    input_path = tmp_path / "input.csv"
+    raw_df.to_csv(input_path, index=False)
+    return {
+        "params": {
+            "input_path": str(input_path),
+            "input_format": "csv",
+            "policy": policy_json,
+            "report_format": "csv",
+        }
+    }
+
+
+def test_job_returns_after_report_is_committed(client, tmp_path, raw_df, policy_json):
+    # 다른 워커(같은 DB의 별도 ReportStore)에서도 작업 완료 시점에 리포트가 보여야 함
+    from backend.api import main
+
+    result = main._run_scoring_job(_job(tmp_path, raw_df, policy_json), lambda stage: None)
+    other = ReportStore(main.report_store.db_path)
+    try:
+        assert other.has_report(result["report_id"])
+        assert len(other.load_report(result["report_id"])) == len(raw_df)
+    finally:
+        other.shutdown()
+
+
+def test_failed_write_fails_job(client, tmp_path, raw_df, policy_json, monkeypatch):
+    from backend.api import main
+
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(main.report_store, "append", broken)
+    job = _job(tmp_path, raw_df, policy_json)
+    with pytest.raises(sqlite3.OperationalError):
+        main._run_scoring_job(job, lambda stage: None)
+    assert not Path(job["params"]["input_path"]).exists()
+
+
+def test_failed_predict_write_is_logged(client, raw_df, policy_json, monkeypatch, caplog):
+    from backend.api import main
+
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(main.report_store, "append", broken)
+    with caplog.at_level(logging.ERROR, logger=main.logger.name):
+        res = client.post(
+            "/api/predict?mode=compact",
+            files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+            data={"policy": policy_json},
+        )
+        assert res.status_code == 200
+        main.report_store.flush()
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+    report_id = res.json()["report_id"]
+    assert [r.getMessage() for r in caplog.records] == [
+        f"Report {report_id} was not saved to the report store: disk I/O error"
+    ]
@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.src.report_logic import (
+    EvaluationPolicy,
+    RiskBand,
+    assign_risk_bands,
+    parse_policy_json,
+    policy_risk_bands,
+    validate_risk_bands,
+)
+
+from conftest import POLICY
+
+DEFAULT = policy_risk_bands(None)
+
+
+def _levels(proba, bands=DEFAULT):
+    level, action = assign_risk_bands(proba, bands)
+    return list(level), list(action)
+
+
+def test_boundaries_belong_to_the_higher_band():
+    levels, actions = _levels([0.70, 0.6999, 0.40, 0.3999, 0.0, 1.0])
+    assert levels == ["High", "Medium", "Medium", "Low", "Low", "High"]
+    assert actions[0] == "즉시 상담 및 보충학습 개입 필요"
+    assert actions[3] == "일반 관찰 유지"
+
+
+def test_nan_maps_to_lowest_band():
+    levels, actions = _levels([np.nan, 0.9, None])
+    assert levels == ["Low", "High", "Low"]
+    assert actions[0] == actions[2] == "일반 관찰 유지"
+
+
+def test_categories_follow_band_order():
+    level, action = assign_risk_bands([0.1], DEFAULT)
+    assert list(level.categories) == ["High", "Medium", "Low"]
+    assert len(action.categories) == 3
+
+
+def test_unsorted_bands_are_sorted_by_policy():
+    policy = EvaluationPolicy(**{**POLICY, "risk_bands": [
+        {"level": "Low", "min_proba": 0.0, "action": "a"},
+        {"level": "High", "min_proba": 0.8, "action": "c"},
+        {"level": "Mid", "min_proba": 0.3, "action": "b"},
+    ]})
+    assert [b.level for b in policy.risk_bands] == ["High", "Mid", "Low"]
+    assert all(isinstance(b, RiskBand) for b in policy.risk_bands)
+    assert _levels([0.3, 0.29, 0.8], policy.risk_bands)[0] == ["Mid", "Low", "High"]
+
+
+def test_shared_action_text_is_one_category():
+    bands = policy_risk_bands(EvaluationPolicy(**{**POLICY, "risk_bands": [
+        {"level": "A", "min_proba": 0.5, "action": "same"},
+        {"level": "B", "min_proba": 0.0, "action": "same"},
+    ]}))
+    level, action = assign_risk_bands([0.7, 0.1], bands)
+    assert list(level) == ["A", "B"]
+    assert list(action.categories) == ["same"]
+
+
+@pytest.mark.parametrize("bands, message", [
+    ([{"level": "X", "min_proba": 0.5, "action": ""}, {"level": "X", "min_proba": 0.0, "action": ""}], "level이 중복"),
+    ([{"level": "A", "min_proba": 0.5, "action": ""}, {"level": "B", "min_proba": 0.5, "action": ""},
+      {"level": "C", "min_proba": 0.0, "action": ""}], "min_proba가 중복"),
+    ([{"level": "A", "min_proba": 0.5, "action": ""}, {"level": "B", "min_proba": 0.1, "action": ""}], "min_proba가 0이어야"),
+    ([{"level": "A", "min_proba": 1.5, "action": ""}, {"level": "B", "min_proba": 0.0, "action": ""}], "0~1 사이"),
+    ([{"level": " ", "min_proba": 0.0, "action": ""}], "빈 문자열"),
+])
+def test_invalid_bands_are_rejected(bands, message):
+    with pytest.raises(ValueError, match=message):
+        validate_risk_bands(EvaluationPolicy(**{**POLICY, "risk_bands": bands}).risk_bands)
+    with pytest.raises(ValueError, match=message):
+        parse_policy_json(json.dumps({**POLICY, "risk_bands": bands}))
+
+
+@pytest.mark.parametrize("raw", [[], {"level": "A"}, [{"level": "A", "min_proba": 0.0}], [{"level": "A", "min_proba": "x", "action": ""}]])
+def test_malformed_bands_are_rejected(raw):
+    with pytest.raises(ValueError, match="risk_bands"):
+        parse_policy_json(json.dumps({**POLICY, "risk_bands": raw}))
+
+
+def test_default_policy_uses_config_bands():
+    policy = parse_policy_json(json.dumps(POLICY))
+    assert policy.risk_bands is None
+    assert [(b.level, b.min_proba) for b in policy_risk_bands(policy)] == [("High", 0.7), ("Medium", 0.4), ("Low", 0.0)]
+    validate_risk_bands(DEFAULT)
+
+
+def test_custom_bands_through_predict(client, raw_df):
+    bands = [
+        {"level": "Watch", "min_proba": 0.5, "action": "check"},
+        {"level": "Fine", "min_proba": 0.0, "action": "none"},
+    ]
+    res = client.post(
+        "/api/predict?fields=risk_proba,risk_level,action",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": json.dumps({**POLICY, "risk_bands": bands})},
+    )
+    assert res.status_code == 200
+    rows = res.json()["data"]
+    assert len(rows) == len(raw_df)
+    for row in rows:
+        expected = ("Watch", "check") if row["risk_proba"] >= 0.5 else ("Fine", "none")
+        assert (row["risk_level"], row["action"]) == expected
+
+    res = client.post(
+        "/api/predict",
+        files={"file": ("u.csv", raw_df.to_csv(index=False).encode("utf-8"), "text/csv")},
+        data={"policy": json.dumps({**POLICY, "risk_bands": bands[:1]})},
+    )
+    # /api/predict는 정책 검증 실패를 500으로 감싸 반환(API 명세 참고)
+    assert res.status_code == 500
+    assert "min_proba가 0이어야" in res.json()["detail"]
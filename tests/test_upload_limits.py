@@ -0,0 +1,87 @@
+import os
+import tempfile
+
+import pytest
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from backend.api.upload_limits import UploadLimitMiddleware, UploadRoute
+
+
+def _spool_dir(spool) -> str:
+    # 디스크로 넘어간 spool의 실제 위치 (Linux TemporaryFile은 이름 없는 fd라 /proc로 확인)
+    path = os.readlink(f"/proc/self/fd/{spool.fileno()}")
+    return os.path.dirname(path)
+
+
+def _app(max_bytes: int, spool_max_bytes: int, spool_dir=None) -> FastAPI:
+    app = FastAPI()
+    app.router.route_class = UploadRoute
+
+    @app.post("/upload")
+    def upload(file: UploadFile = File(...)):
+        spool = file.file
+        rolled = bool(getattr(spool, "_rolled", False))
+        return {
+            "size": len(file.file.read()),
+            "rolled": rolled,
+            "dir": _spool_dir(spool) if rolled else None,
+        }
+
+    @app.post("/other")
+    def other(file: UploadFile = File(...)):
+        return {"size": len(file.file.read())}
+
+    app.add_middleware(
+        UploadLimitMiddleware,
+        max_bytes=max_bytes,
+        paths=("/upload",),
+        spool_max_bytes=spool_max_bytes,
+        spool_dir=spool_dir,
+    )
+    return app
+
+
+def test_content_length_over_limit_is_rejected():
+    client = TestClient(_app(max_bytes=100, spool_max_bytes=1024))
+    res = client.post("/upload", files={"file": ("a.csv", b"x" * 500, "text/csv")})
+    assert res.status_code == 413
+    assert "maximum size" in res.json()["detail"]
+
+
+def test_streamed_body_over_limit_is_rejected():
+    client = TestClient(_app(max_bytes=100, spool_max_bytes=1024))
+
+    def chunks():
+        for _ in range(10):
+            yield b"y" * 50
+
+    res = client.post(
+        "/upload",
+        content=chunks(),
+        headers={"content-type": "multipart/form-data; boundary=xyz"},
+    )
+    assert res.status_code == 413
+
+
+def test_limit_applies_only_to_configured_paths():
+    client = TestClient(_app(max_bytes=100, spool_max_bytes=1024))
+    res = client.post("/other", files={"file": ("a.csv", b"x" * 500, "text/csv")})
+    assert res.status_code == 200
+    assert res.json()["size"] == 500
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to locate unnamed temp files")
+def test_spool_settings_are_scoped_to_the_middleware(tmp_path):
+    before = (tempfile.tempdir, tempfile.gettempdir())
+    client = TestClient(_app(max_bytes=10_000, spool_max_bytes=16, spool_dir=str(tmp_path)))
+
+    big = client.post("/upload", files={"file": ("a.csv", b"z" * 1000, "text/csv")}).json()
+    assert big == {"size": 1000, "rolled": True, "dir": str(tmp_path)}
+
+    small = client.post("/upload", files={"file": ("a.csv", b"z" * 8, "text/csv")}).json()
+    assert small["rolled"] is False
+
+    # 전역 설정은 바뀌지 않음
+    assert (tempfile.tempdir, tempfile.gettempdir()) == before